@@ -1,24 +1,41 @@
 # tools to add floris to the hybrid simulation class
+import inspect
+from collections import OrderedDict
+
 import numpy as np
-import matplotlib.pyplot as plt
 import floris
+from packaging.version import Version
 
-floris_version = float(floris.__version__[0:2])
-if floris_version >= 3.1:
+floris_version = Version(floris.__version__)
+if floris_version >= Version("3.1"):
     from floris.tools import FlorisInterface
 
 class Floris:
+    # number of layouts whose wind rose powers are kept, each an array of [wind rose bin, turbine] floats
+    power_cache_size = 64
 
     def __init__(self, config_dict, site, timestep=()):
-
-        if floris_version < 3.0:
+        """
+        :param config_dict: dict, with keys ('floris_config', 'turbine_rating_kw') and optionally
+            ('wind_direction_bin_deg', 'wind_speed_bin_ms'), the widths of the wind rose bins. By default the
+            resource is binned into its unique direction / speed pairs. Optionally 'power_cache_size', the number of
+            layouts whose wind rose powers are kept in memory, each taking 8 bytes per bin and turbine. Defaults to
+            Floris.power_cache_size, 0 disables the cache.
+        :param site: Power source site information (SiteInfo object)
+        :param timestep: (optional) tuple of the first and last time step to simulate
+        """
+        if floris_version < Version("3.1"):
             raise EnvironmentError("Floris v3.1 or higher is required")
 
         self.fi = FlorisInterface(config_dict["floris_config"])
 
         self.site = site
+        self.wind_direction_bin = config_dict.get("wind_direction_bin_deg", 0.)
+        self.wind_speed_bin = config_dict.get("wind_speed_bin_ms", 0.)
+        self.power_cache_size = config_dict.get("power_cache_size", self.power_cache_size)
+        self._power_cache = OrderedDict()
+        self._wind_rose = None
         self.wind_resource_data = self.site.wind_resource.data
-        self.speeds, self.wind_dirs = self.parse_resource_data()
 
         self.wind_farm_xCoordinates = self.fi.layout_x
         self.wind_farm_yCoordinates = self.fi.layout_y
@@ -32,11 +49,11 @@ class Floris:
 
         # time to simulate
         if len(timestep) > 0:
-            self.start_idx = timestep[0]
-            self.end_idx = timestep[1]
+            self._start_idx = timestep[0]
+            self._end_idx = timestep[1]
         else:
-            self.start_idx = 0
-            self.end_idx = 8759
+            self._start_idx = 0
+            self._end_idx = 8759
 
         # results
         self.gen = []
@@ -62,32 +79,115 @@ class Floris:
         else:
             return self.__getattribute__(name)
 
+    @property
+    def wind_resource_data(self) -> dict:
+        """Wind resource data dictionary, setting it clears the wind rose powers of all layouts"""
+        return self._wind_resource_data
+
+    @wind_resource_data.setter
+    def wind_resource_data(self, resource_data: dict):
+        self._wind_resource_data = resource_data
+        self.speeds, self.wind_dirs = self.parse_resource_data()
+        self.clear_power_cache()
+
+    @property
+    def start_idx(self) -> int:
+        """First time step to simulate, setting it clears the wind rose powers of all layouts"""
+        return self._start_idx
+
+    @start_idx.setter
+    def start_idx(self, start_idx: int):
+        self._start_idx = start_idx
+        self.clear_power_cache()
+
+    @property
+    def end_idx(self) -> int:
+        """End of the time steps to simulate, setting it clears the wind rose powers of all layouts"""
+        return self._end_idx
+
+    @end_idx.setter
+    def end_idx(self, end_idx: int):
+        self._end_idx = end_idx
+        self.clear_power_cache()
+
     def parse_resource_data(self):
 
         # extract data for simulation
-        speeds = np.zeros(len(self.wind_resource_data['data']))
-        wind_dirs = np.zeros(len(self.site.wind_resource.data['data']))
-        for i in range((len(self.site.wind_resource.data['data']))):
-            speeds[i] = self.site.wind_resource.data['data'][i][2]
-            wind_dirs[i] = self.site.wind_resource.data['data'][i][3]
+        data = np.asarray(self.wind_resource_data['data'], dtype=float)
+        return data[:, 2], data[:, 3]
+
+    def clear_power_cache(self):
+        """
+        Clears the wind rose bins and the powers of all layouts, needed if FLORIS settings other than the layout
+        are changed
+        """
+        self._power_cache.clear()
+        self._wind_rose = None
 
-        return speeds, wind_dirs
+    def wind_rose(self):
+        """
+        Bins the simulated time steps into a wind rose of unique direction / speed pairs.
+
+        :returns: tuple of the bin directions [deg], bin speeds [m/s], both sorted by direction then speed, and
+            the bin index of each time step
+        """
+        if self._wind_rose is None:
+            wind_dirs = self.wind_dirs[self.start_idx:self.end_idx] % 360.
+            speeds = self.speeds[self.start_idx:self.end_idx]
+            if self.wind_direction_bin > 0:
+                wind_dirs = np.round(wind_dirs / self.wind_direction_bin) * self.wind_direction_bin % 360.
+            if self.wind_speed_bin > 0:
+                speeds = np.round(speeds / self.wind_speed_bin) * self.wind_speed_bin
+            bins, bin_index = np.unique(np.column_stack((wind_dirs, speeds)), axis=0, return_inverse=True)
+            self._wind_rose = (bins[:, 0], bins[:, 1], bin_index.ravel())
+        return self._wind_rose
+
+    def _set_layout(self, layout_x, layout_y):
+        if 'layout' in inspect.signature(self.fi.reinitialize).parameters:
+            self.fi.reinitialize(layout=(layout_x, layout_y))
+        else:
+            self.fi.reinitialize(layout_x=layout_x, layout_y=layout_y)
+
+    def wind_rose_powers(self) -> np.ndarray:
+        """
+        Gets the turbine powers in each wind rose bin for the current layout. Each direction is evaluated once for
+        the speeds of its bins, and the powers are kept per layout so repeated layouts are not evaluated again.
+
+        :returns: array of turbine powers [bin, turbine] [W]
+        """
+        layout_x = np.asarray(self.wind_farm_xCoordinates, dtype=float)
+        layout_y = np.asarray(self.wind_farm_yCoordinates, dtype=float)
+        key = (layout_x.tobytes(), layout_y.tobytes())
+        if key in self._power_cache:
+            self._power_cache.move_to_end(key)
+            return self._power_cache[key]
+
+        bin_dirs, bin_speeds, _ = self.wind_rose()
+        self._set_layout(layout_x, layout_y)
+        powers = np.zeros((len(bin_dirs), len(layout_x)))
+        wind_dirs, starts = np.unique(bin_dirs, return_index=True)
+        stops = np.append(starts[1:], len(bin_dirs))
+        for wind_dir, start, stop in zip(wind_dirs, starts, stops):
+            self.fi.reinitialize(wind_directions=[wind_dir], wind_speeds=bin_speeds[start:stop])
+            self.fi.calculate_wake()
+            powers[start:stop] = self.fi.get_turbine_powers()[0]
+
+        self._power_cache[key] = powers
+        while len(self._power_cache) > self.power_cache_size:
+            self._power_cache.popitem(last=False)
+        return powers
 
     def execute(self, project_life):
 
         print('Simulating wind farm output in FLORIS...')
 
-        # find generation of wind farm
+        # find generation of wind farm from the powers of the wind rose bins
+        self.nTurbs = len(self.wind_farm_xCoordinates)
         power_turbines = np.zeros((self.nTurbs, 8760))
-        power_farm = np.zeros(8760)
-
-        self.fi.reinitialize(wind_speeds=self.speeds[self.start_idx:self.end_idx], wind_directions=self.wind_dirs[self.start_idx:self.end_idx])
-        self.fi.calculate_wake()
-
-        powers = self.fi.get_turbine_powers()
-        power_turbines[:, self.start_idx:self.end_idx] = powers[0].reshape((self.nTurbs, self.end_idx - self.start_idx))
+        _, _, bin_index = self.wind_rose()
+        power_turbines[:, self.start_idx:self.end_idx] = self.wind_rose_powers()[bin_index].T
 
-        power_farm = np.array(power_turbines).sum(axis=0)
+        power_farm = power_turbines.sum(axis=0)
 
         self.gen = power_farm / 1000
         self.annual_energy = np.sum(self.gen)
@@ -1,3 +1,4 @@
+import operator
 from typing import Sequence
 
 import PySAM.BatteryStateful as BatteryModel
@@ -9,15 +10,22 @@ from hybrid.power_source import *
 
 class BatteryOutputs:
     def __init__(self, n_timesteps):
-        """Class for storing stateful battery and dispatch outputs."""
+        """Class for storing stateful battery and dispatch outputs.
+
+        Outputs are stored in arrays preallocated for the simulation length, use ``to_lists`` for list copies.
+        """
         self.stateful_attributes = ['I', 'P', 'Q', 'SOC', 'T_batt', 'gen']
         for attr in self.stateful_attributes:
-            setattr(self, attr, [0.0]*n_timesteps)
+            setattr(self, attr, np.zeros(n_timesteps))
 
         # dispatch output storage
         dispatch_attributes = ['I', 'P', 'SOC']
         for attr in dispatch_attributes:
-            setattr(self, 'dispatch_'+attr, [0.0]*n_timesteps)
+            setattr(self, 'dispatch_'+attr, np.zeros(n_timesteps))
+
+    def to_lists(self) -> dict:
+        """Returns a dictionary of the stored outputs as lists of floats"""
+        return {attr: val.tolist() for attr, val in vars(self).items() if attr != 'stateful_attributes'}
 
 
 class Battery(PowerSource):
@@ -176,16 +184,11 @@ class Battery(PowerSource):
             raise ValueError("Stateful battery module 'control_mode' invalid value.")
 
         time_step_duration = self.dispatch.time_duration
-        for t in range(n_periods):
-            self.value('dt_hr', time_step_duration[t])
-            self.value(self.dispatch.control_variable, control[t])
-
-            # Only store information if passed the previous day simulations (used in clustering)
-            try:
-                index_time_step = sim_start_time + t  # Store information
-            except TypeError:
-                index_time_step = None  # Don't store information
-            self.simulate_power(time_step=index_time_step)
+        # Only store information if passed the previous day simulations (used in clustering)
+        self.simulate_batch(control[0:n_periods],
+                            dt_hr=time_step_duration[0:n_periods],
+                            sim_start_time=sim_start_time,
+                            control_variable=self.dispatch.control_variable)
 
         # Store Dispatch model values
         if sim_start_time is not None:
@@ -196,6 +199,65 @@ class Battery(PowerSource):
 
         # logger.info("Battery Outputs at start time {}".format(sim_start_time, self.Outputs))
 
+    def simulate_batch(self,
+                       control: Sequence[float],
+                       dt_hr: Sequence[float] = None,
+                       sim_start_time: int = None,
+                       control_variable: str = None,
+                       attributes: Sequence[str] = None) -> np.ndarray:
+        """
+        Steps the stateful battery through a batch of control targets, e.g., a dispatch window or a whole year.
+
+        The model is still executed one time step at a time. The batch only saves the per-step overhead around it:
+        model groups and setters are resolved once, each needed StatePack attribute is read once per step, and the
+        outputs are written into a preallocated array, which is stored in ``Outputs`` with one slice assignment per
+        attribute.
+
+        :param control: Control targets for each time step, power [kW] or current [A] (Discharging (+) Charging (-))
+        :param dt_hr: (optional) Time step durations [hr], if not provided the current time step duration is used
+        :param sim_start_time: (optional) Time step index where outputs are stored, o.w. outputs are not stored
+        :param control_variable: (optional) 'input_power' or 'input_current', defaults to the model's control mode
+        :param attributes: (optional) Stateful outputs to read each step, defaults to ``Outputs.stateful_attributes``
+
+        :returns: Stateful outputs for each time step, with columns ordered as ``attributes``
+        """
+        n_steps = len(control)
+        attributes = self.Outputs.stateful_attributes if attributes is None else list(attributes)
+        results = np.zeros((n_steps, len(attributes)))
+        if not self._system_model:
+            return results
+
+        if control_variable is None:
+            control_variable = 'input_power' if self._system_model.Controls.control_mode == 1.0 else 'input_current'
+        controls = self._system_model.Controls
+        state = self._system_model.StatePack
+        execute = self._system_model.execute
+        state_attributes = [attr if hasattr(state, attr) else ('P' if attr == 'gen' else None) for attr in attributes]
+        # 'gen' is the power 'P', so each StatePack attribute is read once per step
+        read_attributes = list(dict.fromkeys(attr for attr in state_attributes if attr is not None))
+        columns = [(i, read_attributes.index(attr)) for i, attr in enumerate(state_attributes) if attr is not None]
+        read_state = operator.attrgetter(*read_attributes) if read_attributes else None
+        state_values = np.zeros((n_steps, len(read_attributes)))
+
+        dt_prev = None
+        for t in range(n_steps):
+            if dt_hr is not None and dt_hr[t] != dt_prev:
+                dt_prev = dt_hr[t]
+                controls.dt_hr = dt_prev
+            setattr(controls, control_variable, control[t])
+            execute(0)
+            if read_state is not None:
+                state_values[t] = read_state(state)
+        for i, j in columns:
+            results[:, i] = state_values[:, j]
+
+        if sim_start_time is not None:
+            time_slice = slice(sim_start_time, sim_start_time + n_steps)
+            for i, attr in enumerate(attributes):
+                if state_attributes[i] is not None and hasattr(self.Outputs, attr):
+                    getattr(self.Outputs, attr)[time_slice] = results[:, i]
+        return results
+
     def simulate_power(self, time_step=None):
         """
         Runs battery simulate and stores values if time step is provided
@@ -276,12 +338,12 @@ class Battery(PowerSource):
 
         if len(self.Outputs.gen) == self.site.n_timesteps:
             single_year_gen = self.Outputs.gen
-            self._financial_model.value('gen', list(single_year_gen) * project_life)
+            self._financial_model.value('gen', single_year_gen.tolist() * project_life)
 
-            self._financial_model.value('system_pre_curtailment_kwac', list(single_year_gen) * project_life)
-            self._financial_model.value('annual_energy_pre_curtailment_ac', sum(single_year_gen))
-            self._financial_model.value('batt_annual_discharge_energy', [sum(i for i in single_year_gen if i > 0)] * project_life)
-            self._financial_model.value('batt_annual_charge_energy', [sum(i for i in single_year_gen if i < 0)] * project_life)
+            self._financial_model.value('system_pre_curtailment_kwac', single_year_gen.tolist() * project_life)
+            self._financial_model.value('annual_energy_pre_curtailment_ac', float(single_year_gen.sum()))
+            self._financial_model.value('batt_annual_discharge_energy', [float(single_year_gen[single_year_gen > 0].sum())] * project_life)
+            self._financial_model.value('batt_annual_charge_energy', [float(single_year_gen[single_year_gen < 0].sum())] * project_life)
             # Do not calculate LCOS, so skip these inputs for now by unassigning or setting to 0
             self._financial_model.unassign("battery_total_cost_lcos")
             self._financial_model.value('batt_annual_charge_from_system', (0,))
@@ -327,7 +389,7 @@ class Battery(PowerSource):
     @property
     def generation_profile(self) -> Sequence:
         if self.system_capacity_kwh:
-            return self.Outputs.gen
+            return self.Outputs.gen.tolist()
         else:
             return [0] * self.site.n_timesteps
 
@@ -342,6 +404,6 @@ class Battery(PowerSource):
     @property
     def annual_energy_kwh(self) -> float:
         if self.system_capacity_kw > 0:
-            return sum(self.Outputs.gen)
+            return float(self.Outputs.gen.sum())
         else:
             return 0
@@ -6,6 +6,8 @@ import numpy as np
 import pysolar
 import datetime
 
+from hybrid.resource.resource_store import resource_store
+
 
 class Clustering:
 
@@ -139,16 +141,13 @@ class Clustering:
     def read_weather(self):
         weather = {k:[] for k in ['year', 'month', 'day', 'hour', 'ghi', 'dhi', 'dni', 'tdry', 'wspd']}
 
-        # Get header info
-        header = np.genfromtxt(self.solar_resource_file, delimiter = ',', dtype = 'str', skip_header = 0, max_rows = 2)
-        i = np.where(header[0,:] == 'Latitude')[0][0]
-        weather['lat' ] = float(header[1,i])
-        i = np.where(header[0,:] == 'Longitude')[0][0]
-        weather['lon'] = float(header[1,i])
-        i = np.where(header[0,:] == 'Time Zone')[0][0]
-        weather['tz'] = float(header[1,i])
-        i = np.where(header[0,:] == 'Elevation')[0][0]
-        weather['elev'] = float(header[1,i]) 
+        # Get header info (file is parsed once into the resource store)
+        table = resource_store.load_table(self.solar_resource_file, 3)
+        metadata = table.metadata()
+        weather['lat' ] = float(metadata['Latitude'])
+        weather['lon'] = float(metadata['Longitude'])
+        weather['tz'] = float(metadata['Time Zone'])
+        weather['elev'] = float(metadata['Elevation'])
 
         # Read in weather data
         labels = {'year': ['Year'],
@@ -161,15 +160,13 @@ class Clustering:
                 'tdry': ['Tdry', 'Temperature'],
                 'wspd': ['Wspd', 'Wind Speed']}
 
-        header = np.genfromtxt(self.solar_resource_file, dtype=str, delimiter=',', max_rows=1, skip_header=2)
-        data = np.genfromtxt(self.solar_resource_file, dtype=float, delimiter=',', skip_header=3)
+        header = table.column_names
         for k in labels.keys():
             found = False
             for j in labels[k]:
                 if j in header:
                     found = True
-                    c = header.tolist().index(j)
-                    weather[k] = data[:, c]
+                    weather[k] = np.array(table.data[:, header.index(j)])
             if not found:
                 print('Failed to find data for ' + k + ' in weather file')
 
@@ -292,7 +289,7 @@ class Clustering:
 
         #--- Read in price data
         hourly_data['price'] = np.ones(n_pts)
-        if self.price is None or self.price == {}:
+        if self.price is None or len(self.price) == 0:
             if self.weights['price'] > 0 or self.weights['price_prev'] > 0 or self.weights['price_next'] > 0:
                 print('Warning: Electricity price array was not provided. ' +
                     'Classification metrics will be calculated with a uniform price multiplier.')
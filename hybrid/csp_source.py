@@ -1,10 +1,13 @@
 from typing import Optional, Union, Sequence
+from collections import OrderedDict
 
 import rapidjson                # NOTE: install 'python-rapidjson' NOT 'rapidjson'
 
 import pandas as pd
 import numpy as np
 import datetime
+import hashlib
+import json
 import os
 
 from hybrid.pySSC_daotk.ssc_wrap import ssc_wrap
@@ -13,10 +16,14 @@ import PySAM.Singleowner as Singleowner
 from hybrid.dispatch.power_sources.csp_dispatch import CspDispatch
 from hybrid.power_source import *
 from hybrid.sites import SiteInfo
+from hybrid.resource.resource_store import resource_store
 
 
 class CspOutputs:
-    """Object for storing CSP outputs from SSC (SAM's Simulation Core) and dispatch optimization."""
+    """Object for storing CSP outputs from SSC (SAM's Simulation Core) and dispatch optimization.
+
+    Time series are stored in arrays preallocated for the simulation length, use ``to_lists`` for list copies.
+    """
     def __init__(self):
         self.ssc_time_series = {}
         self.dispatch = {}
@@ -44,9 +51,9 @@ class CspOutputs:
 
         if is_empty:
             for name, val in ssc_outputs.items():
-                if isinstance(val, list) and len(val) == ntot:  
-                    self.ssc_time_series[name] = [0.0]*ntot
-        
+                if isinstance(val, list) and len(val) == ntot:
+                    self.ssc_time_series[name] = np.zeros(ntot)
+
         for name in self.ssc_time_series.keys():
             self.ssc_time_series[name][i:i+n] = ssc_outputs[name][s1:s1+n]
 
@@ -67,11 +74,16 @@ class CspOutputs:
         is_empty = (len(self.dispatch) == 0)
         if is_empty:
             for key in outputs_keys:
-                self.dispatch[key] = [0.0] * 8760
+                self.dispatch[key] = np.zeros(8760)
 
         for key in outputs_keys:
             self.dispatch[key][sim_start_time: sim_start_time + n_periods] = getattr(dispatch, key)[0: n_periods]
 
+    def to_lists(self) -> dict:
+        """Returns a dictionary of the stored SSC time series and dispatch outputs as lists of floats"""
+        return {'ssc_time_series': {k: v.tolist() for k, v in self.ssc_time_series.items()},
+                'dispatch': {k: v.tolist() for k, v in self.dispatch.items()}}
+
 
 class CspPlant(PowerSource):
     _system_model: None
@@ -100,6 +112,8 @@ class CspPlant(PowerSource):
             #. ``cycle_capacity_kw``: float, Power cycle  design turbine gross output [kWe]
             #. ``solar_multiple``: float, Solar multiple [-]
             #. ``tes_hours``: float, Full load hours of thermal energy storage [hrs]
+            #. ``forecast_cache_dir``: (optional, default = None) str, Directory of the persistent cache of full-year
+               thermal forecasts, forecasts are only cached in memory if None.
         """
 
         required_keys = ['cycle_capacity_kw', 'solar_multiple', 'tes_hours']
@@ -137,6 +151,10 @@ class CspPlant(PowerSource):
 
         self.outputs = CspOutputs()
 
+        self.forecast_cache_dir = None
+        if 'forecast_cache_dir' in csp_config:
+            self.forecast_cache_dir = csp_config['forecast_cache_dir']
+
     def param_file_paths(self, relative_path: str):
         """
         Converts relative paths to absolute for files containing SSC default parameters
@@ -163,6 +181,13 @@ class CspPlant(PowerSource):
         else:
             raise ValueError('Electricity prices have not been set correctly in SiteInfo.')
 
+    def update_resource(self):
+        """
+        Sets the site's current solar resource as weather data of the plant
+        """
+        self.year_weather_df = self.tmy3_to_df()
+        self.set_weather(self.year_weather_df)
+
     def tmy3_to_df(self):
         """
         Parses TMY3 solar resource file (from SiteInfo) and coverts data to a Pandas DataFrame
@@ -172,25 +197,25 @@ class CspPlant(PowerSource):
 
         :returns: Weather file data (DataFrame)
         """
-        df = pd.read_csv(self.site.solar_resource.filename, sep=',', skiprows=2, header=0)
+        # File is parsed once into the resource store and shared with the solar resource
+        table = resource_store.load_table(self.site.solar_resource.filename, 3)
+        named = [i for i, name in enumerate(table.column_names) if len(name) > 0]
+        df = pd.DataFrame(np.array(table.data[:, named]), columns=[table.column_names[i] for i in named])
         date_cols = ['Year', 'Month', 'Day', 'Hour', 'Minute']
-        df.index = pd.to_datetime(df[date_cols])
+        df.index = pd.to_datetime(df[date_cols].astype(int))
         df.index.name = 'datetime'
         df.drop(date_cols, axis=1, inplace=True)
 
         df.index = df.index.map(lambda t: t.replace(year=df.index[0].year))  # normalize all years to that of 1/1
         df = df[df.columns.drop(list(df.filter(regex='Unnamed')))]  # drop unnamed columns (which are empty)
 
-        def get_weatherfile_location(tmy3_path):
-            df_meta = pd.read_csv(tmy3_path, sep=',', header=0, nrows=1)
-            return {
-                'latitude': float(df_meta['Latitude'][0]),
-                'longitude': float(df_meta['Longitude'][0]),
-                'timezone': int(df_meta['Time Zone'][0]),
-                'elevation': float(df_meta['Elevation'][0])
-            }
-
-        location = get_weatherfile_location(self.site.solar_resource.filename)
+        metadata = table.metadata()
+        location = {
+            'latitude': float(metadata['Latitude']),
+            'longitude': float(metadata['Longitude']),
+            'timezone': int(metadata['Time Zone']),
+            'elevation': float(metadata['Elevation'])
+        }
         df.attrs.update(location)
         return df
 
@@ -444,11 +469,107 @@ class CspPlant(PowerSource):
         # Inflate TES capacity, set near-zero startup requirements, and run ssc estimates
         original_values = {k: self.ssc.get(k) for k in ['tshours', 'rec_su_delay', 'rec_qf_delay']}
         self.ssc.set({'tshours': 100, 'rec_su_delay': 0.001, 'rec_qf_delay': 0.001})
-        print("Forecasting CSP thermal energy production...")
-        ssc_outputs = self.ssc.execute()
+
+        cache_key = self.get_ssc_inputs_key(self._forecast_cache_excluded_inputs, exclude_plant_state=False)
+        ssc_outputs = CspPlant._forecast_cache.get(cache_key)
+        if ssc_outputs is None:
+            ssc_outputs = self.load_cache_entry(self.forecast_cache_dir, cache_key)
+        if ssc_outputs is None:
+            print("Forecasting CSP thermal energy production...")
+            ssc_outputs = self.ssc.execute(self._forecast_outputs)
+            if ssc_outputs.get('cmod_success', 1):
+                self.store_cache_entry(self.forecast_cache_dir, cache_key, ssc_outputs)
+        if ssc_outputs.get('cmod_success', 1):
+            CspPlant._forecast_cache[cache_key] = ssc_outputs
+            CspPlant._forecast_cache.move_to_end(cache_key)
+            while len(CspPlant._forecast_cache) > CspPlant.forecast_cache_size:
+                CspPlant._forecast_cache.popitem(last=False)
         self.ssc.set(original_values)
 
-        return ssc_outputs
+        return dict(ssc_outputs)
+
+    # SSC inputs that do not affect design simulations, i.e., simulation time, dispatch targets, and prices
+    _ssc_cache_excluded_inputs = ['time_start', 'time_stop', 'is_rec_su_allowed_in', 'is_rec_sb_allowed_in',
+                                  'is_pc_su_allowed_in', 'is_pc_sb_allowed_in', 'q_pc_target_su_in',
+                                  'q_pc_target_on_in', 'q_pc_max_in', 'ppa_multiplier_model', 'dispatch_factors_ts']
+    # Thermal forecasts are keyed by all inputs except the simulation time, which is always the full year
+    _forecast_cache_excluded_inputs = ['time_start', 'time_stop']
+    # SSC outputs used by set_cycle_efficiency_tables and set_solar_thermal_resource
+    _forecast_outputs = ['Q_thermal', 'qsf_expected', 'cycle_eff_load_table', 'cycle_eff_Tdb_table',
+                         'cycle_wcond_Tdb_table', 'pc_config', 'ud_ind_od']
+    # In-memory thermal forecasts shared by all plants in the process, least recently used are dropped first
+    _forecast_cache = OrderedDict()
+    forecast_cache_size = 8
+
+    def get_ssc_inputs_key(self, excluded_inputs: list, exclude_plant_state: bool = True) -> str:
+        """
+        Gets a cache key of the current design, a hash of the SSC inputs (which include the solar resource data)
+        excluding inputs that do not affect the cached results.
+
+        :param excluded_inputs: SSC inputs not included in the key
+        :param exclude_plant_state: If True, plant state inputs are not included in the key
+
+        :returns: SHA-256 hex digest of the design inputs
+        """
+        excluded = set(excluded_inputs)
+        if exclude_plant_state:
+            excluded |= set(self.get_plant_state_io_map().keys())
+        design_inputs = {k: v for k, v in self.ssc.export_params().items() if k not in excluded}
+
+        def to_json(value):
+            if isinstance(value, np.ndarray):
+                return value.tolist()
+            if isinstance(value, np.generic):
+                return value.item()
+            raise TypeError("Cannot hash SSC input of type {}".format(type(value)))
+
+        canonical = json.dumps(design_inputs, sort_keys=True, separators=(',', ':'), default=to_json)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def load_cache_entry(cache_dir: Optional[str], cache_key: str) -> Optional[dict]:
+        """
+        Loads an entry from a persistent results cache.
+
+        :param cache_dir: Cache directory, None if caching is disabled
+        :param cache_key: Design key from :py:func:`get_ssc_inputs_key`
+
+        :returns: Cached results, None if caching is disabled or the design is not cached
+        """
+        if cache_dir is None:
+            return None
+        filename = os.path.join(cache_dir, cache_key + '.json')
+        if not os.path.isfile(filename):
+            return None
+        try:
+            with open(filename, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def store_cache_entry(cache_dir: Optional[str], cache_key: str, results: dict):
+        """
+        Stores an entry in a persistent results cache. The entry is written to a temporary file first, so concurrent
+        processes never read a partially written entry. Entries that cannot be written are not cached.
+
+        :param cache_dir: Cache directory, None if caching is disabled
+        :param cache_key: Design key from :py:func:`get_ssc_inputs_key`
+        :param results: Results to store
+        """
+        if cache_dir is None:
+            return
+        filename = os.path.join(cache_dir, cache_key + '.json')
+        tmp_filename = filename + '.{}.tmp'.format(os.getpid())
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(tmp_filename, 'w') as f:
+                json.dump(results, f)
+            os.replace(tmp_filename, filename)
+        except OSError as e:
+            logger.warning("Could not write cache entry {}: {}".format(filename, e))
+            if os.path.isfile(tmp_filename):
+                os.remove(tmp_filename)
 
     def set_cycle_efficiency_tables(self, ssc_outputs):
         """
@@ -513,10 +634,11 @@ class CspPlant(PowerSource):
         self.set_dispatch_targets(n_periods)
         self.update_ssc_inputs_from_plant_state()
 
-        results = self.simulate_power()
+        simulation_time = (end_datetime - start_datetime).total_seconds()
+        outputs, index_ranges = self.get_ssc_output_selection(simulation_time, store_outputs)
+        results = self.simulate_power(outputs, index_ranges)
 
         # Save plant state at end of simulation
-        simulation_time = (end_datetime - start_datetime).total_seconds()
         self.set_plant_state_from_ssc_outputs(results, simulation_time)
 
         # Save simulation output
@@ -524,16 +646,44 @@ class CspPlant(PowerSource):
             self.outputs.update_from_ssc_output(results)
             self.outputs.store_dispatch_outputs(self.dispatch, n_periods, sim_start_time)
 
-    def simulate_power(self) -> dict:
+    def get_ssc_output_selection(self, simulation_time: float, store_outputs: bool = True) -> tuple:
+        """
+        Gets the SSC outputs required after a dispatch horizon simulation, i.e., the plant state outputs and the
+        stored time series, limited to the simulated time steps at the front of the output arrays.
+
+        :param simulation_time: Simulated time of the horizon [s]
+        :param store_outputs: When *True* the time series stored in CspOutputs are included
+
+        :returns: output names, {name: (start, stop)} index ranges; (None, None) if all outputs are required, i.e.,
+            the stored time series are not yet known
+        """
+        if store_outputs and len(self.outputs.ssc_time_series) == 0:
+            return None, None
+
+        n_steps = int(round(simulation_time / 3600 * self.ssc.get('time_steps_per_hour')))
+        io_map = self.get_plant_state_io_map()
+        time_series = [output for ssc_input, output in io_map.items() if ssc_input != 'T_out_scas_initial']
+        if store_outputs:
+            time_series += [name for name in self.outputs.ssc_time_series.keys() if name not in time_series]
+
+        outputs = ['time_steps_per_hour', 'time_start', 'time_stop'] + list(io_map.values())
+        outputs += [name for name in time_series if name not in outputs]
+        index_ranges = {name: (0, n_steps) for name in time_series}
+        return outputs, index_ranges
+
+    def simulate_power(self, outputs: list = None, index_ranges: dict = None) -> dict:
         """
         Runs CSP system model simulate
 
+        :param outputs: (optional) Names of SSC outputs to return, if None all outputs are returned
+        :param index_ranges: (optional) Dictionary of {name: (start, stop)} index ranges of array outputs to return
+
         :returns: SSC results dictionary
         """
         if not self.ssc:
             raise ValueError('SSC was not correctly setup...')
 
-        results = self.ssc.execute()
+        results = self.ssc.execute(outputs, index_ranges)
         if not results["cmod_success"]:
             raise ValueError('PySSC simulation failed...')
 
@@ -833,17 +983,10 @@ class CspPlant(PowerSource):
         """
         attr_obj = None
         ssc_value = None
-        if var_name in self.__dir__():
+        if var_name in self.__dict__ or hasattr(type(self), var_name):
             attr_obj = self
         if not attr_obj:
-            for a in self._financial_model.__dir__():
-                group_obj = getattr(self._financial_model, a)
-                try:
-                    if var_name in group_obj.__dir__():
-                        attr_obj = group_obj
-                        break
-                except:
-                    pass
+            attr_obj = self._get_value_index((self._financial_model,)).get(var_name)
         if not attr_obj:
             try:
                 ssc_value = self.ssc.get(var_name)
@@ -970,14 +1113,14 @@ class CspPlant(PowerSource):
     @property
     def annual_energy_kwh(self) -> float:
         if self.system_capacity_kw > 0:
-            return sum(list(self.outputs.ssc_time_series['gen']))
+            return float(np.sum(self.outputs.ssc_time_series['gen']))
         else:
             return 0
 
     @property
     def generation_profile(self) -> list:
         if self.system_capacity_kw:
-            return list(self.outputs.ssc_time_series['gen'])
+            return self.outputs.ssc_time_series['gen'].tolist()
         else:
             return [0] * self.site.n_timesteps
 
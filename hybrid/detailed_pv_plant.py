@@ -3,6 +3,7 @@ import PySAM.Pvsamv1 as Pvsam
 import PySAM.Singleowner as Singleowner
 
 from hybrid.power_source import *
+from hybrid.resource import to_pysam_resource_data
 from hybrid.layout.pv_design_utils import *
 from hybrid.layout.pv_layout import PVLayout, PVGridParameters
 from hybrid.dispatch.power_sources.pv_dispatch import PvDispatch
@@ -36,7 +37,7 @@ class DetailedPVPlant(PowerSource):
 
         super().__init__("SolarPlant", site, system_model, financial_model)
 
-        self._system_model.SolarResource.solar_resource_data = self.site.solar_resource.data
+        self.update_resource()
         self.dc_degradation = [0]
 
         if 'layout_model' in pv_config.keys():
@@ -52,6 +53,12 @@ class DetailedPVPlant(PowerSource):
         self._dispatch: PvDispatch = None
         self.processed_assign(pv_config)
 
+    def update_resource(self):
+        """
+        Passes the site's current resource data to the system model
+        """
+        self._system_model.SolarResource.solar_resource_data = to_pysam_resource_data(self.site.solar_resource.data)
+
     def processed_assign(self, params):
         """
         Assign attributes from dictionaries with additional processing
@@ -8,6 +8,7 @@ from hybrid.dispatch.power_sources.trough_dispatch import TroughDispatch
 
 from hybrid.dispatch.power_storage.simple_battery_dispatch_heuristic import SimpleBatteryDispatchHeuristic
 from hybrid.dispatch.power_storage.one_cycle_battery_dispatch_heuristic import OneCycleBatteryDispatchHeuristic
+from hybrid.dispatch.power_storage.vectorized_battery_dispatch_heuristic import VectorizedBatteryDispatchHeuristic
 from hybrid.dispatch.power_storage.simple_battery_dispatch import SimpleBatteryDispatch
 from hybrid.dispatch.power_storage.linear_voltage_nonconvex_battery_dispatch import NonConvexLinearVoltageBatteryDispatch
 from hybrid.dispatch.power_storage.linear_voltage_convex_battery_dispatch import ConvexLinearVoltageBatteryDispatch
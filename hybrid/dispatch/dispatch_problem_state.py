@@ -1,142 +1,185 @@
+import numpy as np
+import pandas as pd
 from pyomo.opt import TerminationCondition
 
 
 class DispatchProblemState:
-    """Class for tracking dispatch problem solve state and metrics"""
-
-    def __init__(self):
-        self._start_time = ()
-        self._n_days = ()
-        self._termination_condition = ()
-        self._solve_time = ()
-        self._objective = ()
-        self._upper_bound = ()
-        self._lower_bound = ()
-        self._constraints = ()
-        self._variables = ()
-        self._non_zeros = ()
-        self._gap = ()
+    """Class for tracking dispatch problem solve state and metrics
+
+    Metrics are stored in arrays preallocated for the expected number of dispatch windows (grown by doubling if
+    exceeded), so storing the metrics of a solve does not depend on the number of solves already stored.
+    """
+    _metric_types = {'start_time': int,
+                     'window_start_time': int,
+                     'n_days': int,
+                     'termination_condition': object,
+                     'build_time': float,
+                     'solve_time': float,
+                     'objective': float,
+                     'upper_bound': float,
+                     'lower_bound': float,
+                     'constraints': float,
+                     'variables': float,
+                     'non_zeros': float,
+                     'gap': float}
+
+    def __init__(self, n_windows: int = 365):
+        """
+        :param n_windows: Expected number of dispatch problem solves (rolling horizon windows)
+        """
+        self._n_solves = 0
         self._n_non_optimal_solves = 0
-
-    def store_problem_metrics(self, solver_results, start_time, n_days, objective_value):
-        self.start_time = start_time
-        self.n_days = n_days
-        self.termination_condition = str(solver_results.solver.termination_condition)
+        self._data = {name: np.zeros(max(1, n_windows), dtype=dtype) for name, dtype in self._metric_types.items()}
+
+    def store_problem_metrics(self, solver_results, start_time, n_days, objective_value,
+                              window_start_time: int = None, build_time: float = None):
+        """
+        Stores dispatch problem metrics of a solve.
+
+        :param solver_results: Pyomo solver results
+        :param start_time: Simulation start time
+        :param n_days: Number of days simulated
+        :param objective_value: Dispatch objective value
+        :param window_start_time: (optional) Start time of the dispatch window solved
+        :param build_time: (optional) Time spent updating the dispatch model for the window [s]
+        """
         try:
-            self.solve_time = solver_results.solver.time
+            solve_time = solver_results.solver.time
         except AttributeError:
-            self.solve_time = solver_results.solver.wallclock_time
-        self.objective = objective_value
-        self.upper_bound = solver_results.problem.upper_bound
-        self.lower_bound = solver_results.problem.lower_bound
-        self.constraints = solver_results.problem.number_of_constraints
-        self.variables = solver_results.problem.number_of_variables
-        self.non_zeros = solver_results.problem.number_of_nonzeros
+            solve_time = solver_results.solver.wallclock_time
 
+        upper_bound = solver_results.problem.upper_bound
+        lower_bound = solver_results.problem.lower_bound
         # solver_results.solution.Gap not define
-        if solver_results.problem.upper_bound != 0.0:
-            self.gap = (abs(solver_results.problem.upper_bound - solver_results.problem.lower_bound)
-                        / abs(solver_results.problem.upper_bound))
-        elif solver_results.problem.lower_bound == 0.0:
-            self.gap = 0.0
+        if upper_bound != 0.0:
+            gap = abs(upper_bound - lower_bound) / abs(upper_bound)
+        elif lower_bound == 0.0:
+            gap = 0.0
         else:
-            self.gap = float('inf')
+            gap = float('inf')
+
+        self._append(start_time=start_time,
+                     window_start_time=start_time if window_start_time is None else window_start_time,
+                     n_days=n_days,
+                     termination_condition=str(solver_results.solver.termination_condition),
+                     build_time=np.nan if build_time is None else build_time,
+                     solve_time=self._to_float(solve_time),
+                     objective=self._to_float(objective_value),
+                     upper_bound=self._to_float(upper_bound),
+                     lower_bound=self._to_float(lower_bound),
+                     constraints=self._to_float(solver_results.problem.number_of_constraints),
+                     variables=self._to_float(solver_results.problem.number_of_variables),
+                     non_zeros=self._to_float(solver_results.problem.number_of_nonzeros),
+                     gap=gap)
 
         if not solver_results.solver.termination_condition == TerminationCondition.optimal:
             self._n_non_optimal_solves += 1
 
-    def _update_metric(self, metric_name, value):
-        data = list(getattr(self, metric_name))
-        data.append(value)
-        setattr(self, '_' + metric_name, tuple(data))
+    def extend(self, other: 'DispatchProblemState'):
+        """Appends the solve metrics stored in another problem state, e.g., from a parallel worker"""
+        n = other.n_solves
+        self._reserve(self._n_solves + n)
+        for name in self._metric_types.keys():
+            self._data[name][self._n_solves:self._n_solves + n] = other._data[name][0:n]
+        self._n_solves += n
+        self._n_non_optimal_solves += other.n_non_optimal_solves
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Returns solve metrics with one row per dispatch problem solve"""
+        return pd.DataFrame({name: data[0:self._n_solves] for name, data in self._data.items()})
+
+    def export(self, filename: str):
+        """
+        Exports solve metrics to a columnar file.
+
+        :param filename: File path, '.parquet' files are written with parquet format, otherwise csv format is used
+        """
+        df = self.to_dataframe()
+        if str(filename).endswith('.parquet'):
+            df.to_parquet(filename, index=False)
+        else:
+            df.to_csv(filename, index=False)
+
+    def _append(self, **metrics):
+        self._reserve(self._n_solves + 1)
+        for name, value in metrics.items():
+            self._data[name][self._n_solves] = value
+        self._n_solves += 1
+
+    def _reserve(self, size: int):
+        capacity = len(self._data['start_time'])
+        if size > capacity:
+            capacity = max(size, 2 * capacity)
+            for name, data in self._data.items():
+                grown = np.zeros(capacity, dtype=data.dtype)
+                grown[0:len(data)] = data
+                self._data[name] = grown
+
+    @staticmethod
+    def _to_float(value) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+
+    def _get_metric(self, metric_name) -> tuple:
+        return tuple(self._data[metric_name][0:self._n_solves].tolist())
+
+    @property
+    def n_solves(self) -> int:
+        return self._n_solves
 
     @property
     def start_time(self) -> tuple:
-        return self._start_time
+        return self._get_metric('start_time')
 
-    @start_time.setter
-    def start_time(self, start_hour: int):
-        self._update_metric('start_time', start_hour)
+    @property
+    def window_start_time(self) -> tuple:
+        return self._get_metric('window_start_time')
 
     @property
     def n_days(self) -> tuple:
-        return self._n_days
-
-    @n_days.setter
-    def n_days(self, solve_days: int):
-        self._update_metric('n_days', solve_days)
+        return self._get_metric('n_days')
 
     @property
     def termination_condition(self) -> tuple:
-        return self._termination_condition
+        return self._get_metric('termination_condition')
 
-    @termination_condition.setter
-    def termination_condition(self, condition: str):
-        self._update_metric('termination_condition', condition)
+    @property
+    def build_time(self) -> tuple:
+        return self._get_metric('build_time')
 
     @property
     def solve_time(self) -> tuple:
-        return self._solve_time
-
-    @solve_time.setter
-    def solve_time(self, time: float):
-        self._update_metric('solve_time', time)
+        return self._get_metric('solve_time')
 
     @property
     def objective(self) -> tuple:
-        return self._objective
-
-    @objective.setter
-    def objective(self, objective_value: float):
-        self._update_metric('objective', objective_value)
+        return self._get_metric('objective')
 
     @property
     def upper_bound(self) -> tuple:
-        return self._upper_bound
-
-    @upper_bound.setter
-    def upper_bound(self, bound: float):
-        self._update_metric('upper_bound', bound)
+        return self._get_metric('upper_bound')
 
     @property
     def lower_bound(self) -> tuple:
-        return self._lower_bound
-
-    @lower_bound.setter
-    def lower_bound(self, bound: float):
-        self._update_metric('lower_bound', bound)
+        return self._get_metric('lower_bound')
 
     @property
     def constraints(self) -> tuple:
-        return self._constraints
-
-    @constraints.setter
-    def constraints(self, constraint_count: int):
-        self._update_metric('constraints', constraint_count)
+        return self._get_metric('constraints')
 
     @property
     def variables(self) -> tuple:
-        return self._variables
-
-    @variables.setter
-    def variables(self, variable_count: int):
-        self._update_metric('variables', variable_count)
+        return self._get_metric('variables')
 
     @property
     def non_zeros(self) -> tuple:
-        return self._non_zeros
-
-    @non_zeros.setter
-    def non_zeros(self, non_zeros_count: int):
-        self._update_metric('non_zeros', non_zeros_count)
+        return self._get_metric('non_zeros')
 
     @property
     def gap(self) -> tuple:
-        return self._gap
-
-    @gap.setter
-    def gap(self, mip_gap: int):
-        self._update_metric('gap', mip_gap)
+        return self._get_metric('gap')
 
     @property
     def n_non_optimal_solves(self) -> int:
@@ -1,8 +1,10 @@
+import numpy as np
 import pyomo.environ as pyomo
 from pyomo.network import Port, Arc
 from pyomo.environ import units as u
 
 from hybrid.dispatch.dispatch import Dispatch
+from hybrid.resource.schedule_store import schedule_window
 
 
 class GridDispatch(Dispatch):
@@ -24,6 +26,8 @@ class GridDispatch(Dispatch):
                          system_model,
                          financial_model,
                          block_set_name=block_set_name)
+        # dispatch factors as an array, read from the financial model once per simulation
+        self._dispatch_factors = None
 
     def dispatch_block_rule(self, grid):
         # Parameters
@@ -138,19 +142,17 @@ class GridDispatch(Dispatch):
         grid_limit_kw = self._system_model.value('grid_interconnection_limit_kwac')
         self.generation_transmission_limit = [grid_limit_kw / 1e3] * len(self.blocks.index_set())
         self.load_transmission_limit = [grid_limit_kw / 1e3] * len(self.blocks.index_set())
+        self._dispatch_factors = None
 
     def update_time_series_parameters(self, start_time: int):
         n_horizon = len(self.blocks.index_set())
-        dispatch_factors = self._financial_model.value("dispatch_factors_ts")
+        if self._dispatch_factors is None:
+            self._dispatch_factors = np.array(self._financial_model.value("dispatch_factors_ts"), dtype=float)
         ppa_price = self._financial_model.value("ppa_price_input")[0]
-        if start_time + n_horizon > len(dispatch_factors):
-            prices = list(dispatch_factors[start_time:])
-            prices.extend(list(dispatch_factors[0:n_horizon - len(prices)]))
-        else:
-            prices = dispatch_factors[start_time:start_time + n_horizon]
+        prices = (schedule_window(self._dispatch_factors, start_time, n_horizon) * (ppa_price * 1e3)).tolist()
         # NOTE: Assuming the same prices
-        self.electricity_sell_price = [norm_price * ppa_price * 1e3 for norm_price in prices]
-        self.electricity_purchase_price = [norm_price * ppa_price * 1e3 for norm_price in prices]
+        self.electricity_sell_price = prices
+        self.electricity_purchase_price = prices
 
     @property
     def electricity_sell_price(self) -> list:
@@ -2,6 +2,7 @@ from typing import Union
 import sys, os
 from pathlib import Path
 import time
+import numpy as np
 
 import pyomo.environ as pyomo
 from pyomo.network import Port, Arc
@@ -9,8 +10,10 @@ from pyomo.opt import TerminationCondition
 from pyomo.util.check_units import assert_units_consistent
 
 from hybrid.sites import SiteInfo
-from hybrid.dispatch import HybridDispatch, HybridDispatchOptions, DispatchProblemState
+from hybrid.dispatch import HybridDispatch, HybridDispatchOptions, DispatchProblemState, VectorizedBatteryDispatchHeuristic
 from hybrid.clustering import Clustering
+from hybrid.resource.schedule_store import schedule_window
+from tools.utils import fork_pool
 
 class HybridDispatchBuilderSolver:
     """Helper class for building hybrid system dispatch problem, solving dispatch problem, and simulating system
@@ -47,24 +50,39 @@ class HybridDispatchBuilderSolver:
                 self.dispatch.create_max_gross_profit_objective()
             self.dispatch.create_arcs()
             assert_units_consistent(self.pyomo_model)
-            self.problem_state = DispatchProblemState()
+            n_windows = -(-self.site.n_timesteps // self.options.n_roll_periods)
+            self.problem_state = DispatchProblemState(n_windows)
         
         # Clustering (optional)
         self.clustering = None
         if self.options.use_clustering:
-            #TODO: Add resource data for wind
-            self.clustering = Clustering(power_sources.keys(), self.site.solar_resource.filename, wind_resource_data = None, price_data = self.site.elec_prices.data)
-            self.clustering.n_cluster = self.options.n_clusters
-            if len(self.options.clustering_weights.keys()) == 0:
-                self.clustering.use_default_weights = True
-            elif self.options.clustering_divisions.keys() != self.options.clustering_weights.keys():
-                print ('Warning: Keys in user-specified dictionaries for clustering weights and divisions do not match. Reverting to default weights/divisions')
-                self.clustering.use_default_weights = True
-            else:
-                self.clustering.weights = self.options.clustering_weights
-                self.clustering.divisions = self.options.clustering_divisions
-                self.clustering.use_default_weights = False
-            self.clustering.run_clustering()  # Create clusters and find exemplar days for simulation
+            self.create_clustering()
+
+    def create_clustering(self):
+        """
+        Creates clusters of the site's resource and price data and finds exemplar days for simulation
+        """
+        #TODO: Add resource data for wind
+        self.clustering = Clustering(self.power_sources.keys(), self.site.solar_resource.filename, wind_resource_data = None, price_data = self.site.elec_prices.data)
+        self.clustering.n_cluster = self.options.n_clusters
+        if len(self.options.clustering_weights.keys()) == 0:
+            self.clustering.use_default_weights = True
+        elif self.options.clustering_divisions.keys() != self.options.clustering_weights.keys():
+            print ('Warning: Keys in user-specified dictionaries for clustering weights and divisions do not match. Reverting to default weights/divisions')
+            self.clustering.use_default_weights = True
+        else:
+            self.clustering.weights = self.options.clustering_weights
+            self.clustering.divisions = self.options.clustering_divisions
+            self.clustering.use_default_weights = False
+        self.clustering.run_clustering()  # Create clusters and find exemplar days for simulation
+
+    def update_resource(self):
+        """
+        Updates the resource dependent parts of the dispatch after the site's resource data are changed, the
+        dispatch model itself does not depend on the resource
+        """
+        if self.clustering is not None:
+            self.create_clustering()
 
     def _create_dispatch_optimization_model(self):
         """
@@ -107,7 +125,8 @@ class HybridDispatchBuilderSolver:
             self.options)
         return model
 
-    def solve_dispatch_model(self, start_time: int, n_days: int):
+    def solve_dispatch_model(self, start_time: int, n_days: int, window_start_time: int = None,
+                             build_time: float = None):
         # Solve dispatch model
         if self.options.solver == 'glpk':
             solver_results = self.glpk_solve()
@@ -121,11 +140,17 @@ class HybridDispatchBuilderSolver:
             solver_results = self.gurobi_ampl_solve()
         elif self.options.solver == 'gurobi':
             solver_results = self.gurobi_solve()
+        elif self.options.solver == 'cbc_persistent':
+            solver_results = self.cbc_persistent_solve()
+        elif self.options.solver == 'highs_persistent':
+            solver_results = self.highs_persistent_solve()
         else:
             raise ValueError("{} is not a supported solver".format(self.options.solver))
 
         self.problem_state.store_problem_metrics(solver_results, start_time, n_days,
-                                                 self.dispatch.objective_value)
+                                                 self.dispatch.objective_value,
+                                                 window_start_time=window_start_time,
+                                                 build_time=build_time)
 
     @staticmethod
     def glpk_solve_call(pyomo_model: pyomo.ConcreteModel,
@@ -281,6 +306,106 @@ class HybridDispatchBuilderSolver:
                                                                         self.options.log_name,
                                                                         self.options.solver_options)
     @staticmethod
+    def create_persistent_session(solver_name: str):
+        """
+        Creates a persistent solver session for the rolling horizon dispatch problem.
+
+        The dispatch model's variables, parameters and constraints are fixed after it is built, so the session does
+        not scan the model for added or removed components between windows. Updated mutable parameters (time
+        series, initial conditions), modified constraints and a replaced objective are pushed to the solver.
+        persistent_solve_call raises if the number of constraints or variables changes.
+        """
+        opt = pyomo.SolverFactory(solver_name)
+        opt.update_config.check_for_new_or_removed_constraints = False
+        opt.update_config.check_for_new_or_removed_vars = False
+        opt.update_config.check_for_new_or_removed_params = False
+        opt.dispatch_model_structure = None
+        return opt
+
+    @staticmethod
+    def persistent_solve_call(opt,
+                              pyomo_model: pyomo.ConcreteModel,
+                              solver_spec_options: dict,
+                              log_name: str = "",
+                              user_solver_options: dict = None,
+                              solver_spec_log_key: str = "log_file"):
+        solver_options = SolverOptions(solver_spec_options, log_name, user_solver_options, solver_spec_log_key)
+
+        # The session does not check for added or removed components, see create_persistent_session
+        structure = (id(pyomo_model), pyomo_model.nconstraints(), pyomo_model.nvariables())
+        if opt.dispatch_model_structure is None:
+            opt.dispatch_model_structure = structure
+        elif opt.dispatch_model_structure != structure:
+            raise ValueError("Dispatch model structure changed since the persistent solver session was created, "
+                             "create a new session with create_persistent_session")
+
+        # Warm start from the variable values of the previous window's solution
+        start = time.time()
+        results = opt.solve(pyomo_model, options=solver_options.constructed, warmstart=True)
+        results.solver.time = time.time() - start
+        results.problem.number_of_constraints = structure[1]
+        results.problem.number_of_variables = structure[2]
+        results.problem.number_of_nonzeros = None
+
+        HybridDispatchBuilderSolver.log_and_solution_check(log_name, solver_options.instance_log, results.solver.termination_condition, pyomo_model)
+        return results
+
+    @staticmethod
+    def highs_persistent_solve_call(opt,
+                                    pyomo_model: pyomo.ConcreteModel,
+                                    log_name: str = "",
+                                    user_solver_options: dict = None):
+
+        # Ref. on solver options: https://ergo-code.github.io/HiGHS/dev/options/definitions/
+        highs_solver_options = {'time_limit': 30,
+                                'log_to_console': False}
+        return HybridDispatchBuilderSolver.persistent_solve_call(opt,
+                                                                 pyomo_model,
+                                                                 highs_solver_options,
+                                                                 log_name,
+                                                                 user_solver_options,
+                                                                 'log_file')
+
+    def highs_persistent_solve(self):
+        if self.opt is None:
+            self.opt = HybridDispatchBuilderSolver.create_persistent_session('appsi_highs')
+
+        return HybridDispatchBuilderSolver.highs_persistent_solve_call(self.opt,
+                                                                       self.pyomo_model,
+                                                                       self.options.log_name,
+                                                                       self.options.solver_options)
+
+    @staticmethod
+    def cbc_persistent_solve_call(opt,
+                                  pyomo_model: pyomo.ConcreteModel,
+                                  log_name: str = "",
+                                  user_solver_options: dict = None):
+        """
+        Solves with the CBC session, which keeps the model's LP representation and warm start up to date between
+        windows. CBC itself is a separate executable, so a CBC process is started and the LP file written for every
+        solve. Use the HiGHS session to keep the model loaded in the solver.
+        """
+        # FIXME: Logging does not work
+        if log_name != "":
+            print("Warning: Logging is not supported by the persistent CBC solver session.")
+            log_name = ""
+        cbc_solver_options = {'seconds': 60}
+        return HybridDispatchBuilderSolver.persistent_solve_call(opt,
+                                                                 pyomo_model,
+                                                                 cbc_solver_options,
+                                                                 log_name,
+                                                                 user_solver_options)
+
+    def cbc_persistent_solve(self):
+        if self.opt is None:
+            self.opt = HybridDispatchBuilderSolver.create_persistent_session('appsi_cbc')
+
+        return HybridDispatchBuilderSolver.cbc_persistent_solve_call(self.opt,
+                                                                     self.pyomo_model,
+                                                                     self.options.log_name,
+                                                                     self.options.solver_options)
+
+    @staticmethod
     def mindtpy_solve_call(pyomo_model: pyomo.ConcreteModel,
                            log_name: str = ""):
         raise NotImplementedError
@@ -364,6 +489,10 @@ class HybridDispatchBuilderSolver:
             return
         ti = list(range(0, self.site.n_timesteps, self.options.n_roll_periods))
         self.dispatch.initialize_parameters()
+        self._annual_heuristic_dispatch = None
+        if (self.options.use_annual_heuristic and 'heuristic' in self.options.battery_dispatch
+                and self.clustering is None):
+            self._annual_heuristic_dispatch = self.annual_battery_heuristic()
 
         if self.clustering is None:
             # Solving the year in series
@@ -384,48 +513,154 @@ class HybridDispatchBuilderSolver:
                         print("\t {:.0f} % complete".format(i*20/73))
                     self.simulate_with_dispatch(t)
         else:
-
-            initial_states = {tech:{'day':[], 'soc':[], 'load':[]} for tech in ['trough', 'tower', 'battery'] if tech in self.power_sources.keys()}  # List of known charge states at 12 am from completed simulations
-            npercluster = self.clustering.clusters['count']
-            inds = sorted(range(len(npercluster)), key=npercluster.__getitem__)  # Indicies to sort clusters by low-to-high number of days represented
-            for i in range(self.clustering.clusters['n_cluster']):
-                j = inds[i]  # cluster index
-                time_start, time_stop = self.clustering.get_sim_start_end_times(j)
-                battery_soc = self.clustering.battery_soc_heuristic(j, initial_states['battery']) if 'battery' in self.power_sources.keys() else None
-
-                # Set CSP initial states (need to do this prior to update_time_series_parameters() or update_initial_conditions(), both pull from the stored plant state)
-                for tech in ['trough', 'tower']:
-                    if tech in self.power_sources.keys():
-                        self.power_sources[tech].plant_state = self.power_sources[tech].set_initial_plant_state()  # Reset to default initial state
-                        csp_soc, is_cycle_on, initial_cycle_load = self.clustering.csp_initial_state_heuristic(j, self.power_sources[tech].solar_multiple, initial_states[tech])
-                        self.power_sources[tech].set_tes_soc(csp_soc)  
-                        self.power_sources[tech].set_cycle_state(is_cycle_on)  
-                        self.power_sources[tech].set_cycle_load(initial_cycle_load)
-
-                self.simulate_with_dispatch(time_start, self.clustering.ndays+1, battery_soc, n_initial_sims = 1)  
-
-                # Update lists of known states at 12am
-                for tech in ['trough', 'tower', 'battery']: 
-                    if tech in self.power_sources.keys():
-                        for d in range(self.clustering.ndays):
-                            day  = self.clustering.sim_start_days[j]+d
-                            initial_states[tech]['day'].append(day)
-                            if tech in ['trough', 'tower']:
-                                initial_states[tech]['soc'].append(self.power_sources[tech].get_tes_soc(day*24))
-                                initial_states[tech]['load'].append(self.power_sources[tech].get_cycle_load(day*24))
-                            elif tech in ['battery']:
-                                step = day*24 * int(self.site.n_timesteps/8760)
-                                initial_states[tech]['soc'].append(self.power_sources[tech].Outputs.SOC[step])
+            if self.options.n_cluster_workers > 1:
+                self.simulate_cluster_exemplars_in_parallel()
+            else:
+                initial_states = self._create_known_initial_states()
+                for j in self._cluster_simulation_order():
+                    self.simulate_cluster_exemplar(j, self._get_exemplar_initial_state(j, initial_states))
+                    self._update_known_initial_states(j, initial_states)
 
             # After exemplar simulations, update to full annual generation array for dispatchable technologies
             for tech in self.power_sources.keys():
                 if tech in ['battery']:
                     for key in ['gen', 'P', 'SOC']:
                         val = getattr(self.power_sources[tech].Outputs, key)
-                        setattr(self.power_sources[tech].Outputs, key, list(self.clustering.compute_annual_array_from_cluster_exemplar_data(val)))
+                        setattr(self.power_sources[tech].Outputs, key, np.array(self.clustering.compute_annual_array_from_cluster_exemplar_data(val)))
                 elif tech in ['trough', 'tower']:
                     for key in ['gen', 'P_out_net', 'P_cycle', 'q_dot_pc_startup', 'q_pc_startup', 'e_ch_tes', 'eta', 'q_pb']:  # Data quantities used in capacity value calculations
-                        self.power_sources[tech].outputs.ssc_time_series[key] = list(self.clustering.compute_annual_array_from_cluster_exemplar_data(self.power_sources[tech].outputs.ssc_time_series[key])) 
+                        self.power_sources[tech].outputs.ssc_time_series[key] = np.array(self.clustering.compute_annual_array_from_cluster_exemplar_data(self.power_sources[tech].outputs.ssc_time_series[key]))
+
+    def simulate_cluster_exemplars_in_parallel(self):
+        """
+        Simulates cluster exemplars across a pool of forked worker processes, see tools.utils.fork_pool. Each worker
+        holds its own copy of the dispatch model and system models. Exemplars are submitted in batches of
+        ``n_cluster_workers`` (in the same low-to-high count order as the serial simulation), and known initial
+        states are updated between batches so later exemplars still benefit from the initial state heuristics.
+        Exemplars of a batch do not see each other's states, so results depend on ``n_cluster_workers``.
+        Exemplars are simulated serially if forking is not supported.
+        """
+        n_workers = self.options.n_cluster_workers
+        order = self._cluster_simulation_order()
+        initial_states = self._create_known_initial_states()
+        with fork_pool(self, n_workers, initializer=_init_cluster_worker) as pool_map:
+            batch_size = n_workers if pool_map is not None else 1
+            for b in range(0, len(order), batch_size):
+                batch = order[b:b + batch_size]
+                if pool_map is None:
+                    for j in batch:
+                        self.simulate_cluster_exemplar(j, self._get_exemplar_initial_state(j, initial_states))
+                else:
+                    exemplar_states = [self._get_exemplar_initial_state(j, initial_states) for j in batch]
+                    results = pool_map(_simulate_cluster_exemplar, list(zip(batch, exemplar_states)))
+                    for j, (outputs, problem_state) in zip(batch, results):
+                        self._set_exemplar_outputs(j, outputs)
+                        if problem_state is not None:
+                            self.problem_state.extend(problem_state)
+                for j in batch:
+                    self._update_known_initial_states(j, initial_states)
+
+    def simulate_cluster_exemplar(self, cluster_id: int, exemplar_state: dict):
+        """
+        Simulates a single cluster exemplar with dispatch.
+
+        :param cluster_id: Cluster index
+        :param exemplar_state: Initial states of storage technologies, see ``_get_exemplar_initial_state``
+        """
+        time_start, time_stop = self.clustering.get_sim_start_end_times(cluster_id)
+
+        # Set CSP initial states (need to do this prior to update_time_series_parameters() or update_initial_conditions(), both pull from the stored plant state)
+        for tech in ['trough', 'tower']:
+            if tech in self.power_sources.keys():
+                csp_soc, is_cycle_on, initial_cycle_load = exemplar_state[tech]
+                self.power_sources[tech].plant_state = self.power_sources[tech].set_initial_plant_state()  # Reset to default initial state
+                self.power_sources[tech].set_tes_soc(csp_soc)
+                self.power_sources[tech].set_cycle_state(is_cycle_on)
+                self.power_sources[tech].set_cycle_load(initial_cycle_load)
+
+        self.simulate_with_dispatch(time_start, self.clustering.ndays+1, exemplar_state.get('battery'), n_initial_sims = 1)
+
+    def _cluster_simulation_order(self) -> list:
+        # Indicies to sort clusters by low-to-high number of days represented
+        npercluster = self.clustering.clusters['count']
+        inds = sorted(range(len(npercluster)), key=npercluster.__getitem__)
+        return inds[0:self.clustering.clusters['n_cluster']]
+
+    def _create_known_initial_states(self) -> dict:
+        # List of known charge states at 12 am from completed simulations
+        return {tech: {'day': [], 'soc': [], 'load': []} for tech in ['trough', 'tower', 'battery'] if tech in self.power_sources.keys()}
+
+    def _get_exemplar_initial_state(self, cluster_id: int, initial_states: dict) -> dict:
+        exemplar_state = {}
+        if 'battery' in self.power_sources.keys():
+            exemplar_state['battery'] = self.clustering.battery_soc_heuristic(cluster_id, initial_states['battery'])
+        for tech in ['trough', 'tower']:
+            if tech in self.power_sources.keys():
+                exemplar_state[tech] = self.clustering.csp_initial_state_heuristic(cluster_id,
+                                                                                  self.power_sources[tech].solar_multiple,
+                                                                                  initial_states[tech])
+        return exemplar_state
+
+    def _update_known_initial_states(self, cluster_id: int, initial_states: dict):
+        # Update lists of known states at 12am
+        for tech in ['trough', 'tower', 'battery']:
+            if tech in self.power_sources.keys():
+                for d in range(self.clustering.ndays):
+                    day = self.clustering.sim_start_days[cluster_id] + d
+                    initial_states[tech]['day'].append(day)
+                    if tech in ['trough', 'tower']:
+                        initial_states[tech]['soc'].append(self.power_sources[tech].get_tes_soc(day*24))
+                        initial_states[tech]['load'].append(self.power_sources[tech].get_cycle_load(day*24))
+                    elif tech in ['battery']:
+                        step = day*24 * int(self.site.n_timesteps/8760)
+                        initial_states[tech]['soc'].append(self.power_sources[tech].Outputs.SOC[step])
+
+    def _exemplar_stored_hours(self, cluster_id: int) -> tuple:
+        # Hours of the exemplar simulation that are stored (the first roll period is an initialization simulation)
+        time_start, time_stop = self.clustering.get_sim_start_end_times(cluster_id)
+        return time_start + self.options.n_roll_periods, time_start + (self.clustering.ndays + 1) * 24
+
+    def _get_exemplar_outputs(self, cluster_id: int) -> dict:
+        """Collects stored outputs of a simulated exemplar, indexed by technology and output name."""
+        hr_start, hr_end = self._exemplar_stored_hours(cluster_id)
+        outputs = {}
+        for tech in ['trough', 'tower', 'battery']:
+            if tech not in self.power_sources.keys():
+                continue
+            model = self.power_sources[tech]
+            if tech == 'battery':
+                steps_per_hour = int(self.site.n_timesteps / 8760)
+                idx = slice(hr_start * steps_per_hour, hr_end * steps_per_hour)
+                outputs[tech] = {attr: getattr(model.Outputs, attr)[idx] for attr in vars(model.Outputs).keys()
+                                 if attr != 'stateful_attributes'}
+            else:
+                steps_per_hour = int(model.ssc.get('time_steps_per_hour'))
+                idx = slice(hr_start * steps_per_hour, hr_end * steps_per_hour)
+                outputs[tech] = {'ssc_time_series': {k: v[idx] for k, v in model.outputs.ssc_time_series.items()},
+                                 'dispatch': {k: v[hr_start:hr_end] for k, v in model.outputs.dispatch.items()}}
+        return outputs
+
+    def _set_exemplar_outputs(self, cluster_id: int, outputs: dict):
+        """Writes exemplar outputs collected by ``_get_exemplar_outputs`` into the technology outputs."""
+        hr_start, hr_end = self._exemplar_stored_hours(cluster_id)
+        for tech, tech_outputs in outputs.items():
+            model = self.power_sources[tech]
+            if tech == 'battery':
+                steps_per_hour = int(self.site.n_timesteps / 8760)
+                idx = slice(hr_start * steps_per_hour, hr_end * steps_per_hour)
+                for attr, val in tech_outputs.items():
+                    getattr(model.Outputs, attr)[idx] = val
+            else:
+                steps_per_hour = int(model.ssc.get('time_steps_per_hour'))
+                idx = slice(hr_start * steps_per_hour, hr_end * steps_per_hour)
+                for group, data in tech_outputs.items():
+                    stored = getattr(model.outputs, group)
+                    window = idx if group == 'ssc_time_series' else slice(hr_start, hr_end)
+                    n_total = int(steps_per_hour * 8760) if group == 'ssc_time_series' else 8760
+                    for key, val in data.items():
+                        if key not in stored:
+                            stored[key] = np.zeros(n_total)
+                        stored[key][window] = val
 
     def simulate_with_dispatch(self,
                                start_time: int,
@@ -438,6 +673,7 @@ class HybridDispatchBuilderSolver:
                                            self.options.n_roll_periods))
 
         for i, sim_start_time in enumerate(update_dispatch_times):
+            build_start = time.time()
             # Update battery initial state of charge
             if 'battery' in self.power_sources.keys():
                 self.power_sources['battery'].dispatch.update_dispatch_initial_soc(initial_soc=initial_soc)
@@ -450,27 +686,22 @@ class HybridDispatchBuilderSolver:
 
             if self.site.follow_desired_schedule:
                 n_horizon = len(self.power_sources['grid'].dispatch.blocks.index_set())
-                if start_time + n_horizon > len(self.site.desired_schedule):
-                    system_limit = list(self.site.desired_schedule[start_time:])
-                    system_limit.extend(list(self.site.desired_schedule[0:n_horizon - len(system_limit)]))
-                else:
-                    system_limit = self.site.desired_schedule[start_time:start_time + n_horizon]
+                system_limit = schedule_window(self.site.desired_schedule, start_time, n_horizon)
 
                 transmission_limit = self.power_sources['grid'].value('grid_interconnection_limit_kwac') / 1e3
-                for count, value in enumerate(system_limit):
-                    if value > transmission_limit:
-                        print('Warning: Desired schedule is greater than transmission limit. '
-                              'Overwriting schedule to transmission limit')
-                        system_limit[count] = transmission_limit
+                if np.any(system_limit > transmission_limit):
+                    print('Warning: Desired schedule is greater than transmission limit. '
+                          'Overwriting schedule to transmission limit')
+                system_limit = np.minimum(system_limit, transmission_limit)
 
                 self.power_sources['grid'].dispatch.generation_transmission_limit = system_limit
 
             if 'heuristic' in self.options.battery_dispatch:
                 # TODO: this is not a good way to do this... This won't work with CSP addition...
-                self.battery_heuristic()
+                self.battery_heuristic(sim_start_time)
                 # TODO: we could just run the csp model without dispatch here
             else:
-                self.solve_dispatch_model(start_time, n_days)
+                self.solve_dispatch_model(start_time, n_days, sim_start_time, time.time() - build_start)
             
             store_outputs = True
             battery_sim_start_time = sim_start_time
@@ -492,7 +723,18 @@ class HybridDispatchBuilderSolver:
                                                                    sim_start_time=sim_start_time,
                                                                    store_outputs=store_outputs)
 
-    def battery_heuristic(self):
+    def battery_heuristic(self, sim_start_time: int = None):
+        battery_dispatch = self.power_sources['battery'].dispatch
+        if sim_start_time is not None and getattr(self, '_annual_heuristic_dispatch', None) is not None:
+            # Use the dispatch planned for the whole year, re-projected from the simulated state-of-charge
+            n_horizon = self.options.n_look_ahead_periods
+            fixed_dispatch = schedule_window(self._annual_heuristic_dispatch, sim_start_time, n_horizon)
+            heuristic = VectorizedBatteryDispatchHeuristic.from_dispatch(battery_dispatch)
+            fixed_dispatch, _ = heuristic.enforce_soc_bounds(fixed_dispatch, battery_dispatch.initial_soc)
+            battery_dispatch._fixed_dispatch = fixed_dispatch.tolist()
+            battery_dispatch._fix_dispatch_model_variables()
+            return
+
         tot_gen = [0.0]*self.options.n_look_ahead_periods
         if 'pv' in self.power_sources.keys():
             pv_gen = self.power_sources['pv'].dispatch.available_generation
@@ -510,6 +752,37 @@ class HybridDispatchBuilderSolver:
 
         self.power_sources['battery'].dispatch.set_fixed_dispatch(tot_gen, grid_limit)
 
+    def annual_battery_heuristic(self) -> np.ndarray:
+        """
+        Computes heuristic battery dispatch for every time step of the simulation at once using
+        ``VectorizedBatteryDispatchHeuristic``, with the same inputs as ``battery_heuristic``.
+
+        :returns: Normalized battery dispatch [-1, 1] (Charging (-), Discharging (+))
+        """
+        tot_gen = np.zeros(self.site.n_timesteps)
+        for tech in ['pv', 'wind']:
+            if tech in self.power_sources.keys():
+                tot_gen += np.maximum(np.array(self.power_sources[tech].generation_profile[0:self.site.n_timesteps]), 0) / 1e3
+
+        grid = self.power_sources['grid']
+        grid_limit = np.full(self.site.n_timesteps, grid.value('grid_interconnection_limit_kwac') / 1e3)
+        if self.site.follow_desired_schedule:
+            grid_limit = np.minimum(grid_limit, np.array(self.site.desired_schedule[0:self.site.n_timesteps]))
+
+        battery_dispatch = self.power_sources['battery'].dispatch
+        battery_dispatch.update_time_series_parameters(0)
+        heuristic = VectorizedBatteryDispatchHeuristic.from_dispatch(battery_dispatch)
+
+        if 'one_cycle' in self.options.battery_dispatch:
+            dispatch_factors = np.array(grid._financial_model.value("dispatch_factors_ts")[0:self.site.n_timesteps])
+            prices = dispatch_factors * grid._financial_model.value("ppa_price_input")[0] * 1e3
+            fixed_dispatch, _ = heuristic.one_cycle_dispatch(tot_gen, grid_limit, prices, battery_dispatch.initial_soc,
+                                                             self.site.n_periods_per_day)
+        else:
+            fixed_dispatch = heuristic.fixed_dispatch(battery_dispatch.user_fixed_dispatch, tot_gen, grid_limit)
+            fixed_dispatch, _ = heuristic.enforce_soc_bounds(fixed_dispatch, battery_dispatch.initial_soc)
+        return fixed_dispatch
+
     @property
     def pyomo_model(self) -> pyomo.ConcreteModel:
         return self._pyomo_model
@@ -531,4 +804,19 @@ class SolverOptions:
         if user_solver_options is not None:
             self.constructed.update(user_solver_options)
         
-            
\ No newline at end of file
+            
+
+
+def _init_cluster_worker(builder: HybridDispatchBuilderSolver):
+    # Solver sessions are not shared with the parent process
+    builder.opt = None
+
+
+def _simulate_cluster_exemplar(builder: HybridDispatchBuilderSolver, cluster_id: int, exemplar_state: dict):
+    problem_state = None
+    if builder.needs_dispatch:
+        builder.problem_state = DispatchProblemState()
+    builder.simulate_cluster_exemplar(cluster_id, exemplar_state)
+    if builder.needs_dispatch:
+        problem_state = builder.problem_state
+    return builder._get_exemplar_outputs(cluster_id), problem_state
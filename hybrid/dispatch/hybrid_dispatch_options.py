@@ -20,7 +20,11 @@ class HybridDispatchOptions:
 
             dict: {
                 'solver': str (default='glpk'), MILP solver used for dispatch optimization problem
-                    options: ('glpk', 'cbc')
+                    options: ('glpk', 'cbc', 'cbc_persistent', 'highs_persistent', 'xpress', 'xpress_persistent',
+                              'gurobi_ampl', 'gurobi'). Persistent solvers keep the model loaded across rolling
+                              horizon windows and warm start from the previous solution.
+                              'highs_persistent' keeps the model loaded in HiGHS, 'cbc_persistent' keeps the
+                              model's LP file up to date but starts a CBC process for every solve.
                 'solver_options': dict, Dispatch solver options
                 'battery_dispatch': str (default='simple'), sets the battery dispatch model to use for dispatch
                     options: ('simple', 'one_cycle_heuristic', 'heuristic', 'non_convex_LV', 'convex_LV'),
@@ -36,6 +40,8 @@ class HybridDispatchOptions:
                 'n_clusters': int (default = 30)
                 'clustering_weights' : dict (default = {}). Custom weights used for classification metrics for data clustering.  If empty, default weights will be used.  
                 'clustering_divisions' : dict (default = {}).  Custom number of averaging periods for classification metrics for data clustering.  If empty, default values will be used.  
+                'n_cluster_workers' : int (default = 1), number of worker processes used to simulate cluster exemplars in parallel (requires 'fork' process start, i.e., Linux, otherwise exemplars are simulated serially). Exemplars are simulated in batches of n_cluster_workers, and the initial state heuristics of an exemplar only use the states of earlier batches, so results differ slightly between worker counts but are reproducible for a given count
+                'use_annual_heuristic' : bool (default = False), if True and a heuristic battery dispatch is used without clustering, the heuristic dispatch is planned for the whole year at once and each rolling window's commands are re-projected from the simulated state-of-charge
                 }
         """
         self.solver: str = 'cbc'
@@ -54,6 +60,8 @@ class HybridDispatchOptions:
         self.n_clusters: int = 30
         self.clustering_weights: dict = {}
         self.clustering_divisions: dict = {}
+        self.n_cluster_workers: int = 1
+        self.use_annual_heuristic: bool = False
 
         if dispatch_options is not None:
             for key, value in dispatch_options.items():
@@ -666,16 +666,15 @@ class CspDispatch(Dispatch):
 
         # Set available thermal energy based on forecast
         thermal_resource = self._system_model.solar_thermal_resource
-        temperature = list(self._system_model.year_weather_df.Temperature.values)
+        temperature = self._system_model.year_weather_df.Temperature.values
+        # only the horizon window is converted, wrapping around to the start of the year
         if start_time + n_horizon > len(thermal_resource):
             field_gen = list(thermal_resource[start_time:])
             field_gen.extend(list(thermal_resource[0:n_horizon - len(field_gen)]))
-
-            dry_bulb_temperature = list(temperature[start_time:])
-            dry_bulb_temperature.extend(list(temperature[0:n_horizon - len(dry_bulb_temperature)]))
         else:
             field_gen = thermal_resource[start_time:start_time + n_horizon]
-            dry_bulb_temperature = temperature[start_time:start_time + n_horizon]
+        window = np.arange(start_time, start_time + n_horizon) % len(temperature)
+        dry_bulb_temperature = temperature[window].tolist()
 
         self.available_thermal_generation = field_gen
         # Set cycle performance parameters that depend on ambient temperature
@@ -0,0 +1,226 @@
+from typing import Tuple, Union
+
+import numpy as np
+
+from hybrid.dispatch.power_storage.power_storage_dispatch import PowerStorageDispatch
+
+
+class VectorizedBatteryDispatchHeuristic:
+    """Whole-year battery heuristic dispatch using NumPy array operations.
+
+    Computes normalized battery dispatch [-1, 1] (Charging (-), Discharging (+)) for every time step of a simulation
+    at once, instead of fixing dispatch through pyomo blocks one day at a time. The storage parameters (SOC bounds,
+    efficiencies, capacity and power rating) have the same meaning and units as ``PowerStorageDispatch``, and
+    states-of-charge are in [%] as well.
+
+    NOTE: As with the pyomo based heuristics, this assumes that the battery cannot be charged by the grid.
+    """
+    def __init__(self,
+                 capacity: float,
+                 maximum_power: float,
+                 minimum_soc: float,
+                 maximum_soc: float,
+                 charge_efficiency: float,
+                 discharge_efficiency: float,
+                 time_duration: float = 1.0):
+        """
+
+        :param capacity: Battery energy capacity [MWh]
+        :param maximum_power: Battery power rating [MW]
+        :param minimum_soc: Minimum state-of-charge [%]
+        :param maximum_soc: Maximum state-of-charge [%]
+        :param charge_efficiency: Charge efficiency [%]
+        :param discharge_efficiency: Discharge efficiency [%]
+        :param time_duration: Time step duration [hr]
+        """
+        self.capacity = capacity
+        self.maximum_power = maximum_power
+        self.minimum_soc = minimum_soc
+        self.maximum_soc = maximum_soc
+        self.charge_efficiency = charge_efficiency
+        self.discharge_efficiency = discharge_efficiency
+        self.time_duration = time_duration
+
+    @classmethod
+    def from_dispatch(cls, dispatch: PowerStorageDispatch):
+        """Creates heuristic using the parameters of an initialized storage dispatch model."""
+        return cls(dispatch.capacity,
+                   dispatch.maximum_power,
+                   dispatch.minimum_soc,
+                   dispatch.maximum_soc,
+                   dispatch.charge_efficiency,
+                   dispatch.discharge_efficiency,
+                   dispatch.time_duration[0])
+
+    def power_fraction_limits(self, gen: Union[list, np.ndarray],
+                              grid_limit: Union[list, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """Battery charge and discharge power fraction limits based on available generation and grid capacity.
+
+        :param gen: Available generation [MW]
+        :param grid_limit: Grid transmission limit [MW]
+
+        :returns: max charge fraction, max discharge fraction
+        """
+        gen = np.asarray(gen, dtype=float)
+        grid_limit = np.broadcast_to(np.asarray(grid_limit, dtype=float), gen.shape)
+        max_charge_fraction = np.clip(gen / self.maximum_power, 0.0, 1.0)
+        max_discharge_fraction = np.clip((grid_limit - gen) / self.maximum_power, 0.0, 1.0)
+        return max_charge_fraction, max_discharge_fraction
+
+    def fixed_dispatch(self, user_fixed_dispatch: Union[list, np.ndarray],
+                       gen: Union[list, np.ndarray],
+                       grid_limit: Union[list, np.ndarray]) -> np.ndarray:
+        """Enforces power fraction limits on a user fixed dispatch (``SimpleBatteryDispatchHeuristic`` method).
+
+        :param user_fixed_dispatch: Normalized dispatch values [-1, 1], either for every time step or a repeating
+            schedule (e.g., one day) which is tiled over the simulation
+        :param gen: Available generation [MW]
+        :param grid_limit: Grid transmission limit [MW]
+
+        :returns: Normalized fixed dispatch for every time step
+        """
+        max_charge_fraction, max_discharge_fraction = self.power_fraction_limits(gen, grid_limit)
+        n = len(max_charge_fraction)
+        user_fixed_dispatch = np.asarray(user_fixed_dispatch, dtype=float)
+        if n % len(user_fixed_dispatch) != 0:
+            raise ValueError("user_fixed_dispatch length must divide the number of simulation time steps.")
+        if user_fixed_dispatch.max() > 1.0 or user_fixed_dispatch.min() < -1.0:
+            raise ValueError("user_fixed_dispatch must be normalized values between -1 and 1.")
+        fd = np.tile(user_fixed_dispatch, n // len(user_fixed_dispatch))
+        return np.where(fd > 0.0, np.minimum(fd, max_discharge_fraction), np.maximum(fd, -max_charge_fraction))
+
+    def one_cycle_dispatch(self, gen: Union[list, np.ndarray],
+                           grid_limit: Union[list, np.ndarray],
+                           prices: Union[list, np.ndarray],
+                           initial_soc: float,
+                           n_periods_per_day: int = 24) -> Tuple[np.ndarray, np.ndarray]:
+        """Sets battery dispatch assuming one full cycle per day (``OneCycleBatteryDispatchHeuristic`` method).
+
+        Method (applied to every day at once):
+         1. Sort periods by price (ties broken by higher generation first)
+         2. Charge in the lowest priced half and discharge in the highest priced half of the day, each limited by
+            the duration of a full cycle and the power fraction limits
+         3. Enforce state-of-charge bounds over the whole simulation
+         4. Shift operation removed by step 3 to the next sorted price periods not yet used
+         5. Repeat steps 3 and 4 until no operation is removed or no periods remain
+
+        :param gen: Available generation [MW]
+        :param grid_limit: Grid transmission limit [MW]
+        :param prices: Electricity prices [$/MWh]
+        :param initial_soc: Initial state-of-charge [%]
+        :param n_periods_per_day: Number of time periods per day
+
+        :returns: feasible fixed dispatch, state-of-charge [%] at the end of each time step
+        """
+        max_charge_fraction, max_discharge_fraction = self.power_fraction_limits(gen, grid_limit)
+        n = len(max_charge_fraction)
+        if n % n_periods_per_day != 0:
+            raise ValueError("Number of time steps must be a multiple of n_periods_per_day.")
+        prices = np.asarray(prices, dtype=float)
+        if len(prices) != n:
+            raise ValueError("prices must be the same length as gen.")
+
+        shape = (n // n_periods_per_day, n_periods_per_day)
+        order = np.lexsort((-np.asarray(gen, dtype=float).reshape(shape), prices.reshape(shape)), axis=1)
+        half = n_periods_per_day // 2
+        rows = np.arange(shape[0])[:, None]
+        charge_idx = order[:, :half]
+        discharge_idx = order[:, ::-1][:, :n_periods_per_day - half]
+        max_charge = max_charge_fraction.reshape(shape)[rows, charge_idx]
+        max_discharge = max_discharge_fraction.reshape(shape)[rows, discharge_idx]
+
+        discharge_time, charge_time = self.get_duration_battery_full_cycle()
+        charge_remaining = np.full((shape[0], 1), charge_time)
+        discharge_remaining = np.full((shape[0], 1), discharge_time)
+        charge_available = np.ones(max_charge.shape, dtype=bool)
+        discharge_available = np.ones(max_discharge.shape, dtype=bool)
+        fixed_dispatch = np.zeros(shape)
+
+        for _ in range(n_periods_per_day):
+            charge = self._allocate(charge_remaining, np.where(charge_available, max_charge, 0.0))
+            discharge = self._allocate(discharge_remaining, np.where(discharge_available, max_discharge, 0.0))
+            charge_available &= (charge == 0.0)
+            discharge_available &= (discharge == 0.0)
+            fixed_dispatch[rows, charge_idx] -= charge
+            fixed_dispatch[rows, discharge_idx] += discharge
+
+            feasible_dispatch, soc = self.enforce_soc_bounds(fixed_dispatch.reshape(n), initial_soc)
+            removed = (fixed_dispatch - feasible_dispatch.reshape(shape)) * self.time_duration
+            fixed_dispatch = feasible_dispatch.reshape(shape)
+
+            # Operation removed to be shifted to the next best periods
+            charge_remaining = np.maximum(- removed, 0.0).sum(axis=1, keepdims=True)
+            discharge_remaining = np.maximum(removed, 0.0).sum(axis=1, keepdims=True)
+            charge_remaining[~charge_available.any(axis=1)] = 0.0
+            discharge_remaining[~discharge_available.any(axis=1)] = 0.0
+            if charge_remaining.max() <= 1e-9 and discharge_remaining.max() <= 1e-9:
+                break
+
+        return fixed_dispatch.reshape(n), soc
+
+    def _allocate(self, duration: np.ndarray, max_fraction: np.ndarray) -> np.ndarray:
+        """Allocates full power duration [hr] to periods in order along axis 1, limited by power fractions."""
+        period_energy = max_fraction * self.time_duration
+        energy_before = np.cumsum(period_energy, axis=1) - period_energy
+        return np.clip(duration - energy_before, 0.0, period_energy) / self.time_duration
+
+    def get_duration_battery_full_cycle(self) -> Tuple[float, float]:
+        """ Calculates discharge and charge hours required to fully cycle the battery."""
+        true_capacity = (self.maximum_soc - self.minimum_soc) * self.capacity / 100.0
+
+        n_discharge = true_capacity / (1/(self.discharge_efficiency/100.) * self.maximum_power)
+        n_charge = true_capacity / (self.charge_efficiency / 100. * self.maximum_power)
+        return n_discharge, n_charge
+
+    def soc_change(self, fixed_dispatch: np.ndarray) -> np.ndarray:
+        """State-of-charge change [%] of each time step for a normalized dispatch."""
+        fixed_dispatch = np.asarray(fixed_dispatch, dtype=float)
+        power = fixed_dispatch * self.maximum_power
+        energy = np.where(power > 0.0,
+                          - power / (self.discharge_efficiency / 100.),
+                          - power * self.charge_efficiency / 100.)
+        return 100. * self.time_duration * energy / self.capacity
+
+    def soc(self, fixed_dispatch: np.ndarray, initial_soc: float) -> np.ndarray:
+        """State-of-charge [%] at the end of each time step for a normalized dispatch, from an initial state-of-charge
+        [%]."""
+        return initial_soc + np.cumsum(self.soc_change(fixed_dispatch))
+
+    def enforce_soc_bounds(self, fixed_dispatch: Union[list, np.ndarray],
+                           initial_soc: float) -> Tuple[np.ndarray, np.ndarray]:
+        """Reduces charge and discharge operations that would violate the state-of-charge bounds.
+
+        Equivalent to stepping through the time steps and clipping the state-of-charge to its bounds after each one,
+        which removes only the operation exceeding a bound in each time step. Each step is the map
+        soc -> clip(soc + change, lower, upper), and compositions of such maps have the same form, so the
+        state-of-charge of all time steps is computed with a prefix scan of log2(time steps) array operations.
+
+        :param fixed_dispatch: Normalized dispatch values [-1, 1]
+        :param initial_soc: Initial state-of-charge [%]
+
+        :returns: feasible fixed dispatch, state-of-charge [%] at the end of each time step
+        """
+        lower = self.minimum_soc
+        upper = self.maximum_soc
+        initial_soc = min(max(initial_soc, lower), upper)
+
+        # map of each time step up to t: soc_t = clip(initial_soc + change[t], low[t], high[t])
+        change = self.soc_change(fixed_dispatch)
+        low = np.full(len(change), float(lower))
+        high = np.full(len(change), float(upper))
+        shift = 1
+        while shift < len(change):
+            # compose the maps up to t - shift with the maps of the shift steps up to t
+            previous_low = np.clip(low[:-shift] + change[shift:], low[shift:], high[shift:])
+            previous_high = np.clip(high[:-shift] + change[shift:], low[shift:], high[shift:])
+            change[shift:] = change[:-shift] + change[shift:]
+            low[shift:] = previous_low
+            high[shift:] = previous_high
+            shift *= 2
+        soc = np.clip(initial_soc + change, low, high)
+
+        delta = np.diff(soc, prepend=initial_soc) / 100.
+        power = np.where(delta < 0.0,
+                         - delta * self.capacity * (self.discharge_efficiency / 100.),
+                         - delta * self.capacity / (self.charge_efficiency / 100.)) / self.time_duration
+        return power / self.maximum_power, soc
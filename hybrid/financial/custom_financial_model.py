@@ -276,13 +276,10 @@ class CustomFinancialModel():
 
     def value(self, var_name, var_value=None):
         attr_obj = None
-        if var_name in self.__dir__():
+        if var_name in self.__dict__ or hasattr(type(self), var_name):
             attr_obj = self
         if not attr_obj:
-            for sc in self.subclasses:
-                if var_name in sc.__dir__():
-                    attr_obj = sc
-                    break
+            attr_obj = self._get_value_index().get(var_name)
         if not attr_obj:
             raise ValueError("Variable {} not found in CustomFinancialModel".format(var_name))
 
@@ -298,6 +295,19 @@ class CustomFinancialModel():
                 raise IOError(f"{self.__class__}'s attribute {var_name} could not be set to {var_value}: {e}")
 
     
+    def _get_value_index(self) -> dict:
+        """Returns the index of variable name to the subclass that owns it, rebuilt if the subclasses change"""
+        index_subclasses = getattr(self, '_value_index_subclasses', None)
+        if index_subclasses is None or len(index_subclasses) != len(self.subclasses) \
+                or any(a is not b for a, b in zip(self.subclasses, index_subclasses)):
+            index = {}
+            for sc in self.subclasses:
+                for name in sc.__dir__():
+                    index.setdefault(name, sc)
+            self._value_index = index
+            self._value_index_subclasses = list(self.subclasses)
+        return self._value_index
+
     def assign(self, input_dict):
         for k, v in input_dict.items():
             if not isinstance(v, dict):
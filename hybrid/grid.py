@@ -61,7 +61,7 @@ class Grid(PowerSource):
         """
         if self.site.follow_desired_schedule:
             # Desired schedule sets the upper bound of the system output, any over generation is curtailed
-            lifetime_schedule = np.tile([x * 1e3 for x in self.site.desired_schedule],
+            lifetime_schedule = np.tile(np.asarray(self.site.desired_schedule) * 1e3,
                                         int(project_life / (len(self.site.desired_schedule) // self.site.n_timesteps)))
             self.generation_profile = np.minimum(total_gen, lifetime_schedule)
 
@@ -11,6 +11,7 @@ from scipy.stats import pearsonr
 import PySAM.GenericSystem as GenericSystem
 import PySAM.Singleowner as Singleowner
 from tools.analysis import create_cost_calculator
+from tools.utils import fork_pool_map
 from hybrid.sites import SiteInfo
 from hybrid.pv_source import PVPlant
 from hybrid.detailed_pv_plant import DetailedPVPlant
@@ -618,6 +619,101 @@ class HybridSimulation:
         self.calculate_financials()
         self.simulate_financials(project_life)
 
+    def set_resource_year(self, year: int, solar_resource_file="", wind_resource_file=""):
+        """
+        Changes the weather year of the site and passes the new resource data to the system models and dispatch,
+        keeping all design dependent setup.
+
+        :param year: Resource year
+        :param solar_resource_file: (optional) Solar resource file of the year, downloaded from NSRDB if not provided
+        :param wind_resource_file: (optional) Wind resource file of the year, downloaded from wind-toolkit if not provided
+        """
+        self.site.set_resource_year(year, solar_resource_file, wind_resource_file)
+        for model in self.power_sources.values():
+            model.update_resource()
+        self.dispatch_builder.update_resource()
+
+    def simulate_resource_year(self, resource_year: dict, project_life: int = 25, lifetime_sim=False) -> dict:
+        """
+        Simulates the hybrid plant with the weather of one resource year.
+
+        :param resource_year: ``dict`` with key ``year`` and optional keys ``solar_resource_file`` and
+            ``wind_resource_file``, see :func:`set_resource_year`
+        :param project_life: ``int``,
+            Number of year in the analysis period (execepted project lifetime) [years]
+        :param lifetime_sim: ``bool``,
+            For simulation modules which support simulating each year of the project_life, whether or not to do so; otherwise the first year data is repeated
+
+        :returns: {output name: {technology: value}} of the outputs aggregated by :func:`simulate_resource_years`
+        """
+        self.set_resource_year(**resource_year)
+        self.simulate(project_life, lifetime_sim)
+
+        def output_dict(output: HybridSimulationOutput) -> dict:
+            keys = ['hybrid' if k == 'grid' else k for k in self.power_sources.keys()]
+            return {k: output[k] for k in keys}
+
+        return {'annual_energies': output_dict(self.annual_energies),
+                'capacity_factors': output_dict(self.capacity_factors),
+                'net_present_values': output_dict(self.net_present_values),
+                'first_year_revenues': {k: v[1] for k, v in output_dict(self.total_revenues).items()}}
+
+    def simulate_resource_years(self,
+                                resource_years: Sequence[Union[int, dict]],
+                                project_life: int = 25,
+                                lifetime_sim=False,
+                                n_workers: int = 1,
+                                exceedance_probabilities: Sequence[float] = (50, 90)) -> dict:
+        """
+        Simulates the hybrid plant design with the weather of several resource years, and calculates P-values of
+        the annual energies, capacity factors, net present values and first year revenues.
+
+        The plant, its layouts, dispatch model and financial configuration are set up once and only the resource data
+        are changed for each year. With ``n_workers`` > 1, the years are simulated in parallel by forked worker
+        processes (requires 'fork' process start, i.e., Linux, otherwise the years are simulated serially), see
+        tools.utils.fork_pool_map. The site's resource year is restored
+        afterwards, but the plant outputs are those of the last year simulated in this process.
+
+        :param resource_years: Resource years, as years or as ``dict`` with key ``year`` and optional keys
+            ``solar_resource_file`` and ``wind_resource_file``
+        :param project_life: ``int``,
+            Number of year in the analysis period (execepted project lifetime) [years]
+        :param lifetime_sim: ``bool``,
+            For simulation modules which support simulating each year of the project_life, whether or not to do so; otherwise the first year data is repeated
+        :param n_workers: Number of worker processes
+        :param exceedance_probabilities: Exceedance probabilities [%] of the P-values, e.g. 90 for P90, the value
+            exceeded in 90% of the years
+
+        :returns: ``dict`` with keys:
+
+            * ``years``: list of the resource years
+            * ``annual_energies``, ``capacity_factors``, ``net_present_values``, ``first_year_revenues``:
+              {technology: list of the values of each year}
+            * ``p_values``: {output name: {technology: {'P50': value, 'P90': value, ...}}}
+        """
+        resource_years = [r if isinstance(r, dict) else {'year': r} for r in resource_years]
+        if len(resource_years) == 0:
+            raise ValueError("simulate_resource_years requires at least one resource year")
+        original_year = {'year': self.site.data['year'],
+                         'solar_resource_file': self.site.solar_resource_file,
+                         'wind_resource_file': self.site.wind_resource_file}
+        try:
+            year_results = fork_pool_map(self, HybridSimulation.simulate_resource_year,
+                                         [(r, project_life, lifetime_sim) for r in resource_years],
+                                         n_workers, initializer=_init_resource_year_worker)
+        finally:
+            self.set_resource_year(**original_year)
+
+        results = {'years': [r['year'] for r in resource_years], 'p_values': {}}
+        for name in year_results[0].keys():
+            results[name] = {k: [year_result[name][k] for year_result in year_results]
+                             for k in year_results[0][name].keys()}
+            # the value exceeded with probability p is the (100 - p)th percentile
+            results['p_values'][name] = {k: {'P{:g}'.format(p): float(np.percentile(values, 100 - p))
+                                             for p in exceedance_probabilities}
+                                         for k, values in results[name].items()}
+        return results
+
     @property
     def interconnect_kw(self) -> float:
         """Interconnection limit [kW]"""
@@ -1104,3 +1200,8 @@ class HybridSimulation:
                     linewidth=4.0
                     ):
         self.layout.plot(figure, axes, wind_color, pv_color, site_border_color, site_alpha, linewidth)
+
+
+def _init_resource_year_worker(hybrid_simulation: HybridSimulation):
+    # Solver sessions are not shared with the parent process
+    hybrid_simulation.dispatch_builder.opt = None
@@ -0,0 +1,249 @@
+import multiprocessing as mp
+import os
+from pathlib import Path
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from hybrid.log import flicker_logger as logger
+from hybrid.layout.flicker_mismatch import FlickerMismatch
+from hybrid.layout.flicker_raster import FlickerMismatchRaster
+from hybrid.layout.pv_module import module_width, module_height, modules_per_string
+
+
+def _format_value(value) -> str:
+    return "{:g}".format(value)
+
+
+class FlickerLibrary:
+    """
+    Library of single turbine flicker heat maps indexed by latitude, turbine geometry and grid resolution, so that
+    layouts at arbitrary sites can get flicker losses without simulating a heat map for each site.
+
+    Each entry is a binary ``.npz`` file with the heat map, the x and y coordinates of the grid, the indices of the
+    turbine's cell and the location it was simulated for. The file name holds the entry's key, the weighting, turbine
+    geometry, grid resolution and time resolution, followed by its latitude, so the library is indexed by listing its
+    directory and entries can be added by several processes at once.
+
+    Heat maps with the same key share the same grid, and a lookup linearly interpolates between the entries with the
+    nearest latitudes below and above the site's. Latitudes outside of the library use the nearest entry.
+    """
+    def __init__(self, library_dir: Optional[str] = None):
+        """
+        :param library_dir: Directory of the library entries, defaults to hybrid/layout/flicker_data/library
+        """
+        if library_dir is None:
+            library_dir = Path(__file__).parent / "flicker_data" / "library"
+        self.library_dir = Path(library_dir)
+        self._heat_maps = {}
+
+    @staticmethod
+    def entry_key(weight: str = "power",
+                  blade_length: float = 35,
+                  tower_shadow: bool = True,
+                  diam_mult_nwe: int = 8,
+                  diam_mult_s: int = 4,
+                  gridcell_width: float = module_width,
+                  gridcell_height: float = module_height,
+                  gridcells_per_string: int = modules_per_string,
+                  steps_per_hour: int = 4,
+                  angles_per_step: Optional[int] = 12
+                  ) -> str:
+        """
+        Gets the key of entries simulated with the same settings, see FlickerMismatch
+
+        :param weight: heat map weighting, one of ("poa", "power", "time")
+        :param blade_length: meters
+        :param tower_shadow: if true, the tower shadow is included
+        :param diam_mult_nwe: turbine diameters of the grid to the north, west and east of the turbine
+        :param diam_mult_s: turbine diameters of the grid to the south of the turbine
+        :param gridcell_width: width of grid cells
+        :param gridcell_height: height of grid cells
+        :param gridcells_per_string: grid cells per string of modules
+        :param steps_per_hour: simulation steps per hour
+        :param angles_per_step: blade angles per step, None for the swept area
+        :return: key
+        """
+        if weight not in ("poa", "power", "time"):
+            raise ValueError("Unrecognized 'weight'")
+        return "{}_b{}_t{}_n{}_s{}_w{}_h{}_m{}_p{}_a{}".format(
+            weight, _format_value(blade_length), int(tower_shadow), diam_mult_nwe, diam_mult_s,
+            _format_value(gridcell_width), _format_value(gridcell_height), gridcells_per_string, steps_per_hour,
+            angles_per_step if angles_per_step else 0)
+
+    def entry_path(self,
+                   key: str,
+                   lat: float
+                   ) -> Path:
+        """
+        Gets the file path of the entry of a key and latitude
+        """
+        return self.library_dir / "{}_lat{:+.4f}.npz".format(key, lat)
+
+    def latitudes(self,
+                  key: str
+                  ) -> np.ndarray:
+        """
+        Gets the sorted latitudes of the entries of a key
+        """
+        if not self.library_dir.is_dir():
+            return np.array([])
+        prefix = key + "_lat"
+        lats = [float(f[len(prefix):-len(".npz")]) for f in os.listdir(self.library_dir)
+                if f.startswith(prefix) and f.endswith(".npz")]
+        return np.sort(lats)
+
+    def store(self,
+              key: str,
+              lat: float,
+              lon: float,
+              heat_map: np.ndarray,
+              xs: np.ndarray,
+              ys: np.ndarray,
+              turb_index: Tuple[int, int]
+              ) -> Path:
+        """
+        Stores a heat map in the library. The file is written to a temporary file first, so concurrent processes
+        never read a partially written entry.
+
+        :param key: entry key from entry_key
+        :param lat: latitude
+        :param lon: longitude the heat map was simulated for
+        :param heat_map: 2-D array of the heat map [y, x]
+        :param xs: x coordinates of the grid
+        :param ys: y coordinates of the grid
+        :param turb_index: x, y indices of the turbine's grid cell
+        :return: path of the entry
+        """
+        heat_map = np.asarray(heat_map, dtype=float)
+        if heat_map.shape != (len(ys), len(xs)):
+            raise ValueError("'heat_map' must be of shape (len(ys), len(xs))")
+        self.library_dir.mkdir(parents=True, exist_ok=True)
+        path = self.entry_path(key, lat)
+        tmp_path = path.with_name(path.stem + ".{}.tmp.npz".format(os.getpid()))
+        np.savez(tmp_path, heat_map=heat_map, xs=np.asarray(xs, dtype=float), ys=np.asarray(ys, dtype=float),
+                 turb_index=np.asarray(turb_index, dtype=int), location=np.array([lat, lon], dtype=float))
+        os.replace(tmp_path, path)
+        self._heat_maps.pop(path, None)
+        return path
+
+    def load(self,
+             key: str,
+             lat: float
+             ) -> dict:
+        """
+        Loads the entry of a key and latitude, which is kept in memory for later lookups
+
+        :return: dict of 'heat_map', 'xs', 'ys', 'turb_index' and 'location' arrays
+        """
+        path = self.entry_path(key, lat)
+        if path not in self._heat_maps:
+            with np.load(path) as data:
+                entry = {k: data[k] for k in data.files}
+            for v in entry.values():
+                v.flags.writeable = False
+            self._heat_maps[path] = entry
+        return self._heat_maps[path]
+
+    def lookup(self,
+               lat: float,
+               **key_args
+               ) -> Optional[tuple]:
+        """
+        Gets the heat map for a latitude, interpolated between the entries with the nearest latitudes
+
+        :param lat: latitude
+        :param key_args: settings of the heat map, see entry_key
+        :return: None if the library has no entries for the settings, otherwise tuple:
+                    (turbine diameter,
+                     tuple of turbine location x, y indices,
+                     2-D array of the heat map at x, y coordinates,
+                     x_coordinates of grid,
+                     y_coordinates of grid)
+        """
+        key = self.entry_key(**key_args)
+        lats = self.latitudes(key)
+        if not len(lats):
+            return None
+
+        # first entry at or above the latitude
+        i = int(np.searchsorted(lats, lat))
+        if i == 0 or i == len(lats) or lats[i] == lat:
+            entry = self.load(key, lats[min(i, len(lats) - 1)])
+            heat_map = np.array(entry['heat_map'])
+        else:
+            lower, upper = self.load(key, lats[i - 1]), self.load(key, lats[i])
+            if lower['heat_map'].shape != upper['heat_map'].shape:
+                raise ValueError("Flicker library entries of key {} have different grids".format(key))
+            w = (lat - lats[i - 1]) / (lats[i] - lats[i - 1])
+            heat_map = (1 - w) * lower['heat_map'] + w * upper['heat_map']
+            entry = lower
+
+        blade_length = key_args.get('blade_length', 35)
+        return 2 * blade_length, tuple(entry['turb_index'].tolist()), heat_map, entry['xs'], entry['ys']
+
+    def generate(self,
+                 locations: Sequence[Tuple[float, float]],
+                 n_procs: int = 1,
+                 steps: Optional[range] = None,
+                 overwrite: bool = False,
+                 **key_args
+                 ) -> list:
+        """
+        Simulates the heat maps of locations with FlickerMismatchRaster and stores them in the library, running the
+        locations in parallel. Locations whose entries exist are skipped unless overwrite is true.
+
+        :param locations: list of (lat, lon)
+        :param n_procs: number of processes
+        :param steps: which steps to run, defaults to the whole year
+        :param overwrite: if true, simulate locations which already have entries
+        :param key_args: settings of the heat maps, see entry_key
+        :return: paths of the stored entries
+        """
+        key = self.entry_key(**key_args)
+        settings = dict(key_args)
+        weight = settings.pop('weight', 'power')
+        tasks = [(lat, lon, weight, steps, settings) for lat, lon in locations
+                 if overwrite or not self.entry_path(key, lat).is_file()]
+        logger.info("Generating {} flicker library entries of {} with {} processes".format(len(tasks), key, n_procs))
+
+        paths = []
+        if n_procs > 1 and len(tasks) > 1:
+            with mp.Pool(processes=min(n_procs, len(tasks))) as pool:
+                for lat, lon, result in pool.imap_unordered(_simulate_heat_map, tasks):
+                    paths.append(self.store(key, lat, lon, *result))
+        else:
+            for task in tasks:
+                lat, lon, result = _simulate_heat_map(task)
+                paths.append(self.store(key, lat, lon, *result))
+        return paths
+
+
+def _simulate_heat_map(task: tuple) -> tuple:
+    """
+    Simulates a library heat map, setting the model properties of FlickerMismatch for the run
+    """
+    lat, lon, weight, steps, settings = task
+    model_properties = {'steps_per_hour': settings.get('steps_per_hour', 4),
+                        'diam_mult_nwe': settings.get('diam_mult_nwe', 8),
+                        'diam_mult_s': settings.get('diam_mult_s', 4),
+                        'turbine_tower_shadow': settings.get('tower_shadow', True)}
+    original_properties = {k: getattr(FlickerMismatch, k) for k in model_properties}
+    try:
+        for k, v in model_properties.items():
+            setattr(FlickerMismatch, k, v)
+        flicker = FlickerMismatchRaster(lat, lon,
+                                        angles_per_step=settings.get('angles_per_step', 12),
+                                        blade_length=settings.get('blade_length', 35),
+                                        gridcell_width=settings.get('gridcell_width', module_width),
+                                        gridcell_height=settings.get('gridcell_height', module_height),
+                                        gridcells_per_string=settings.get('gridcells_per_string', modules_per_string))
+        (heat_map,) = flicker.create_heat_maps(steps if steps is not None else range(flicker.n_steps), (weight,))
+        turb_index = FlickerMismatch.get_turb_pos_indices(flicker.heat_map_template)
+    finally:
+        for k, v in original_properties.items():
+            setattr(FlickerMismatch, k, v)
+    return lat, lon, (heat_map, flicker.heat_map_template[1], flicker.heat_map_template[2], turb_index)
+
+
+flicker_library = FlickerLibrary()
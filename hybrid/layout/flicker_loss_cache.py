@@ -0,0 +1,213 @@
+import os
+import sqlite3
+from contextlib import closing
+from typing import Optional
+
+import pvmismatch
+from pvmismatch import pvsystem
+
+from hybrid.log import flicker_logger as logger
+from hybrid.layout.pv_module import cell_num_map_flat
+from hybrid.resource.resource_store import user_cache_dir
+
+
+class FlickerLossCache:
+    """
+    Persistent cache of the flicker losses of strings of modules simulated with PVMismatch, shared by all
+    FlickerMismatch runs of a process and, through an SQLite database file, by worker processes and later runs.
+
+    The modules of a string are in series and either fully shaded or unshaded, so a string's loss does not depend on
+    which of its modules are shaded. Shading patterns are canonicalized to the number of shaded modules and the
+    irradiance rounded to suns_resolution, and keyed with the number of modules per string, the shading ratio and
+    the PVMismatch version.
+
+    If the database cannot be opened, read or written, the cache falls back to keeping the losses in memory only.
+
+    :var suns_resolution: resolution of the irradiance in the keys [suns]
+    :var flush_size: number of new losses kept before writing them to the database
+    """
+    suns_resolution: float = 1e-3
+    flush_size: int = 256
+
+    _schema = """
+        CREATE TABLE IF NOT EXISTS string_flicker_losses (
+            pvmismatch_version TEXT NOT NULL,
+            mods_per_string INTEGER NOT NULL,
+            poa_shading_ratio REAL NOT NULL,
+            suns_level INTEGER NOT NULL,
+            n_shaded INTEGER NOT NULL,
+            loss REAL NOT NULL,
+            PRIMARY KEY (pvmismatch_version, mods_per_string, poa_shading_ratio, suns_level, n_shaded)
+        );
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        :param db_path: Path of the SQLite database file, created if it does not exist. If None, losses are only kept
+            in memory
+        """
+        self.db_path = db_path
+        self._losses = {}
+        self._pending = {}
+        self._loaded_path = None
+        self._pv_systems = {}
+        self._unshaded_pmp = {}
+
+    def key(self,
+            poa_suns: float,
+            mods_per_string: int,
+            n_shaded: int,
+            poa_shading_ratio: float = 0.9
+            ) -> tuple:
+        """
+        Gets the canonical key of a shading pattern
+
+        :param poa_suns: irradiance in suns
+        :param mods_per_string: number of modules in the string
+        :param n_shaded: number of shaded modules
+        :param poa_shading_ratio: how much of the poa is blocked by the shadow
+        :return: (PVMismatch version, modules per string, shading ratio, irradiance level, number of shaded modules)
+        """
+        return (pvmismatch.__version__, int(mods_per_string), float(poa_shading_ratio),
+                int(round(poa_suns / self.suns_resolution)), int(n_shaded))
+
+    def string_flicker_loss(self,
+                            poa_suns: float,
+                            mods_per_string: int,
+                            n_shaded: int,
+                            poa_shading_ratio: float = 0.9
+                            ) -> float:
+        """
+        Gets the flicker loss of a string relative to the unshaded string, simulating it with PVMismatch only if the
+        shading pattern is not in the cache
+
+        :param poa_suns: irradiance in suns
+        :param mods_per_string: number of modules in the string
+        :param n_shaded: number of shaded modules
+        :param poa_shading_ratio: how much of the poa is blocked by the shadow
+        :return: loss ratio of the string
+        """
+        if n_shaded <= 0:
+            return 0.
+        key = self.key(poa_suns, mods_per_string, n_shaded, poa_shading_ratio)
+        if key not in self._losses:
+            self._load()
+        if key not in self._losses:
+            loss = self._query(key)
+            if loss is None:
+                loss = self._simulate(*key[1:])
+                self._pending[key] = loss
+                if len(self._pending) >= self.flush_size:
+                    self.flush()
+            self._losses[key] = loss
+        return self._losses[key]
+
+    def flush(self):
+        """
+        Writes the new losses to the database
+        """
+        if not self._pending:
+            return
+        if self.db_path is not None:
+            try:
+                with closing(self._connect()) as conn, conn:
+                    conn.executemany("INSERT OR IGNORE INTO string_flicker_losses VALUES (?, ?, ?, ?, ?, ?)",
+                                     [key + (loss,) for key, loss in self._pending.items()])
+            except (OSError, sqlite3.Error) as e:
+                self._disable_db(e)
+        self._pending.clear()
+
+    def clear(self):
+        """
+        Writes the new losses to the database and clears the losses kept in memory
+        """
+        self.flush()
+        self._losses.clear()
+        self._loaded_path = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per operation, so the cache can be used after forking worker processes
+        db_dir = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.executescript(self._schema)
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _disable_db(self, error: Exception):
+        """
+        Keeps the losses in memory only after the database failed
+        """
+        logger.warning("Flicker loss cache {} is not usable, keeping losses in memory: {}".format(self.db_path, error))
+        self.db_path = None
+        self._loaded_path = None
+
+    def _load(self):
+        """
+        Loads all losses of the PVMismatch version from the database, once per database file
+        """
+        if self.db_path is None or self._loaded_path == self.db_path:
+            return
+        self._loaded_path = self.db_path
+        if not os.path.isfile(self.db_path):
+            return
+        try:
+            with closing(self._connect()) as conn:
+                rows = conn.execute("SELECT * FROM string_flicker_losses WHERE pvmismatch_version = ?",
+                                    (pvmismatch.__version__,)).fetchall()
+        except (OSError, sqlite3.Error) as e:
+            self._disable_db(e)
+            return
+        for row in rows:
+            self._losses.setdefault(tuple(row[:-1]), row[-1])
+
+    def _query(self,
+               key: tuple
+               ) -> Optional[float]:
+        """
+        Gets a loss added to the database by another process since it was loaded
+        """
+        if self.db_path is None or not os.path.isfile(self.db_path):
+            return None
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT loss FROM string_flicker_losses WHERE pvmismatch_version = ? AND "
+                                   "mods_per_string = ? AND poa_shading_ratio = ? AND suns_level = ? AND n_shaded = ?",
+                                   key).fetchone()
+        except (OSError, sqlite3.Error) as e:
+            self._disable_db(e)
+            return None
+        return None if row is None else row[0]
+
+    def _simulate(self,
+                  mods_per_string: int,
+                  poa_shading_ratio: float,
+                  suns_level: int,
+                  n_shaded: int
+                  ) -> float:
+        """
+        Simulates the loss of a string with PVMismatch, shading its first n_shaded modules
+        """
+        poa_suns = suns_level * self.suns_resolution
+        if mods_per_string not in self._pv_systems:
+            self._pv_systems[mods_per_string] = pvsystem.PVsystem(numberStrs=1, numberMods=mods_per_string)
+        pvsys = self._pv_systems[mods_per_string]
+
+        unshaded_key = (mods_per_string, suns_level)
+        if unshaded_key not in self._unshaded_pmp:
+            pvsys.setSuns({0: {index: [(poa_suns,) * 96, range(0, 96)] for index in range(mods_per_string)}})
+            self._unshaded_pmp[unshaded_key] = pvsys.Pmp
+        pmp_unshaded = self._unshaded_pmp[unshaded_key]
+
+        shaded_poa_suns = poa_suns * (1 - poa_shading_ratio)
+        sun_dict = {index: [(shaded_poa_suns,) * 96, cell_num_map_flat] if index < n_shaded
+                    else [(poa_suns,) * 96, range(0, 96)]
+                    for index in range(mods_per_string)}
+        pvsys.setSuns({0: sun_dict})
+        return (pmp_unshaded - pvsys.Pmp) / pmp_unshaded
+
+
+flicker_loss_cache = FlickerLossCache(os.path.join(user_cache_dir('flicker_loss_cache'), "flicker_loss_cache.sqlite"))
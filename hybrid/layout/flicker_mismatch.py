@@ -10,12 +10,12 @@ sys.path.append('.')
 
 from shapely.geometry import MultiPoint, Polygon, Point, MultiPolygon, box
 from shapely.affinity import translate
-from pvmismatch import pvsystem
 import PySAM.Pvwattsv8 as pv
 
 from hybrid.log import flicker_logger as logger
-from hybrid.resource import SolarResource
+from hybrid.resource import SolarResource, to_pysam_resource_data
 from hybrid.layout.shadow_flicker import get_sun_pos, get_turbine_shadows_timeseries, create_pv_string_points
+from hybrid.layout.flicker_loss_cache import flicker_loss_cache
 from hybrid.layout.pv_module import *
 
 # global variables
@@ -174,7 +174,7 @@ class FlickerMismatch:
                     raise ValueError("resource file does not exist")
             pv_model.SolarResource.solar_resource_file = str(weather_path)
         else:
-            pv_model.SolarResource.solar_resource_data = self.solar_resource_data
+            pv_model.SolarResource.solar_resource_data = to_pysam_resource_data(self.solar_resource_data)
         pv_model.execute(0)
         self.poa = np.array(pv_model.Outputs.poa)
 
@@ -364,6 +364,25 @@ class FlickerMismatch:
             #     plt.plot(x, y)
         # plt.show()
 
+    @staticmethod
+    def _string_flicker_loss(poa_suns: float,
+                             mods_per_string: int,
+                             poa_shading_ratio: float = 0.9):
+        """
+        Creates a function for the flicker loss of a string of modules with PVMismatch, relative to the unshaded
+        string. Losses are kept in flicker_loss_cache, shared across calls, processes and runs.
+
+        :param poa_suns: irradiance in suns
+        :param mods_per_string: number of modules in the string
+        :param poa_shading_ratio: how much of the poa is blocked by the shadow
+
+        :return: function of the number of shaded modules, returning the loss ratio of the string
+        """
+        def string_flicker_loss(n_shaded: int) -> float:
+            return flicker_loss_cache.string_flicker_loss(poa_suns, mods_per_string, n_shaded, poa_shading_ratio)
+
+        return string_flicker_loss
+
     @staticmethod
     def _calculate_power_loss(poa: float,
                               elv_ang: float,
@@ -397,17 +416,7 @@ class FlickerMismatch:
         heat_map_flicker_new = np.zeros(heat_map_flicker.shape)
 
         mods_per_string = len(array_points[0][0])
-
-        # set unshaded string for baseline
-        pvsys = pvsystem.PVsystem(numberStrs=1, numberMods=mods_per_string)
-        sun_dict_unshaded = dict()
-        for index in range(mods_per_string):
-            sun_dict_unshaded[index] = [(poa_suns,) * 96, range(0, 96)]
-        pvsys.setSuns({0: sun_dict_unshaded})
-        kwh_unshaded = pvsys.Pmp
-
-        suns_memo = dict()
-        suns_memo['hits'] = 0
+        string_flicker_loss = FlickerMismatch._string_flicker_loss(poa_suns, mods_per_string, poa_shading_ratio)
 
         for shadow in shadows:
             ht_map = np.zeros(heat_map_flicker.shape)
@@ -426,21 +435,7 @@ class FlickerMismatch:
                     else:
                         shaded_module_points = shaded_module_points.geoms
 
-                    shaded_poa_suns = poa_suns * (1 - poa_shading_ratio)
-                    shaded_indices = []
-                    for mod in shaded_module_points:
-                        shaded_indices.append(int(np.argmin([(mod.x - m.x) ** 2 + (mod.y - m.y) ** 2 for m in string])))
-                    shaded_indices = tuple(shaded_indices)
-                    if shaded_indices in suns_memo.keys():
-                        flicker_loss = suns_memo[shaded_indices]
-                        suns_memo['hits'] += 1
-                    else:
-                        sun_dict = copy.deepcopy(sun_dict_unshaded)
-                        for index in shaded_indices:
-                            sun_dict[index] = [(shaded_poa_suns,) * 96, cell_num_map_flat]
-                        pvsys.setSuns({0: sun_dict})
-                        flicker_loss = (kwh_unshaded - pvsys.Pmp) / kwh_unshaded
-                        suns_memo[shaded_indices] = flicker_loss
+                    flicker_loss = string_flicker_loss(len(shaded_module_points))
 
                     for pt in string:
                         x_ind = int(round((pt.x - xs_min) / gridcell_width))
@@ -566,6 +561,8 @@ class FlickerMismatch:
             elif i == 'time':
                 heat_maps_to_return.append(heat_map_time)
 
+        # share new string losses with other processes and runs
+        flicker_loss_cache.flush()
         logger.info("Finished heat maps")
         return tuple(heat_maps_to_return)
 
@@ -0,0 +1,258 @@
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from hybrid.log import flicker_logger as logger
+from hybrid.layout.flicker_mismatch import FlickerMismatch, mp
+from hybrid.layout.flicker_loss_cache import flicker_loss_cache
+from hybrid.layout.shadow_flicker import get_sun_pos, get_turbine_shadow_vertices
+
+
+def rasterize_convex_polygons(polygons: Sequence[np.ndarray],
+                              x0: float,
+                              dx: float,
+                              nx: int,
+                              y0: float,
+                              dy: float,
+                              ny: int,
+                              samples_per_cell: int = 1
+                              ) -> Optional[Tuple[int, int, np.ndarray]]:
+    """
+    Rasterizes the union of convex polygons onto a regular grid of cells by scanlines. With one sample per cell, a
+    cell is covered if its center is within (or on the edge of) a polygon, as for a point intersection. With more
+    samples, the covered fraction of each cell is estimated from samples_per_cell x samples_per_cell sub-cell centers.
+
+    :param polygons: list of [n_vertices, 2] arrays of convex polygon vertices
+    :param x0: x coordinate of the center of the first column of cells
+    :param dx: width of cells
+    :param nx: number of columns
+    :param y0: y coordinate of the center of the first row of cells
+    :param dy: height of cells
+    :param ny: number of rows
+    :param samples_per_cell: samples per cell along each axis
+
+    :returns: (first row, first column, covered fraction [row, column]) of the cells within the bounding box of the
+        polygons, or None if no cell is covered
+    """
+    if not len(polygons):
+        return None
+    n = samples_per_cell
+    all_vertices = np.concatenate(polygons)
+    min_x, min_y = all_vertices.min(axis=0)
+    max_x, max_y = all_vertices.max(axis=0)
+    col_start = max(0, int(np.floor((min_x - x0) / dx + 0.5)))
+    col_stop = min(nx, int(np.floor((max_x - x0) / dx + 0.5)) + 1)
+    row_start = max(0, int(np.floor((min_y - y0) / dy + 0.5)))
+    row_stop = min(ny, int(np.floor((max_y - y0) / dy + 0.5)) + 1)
+    if col_start >= col_stop or row_start >= row_stop:
+        return None
+
+    # sample centers within the bounding box of cells
+    n_cols, n_rows = (col_stop - col_start) * n, (row_stop - row_start) * n
+    sample_x0 = x0 + (col_start - 0.5) * dx + dx / (2 * n)
+    sample_y = y0 + (row_start - 0.5) * dy + dy / (2 * n) + np.arange(n_rows) * dy / n
+    eps = 1e-9
+
+    # count of polygons covering each sample, filled by differences along each row
+    coverage = np.zeros((n_rows, n_cols + 1), dtype=np.int32)
+    for vertices in polygons:
+        x_start, y_start = vertices[:, 0], vertices[:, 1]
+        x_end, y_end = np.roll(x_start, -1), np.roll(y_start, -1)
+        edge_min_y, edge_max_y = np.minimum(y_start, y_end), np.maximum(y_start, y_end)
+        rows = np.flatnonzero((sample_y >= edge_min_y.min() - eps) & (sample_y <= edge_max_y.max() + eps))
+        if not len(rows):
+            continue
+        y = sample_y[rows, None]
+        crosses = (y >= edge_min_y - eps) & (y <= edge_max_y + eps)
+        height = y_end - y_start
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.clip((y - y_start) / height, 0, 1)
+        x_at_y = np.where(height != 0, x_start + t * (x_end - x_start), x_start)
+        x_low = np.where(crosses, x_at_y, np.inf)
+        x_high = np.where(crosses, x_at_y, -np.inf)
+        # horizontal edges cover both of their end points
+        x_low = np.minimum(x_low, np.where(crosses & (height == 0), x_end, np.inf)).min(axis=1)
+        x_high = np.maximum(x_high, np.where(crosses & (height == 0), x_end, -np.inf)).max(axis=1)
+
+        first = np.maximum(np.ceil((x_low - sample_x0) / (dx / n) - eps), 0)
+        last = np.minimum(np.floor((x_high - sample_x0) / (dx / n) + eps), n_cols - 1)
+        filled = first <= last
+        rows, first, last = rows[filled], first[filled].astype(int), last[filled].astype(int)
+        np.add.at(coverage, (rows, first), 1)
+        np.add.at(coverage, (rows, last + 1), -1)
+
+    covered = np.cumsum(coverage[:, :-1], axis=1) > 0
+    if n > 1:
+        covered = covered.reshape(row_stop - row_start, n, col_stop - col_start, n).mean(axis=(1, 3))
+    if not covered.any():
+        return None
+    return row_start, col_start, covered.astype(float)
+
+
+class FlickerMismatchRaster(FlickerMismatch):
+    """
+    FlickerMismatch with the turbine shadows rasterized onto the heat map grid instead of intersected with the
+    module points as shapely polygons. Each part of a turbine's shadow (tower and blades, or swept area) is a convex
+    polygon, which is filled by scanlines with array operations, and the heat maps are accumulated in place.
+
+    The 'poa' and 'power' heat maps use the cell centers as the points intersected with the shadows, and match
+    FlickerMismatch up to cells whose centers are within 1e-9 m of a shadow edge. The 'time' heat map estimates the
+    shaded area of cells from samples_per_cell x samples_per_cell samples per cell instead of intersecting polygons,
+    which with the default of 4 is within 0.1 (and on average within 0.01) of the shaded cell fraction per step.
+
+    :var samples_per_cell: samples per cell along each axis for the area-weighted 'time' heat map
+    """
+    samples_per_cell: int = 4
+
+    def _grid(self) -> tuple:
+        xs, ys = self.heat_map_template[1], self.heat_map_template[2]
+        return xs[0], self.gridcell_width, len(xs), ys[0], self.gridcell_height, len(ys)
+
+    def _string_cells(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row and column indices of the heat map cells of each string's modules, [string, module]"""
+        xs_min, ys_min = np.min(self.heat_map_template[1]), np.min(self.heat_map_template[2])
+        points = np.array([[pt.coords[0] for pt in string] for array in self.array_string_points for string in array])
+        if not len(points):
+            return np.zeros((0, 0), dtype=int), np.zeros((0, 0), dtype=int)
+        rows = np.round((points[:, :, 1] - ys_min) / self.gridcell_height).astype(int)
+        cols = np.round((points[:, :, 0] - xs_min) / self.gridcell_width).astype(int)
+        return rows, cols
+
+    def _shadow_parts(self,
+                      azi_ang: float,
+                      elv_ang: float,
+                      wind_dir: Optional[float]
+                      ) -> List[List[np.ndarray]]:
+        """
+        Convex parts of the shadows of all turbines for each blade angle, as get_turbine_shadows_timeseries and
+        _calculate_turbine_shadow for one step
+        """
+        if self.angles_per_step is None:
+            angles_range = (None,)
+        else:
+            step_to_angle = 120 / self.angles_per_step
+            angles_range = [i * step_to_angle for i in range(self.angles_per_step)]
+
+        shadows = []
+        for angle in angles_range:
+            parts, shadow_ang = get_turbine_shadow_vertices(self.blade_length, angle, azi_ang, elv_ang, wind_dir,
+                                                            FlickerMismatch.turbine_tower_shadow)
+            if parts and shadow_ang:
+                shadows.append([part + np.array(pos) for pos in self.turb_pos for part in parts])
+        return shadows
+
+    def create_heat_maps(self,
+                         steps: range,
+                         weight_option: tuple,
+                         ) -> tuple:
+        """
+        Create shadow and flicker heat maps for a given range of simulation steps by rasterizing the shadows
+
+        :param weight_option: tuple of selected weighting options, producing a heatmap each
+                    - "poa": weight by plane-of-array irradiance
+                    - "power": weight by power loss of pvmismatch module
+                    - "time": weight by number of timesteps shaded
+        :param steps: which steps to run, must be within range calculated by steps_per_hour x angles_per_step
+        :return: shadow heat map, flicker heat map
+        """
+        proc_id = mp.current_process().name
+        logger.info("Proc {}: Starting raster heat maps {}".format(proc_id, steps))
+
+        for i in weight_option:
+            if i not in ("poa", "power", "time"):
+                raise ValueError("Unrecognized 'weight_option'")
+        if not weight_option:
+            raise ValueError("No valid 'weight_option' provided. Provide a list of selected ways to weight the shading "
+                             "from the set ('poa', 'power', 'time')")
+        by_poa, by_power, by_time = ("poa" in weight_option), ("power" in weight_option), ("time" in weight_option)
+        heat_maps = {i: np.zeros_like(self.heat_map_template[0]) for i in weight_option}
+
+        step_to_minute = 60 / self.steps_per_hour
+        self.azi_ang, self.elv_ang, _ = get_sun_pos(self.lat, self.lon, step_to_minute, steps=steps)
+
+        if by_poa or by_power:
+            if not isinstance(self.poa, Sequence):
+                self._setup_irradiance()
+            total_poa = sum(self.poa[steps])
+        if by_power:
+            string_rows, string_cols = self._string_cells()
+
+        grid = self._grid()
+        for i, step in enumerate(steps):
+            if self.elv_ang[i] < 0:
+                continue
+            wind_dir = None if self.wind_dir is None else self.wind_dir[step]
+            shadows = self._shadow_parts(self.azi_ang[i], self.elv_ang[i], wind_dir)
+            if not shadows:
+                continue
+
+            hr = int(step / FlickerMismatch.steps_per_hour)
+            poa_suns = self.poa[hr] / 1000 if by_power else 0
+            if by_power and poa_suns >= 1e-3:
+                string_flicker_loss = FlickerMismatch._string_flicker_loss(poa_suns, string_rows.shape[1])
+
+            for parts in shadows:
+                cells = None
+                if by_poa or (by_power and poa_suns >= 1e-3):
+                    cells = rasterize_convex_polygons(parts, *grid)
+                if cells is not None:
+                    row, col, covered = cells
+                    window = (slice(row, row + covered.shape[0]), slice(col, col + covered.shape[1]))
+                    if by_poa:
+                        heat_maps["poa"][window] += self.poa[hr] / total_poa * covered
+                    if by_power and poa_suns >= 1e-3:
+                        shaded = np.zeros(self.heat_map_template[0].shape, dtype=bool)
+                        shaded[window] = covered > 0
+                        self._accumulate_power_loss(shaded, string_rows, string_cols, string_flicker_loss,
+                                                    heat_maps["power"])
+                if by_time:
+                    cells = rasterize_convex_polygons(parts, *grid, samples_per_cell=self.samples_per_cell)
+                    if cells is not None:
+                        row, col, covered = cells
+                        heat_maps["time"][row:row + covered.shape[0], col:col + covered.shape[1]] += covered
+
+        # normalize by angles per hour (since each will use the same weight) or by number of hours total
+        step_normalize = self.angles_per_step if self.angles_per_step else 1
+        if by_poa:
+            heat_maps["poa"] /= step_normalize
+        if by_power:
+            heat_maps["power"] /= step_normalize * len(steps)
+        if by_time:
+            heat_maps["time"] /= step_normalize * len(steps)
+
+        # share new string losses with other processes and runs
+        flicker_loss_cache.flush()
+        logger.info("Finished raster heat maps")
+        return tuple(heat_maps[i] for i in weight_option)
+
+    @staticmethod
+    def _accumulate_power_loss(shaded: np.ndarray,
+                               string_rows: np.ndarray,
+                               string_cols: np.ndarray,
+                               string_flicker_loss,
+                               heat_map_flicker: np.ndarray):
+        """
+        Update the heat map with the flicker losses of strings with shaded modules, as
+        FlickerMismatch._calculate_power_loss for one shadow
+
+        :param shaded: boolean array of shaded cells
+        :param string_rows: row indices of the modules of each string, [string, module]
+        :param string_cols: column indices of the modules of each string, [string, module]
+        :param string_flicker_loss: loss function of the number of shaded modules of a string
+        :param heat_map_flicker: array with flicker losses
+        """
+        n_shaded = shaded[string_rows, string_cols].sum(axis=1)
+        ht_map = np.zeros(heat_map_flicker.shape)
+        for s in np.flatnonzero(n_shaded):
+            flicker_loss = string_flicker_loss(int(n_shaded[s]))
+            rows, cols = string_rows[s], string_cols[s]
+            if FlickerMismatch.periodic:
+                for y_ind, x_ind in zip(rows, cols):
+                    if ht_map[y_ind, x_ind] == 0:
+                        ht_map[y_ind, x_ind] = flicker_loss
+                    else:
+                        # if reusing a module, take the average
+                        ht_map[y_ind, x_ind] = (ht_map[y_ind, x_ind] + flicker_loss) / 2
+            else:
+                ht_map[rows, cols] = flicker_loss
+        heat_map_flicker += ht_map
@@ -8,6 +8,7 @@ from hybrid.layout.wind_layout import WindLayout, WindBoundaryGridParameters
 from hybrid.layout.pv_layout import PVLayout, PVGridParameters
 from hybrid.layout.pv_layout_tools import get_flicker_loss_multiplier
 from hybrid.layout.flicker_mismatch import FlickerMismatch
+from hybrid.layout.flicker_library import flicker_library
 
 
 class HybridLayout:
@@ -44,6 +45,10 @@ class HybridLayout:
             `steps_per_hour` is the timestep interval of shadow calculation
             `angles_per_step` is how many different angles of the blades are calculated per timestep
 
+        The heat map is looked up in the flicker library (see flicker_library.py) first, for the wind turbine's
+        diameter and then for the turbine used in flicker modeling, interpolating between the nearest latitudes.
+        Without library entries, the nearest of the bundled heat maps is loaded.
+
         If not flicker_load_nearest, generate a low-resolution flicker heat map
 
         :return: tuple:
@@ -54,6 +59,19 @@ class HybridLayout:
                      y_coordinates of grid)
         """
         if flicker_load_nearest:
+            steps_per_hour = 4
+            angles_per_step = 12
+
+            # library heat map interpolated to the latitude
+            for blade_length in (self.wind.rotor_diameter / 2, 35):
+                flicker_data = flicker_library.lookup(self.site.data['lat'],
+                                                      blade_length=blade_length,
+                                                      steps_per_hour=steps_per_hour,
+                                                      angles_per_step=angles_per_step)
+                if flicker_data is not None:
+                    self._flicker_data = flicker_data
+                    return
+
             # pre-processed detailed flicker heat map
             existing_locations = [[33.209, -108.283],
                                   [36.334, -119.769],
@@ -63,8 +81,6 @@ class HybridLayout:
             distance = np.linalg.norm(distance, axis=1)
             min_dist_location = existing_locations[int(np.argmin(distance))]
             flicker_diam = 70  # meters, of the turbine used in flicker modeling
-            steps_per_hour = 4
-            angles_per_step = 12
             data_path = Path(__file__).parent / "flicker_data"
             flicker_path = data_path / "{}_{}_{}_{}_shadow.txt".format(min_dist_location[0],
                                                                        min_dist_location[1],
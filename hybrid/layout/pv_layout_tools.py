@@ -10,6 +10,7 @@ from shapely.prepared import (
 
 from hybrid.layout.layout_tools import *
 from hybrid.sites import SiteInfo
+from hybrid.resource import to_pysam_resource_data
 from hybrid.layout.wind_layout_tools import *
 
 
@@ -310,7 +311,7 @@ def calculate_max_hybrid_aep(site_info: SiteInfo,
     
     # wind
     wind_model = windpower.default("WindPowerSingleOwner")
-    wind_model.Resource.wind_resource_data = site_info.wind_resource.data
+    wind_model.Resource.wind_resource_data = to_pysam_resource_data(site_info.wind_resource.data)
     
     wind_params_orig = wind_model.export()
     wind_model.Farm.wind_farm_xCoordinates = np.zeros(num_turbines)
@@ -322,7 +323,7 @@ def calculate_max_hybrid_aep(site_info: SiteInfo,
     
     # solar
     solar_model = pvwatts.default("PVWattsSingleOwner")
-    solar_model.SolarResource.solar_resource_data = site_info.solar_resource.data
+    solar_model.SolarResource.solar_resource_data = to_pysam_resource_data(site_info.solar_resource.data)
     solar_model.SystemDesign.array_type = 2  # single-axis tracking
     
     solar_params_orig = solar_model.export()
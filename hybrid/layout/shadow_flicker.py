@@ -1,4 +1,4 @@
-from typing import Union, Tuple, Optional, List
+from typing import Union, Tuple, Optional, List, Sequence
 import datetime
 import pytz
 
@@ -10,6 +10,9 @@ from shapely.geometry import Polygon, MultiPolygon, MultiPoint
 from shapely.ops import unary_union
 import timezonefinder
 from pysolar.solar import *
+import pysolar.solar
+import pysolar.solartime
+import pysolar.constants
 from pvmismatch import *
 
 from hybrid.layout.pv_module import *
@@ -46,19 +49,88 @@ def get_sun_pos(lat: float,
     """
     if steps:
         start = datetime.datetime(2012, 1, 1, 0, 0, 0, 0, tzinfo=get_time_zone(lat, lon))
-        date_generated = [start + datetime.timedelta(minutes=x * step_in_minutes) for x in steps]
     else:
         start = datetime.datetime(2012, 1, 1, start_hr, 0, 0, 0, tzinfo=get_time_zone(lat, lon))
-        date_generated = [start + datetime.timedelta(minutes=x * step_in_minutes) for x in range(n)]
+        steps = range(n)
+    date_generated = [start + datetime.timedelta(minutes=x * step_in_minutes) for x in steps]
 
-    azi_ang = np.zeros(len(date_generated))
-    elv_ang = np.zeros(len(date_generated))
-    for tt, date in enumerate(date_generated):
-        azi_ang[tt] = get_azimuth(lat, lon, date)
-        elv_ang[tt] = get_altitude(lat, lon, date)
+    timestamps = start.timestamp() + np.asarray(steps, dtype=float) * step_in_minutes * 60
+    azi_ang, elv_ang = get_sun_pos_at_times(lat, lon, timestamps)
     return azi_ang, elv_ang, date_generated
 
 
+def get_sun_pos_at_times(lat: float,
+                         lon: float,
+                         times: Sequence
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculates the sun azimuth & elevation angles at all times in one vectorized evaluation of the pysolar
+    algorithm, equivalent to calling pysolar's `get_azimuth` and `get_altitude` for each time
+
+    :param lat: latitude, degrees
+    :param lon: longitude, degrees
+    :param times: timezone-aware datetimes, or POSIX timestamps in seconds
+
+    :returns: array of sun azimuth, array of sun elevation
+    """
+    if len(times) and hasattr(times[0], 'timestamp'):
+        timestamps = np.array([t.timestamp() for t in times])
+    else:
+        timestamps = np.asarray(times, dtype=float)
+
+    # leap seconds and delta t only change by month, so look them up once per month
+    months = np.floor(timestamps).astype('int64').astype('datetime64[s]').astype('datetime64[M]')
+    unique_months, month_index = np.unique(months, return_inverse=True)
+    leap_seconds = np.zeros(len(unique_months))
+    delta_t = np.zeros(len(unique_months))
+    for i, month in enumerate(unique_months):
+        when = datetime.datetime.fromisoformat(str(month) + '-01').replace(tzinfo=datetime.timezone.utc)
+        leap_seconds[i] = pysolar.solartime.get_leap_seconds(when)
+        delta_t[i] = pysolar.solartime.get_delta_t(when)
+    month_index = month_index.ravel()
+
+    seconds_per_day = pysolar.constants.seconds_per_day
+    day_offset = pysolar.solartime.gregorian_day_offset + pysolar.solartime.julian_day_offset
+    jde = (timestamps + leap_seconds[month_index] + pysolar.solartime.tt_offset) / seconds_per_day + day_offset
+    jd = jde - delta_t[month_index] / seconds_per_day
+
+    # pysolar's topocentric position, evaluated on arrays
+    s = pysolar.solar
+    projected_radial_distance = s.get_projected_radial_distance(0, lat)
+    projected_axial_distance = s.get_projected_axial_distance(0, lat)
+    jce = pysolar.solartime.get_julian_ephemeris_century(jde)
+    jme = pysolar.solartime.get_julian_ephemeris_millennium(jce)
+    geocentric_latitude = s.get_geocentric_latitude(jme)
+    geocentric_longitude = s.get_geocentric_longitude(jme)
+    sun_earth_distance = s.get_sun_earth_distance(jme)
+    aberration_correction = s.get_aberration_correction(sun_earth_distance)
+    equatorial_horizontal_parallax = s.get_equatorial_horizontal_parallax(sun_earth_distance)
+    nutation = s.get_nutation(jce)
+    apparent_sidereal_time = s.get_apparent_sidereal_time(jd, jme, nutation)
+    true_ecliptic_obliquity = s.get_true_ecliptic_obliquity(jme, nutation)
+
+    apparent_sun_longitude = s.get_apparent_sun_longitude(geocentric_longitude, nutation, aberration_correction)
+    right_ascension = s.get_geocentric_sun_right_ascension(apparent_sun_longitude, true_ecliptic_obliquity,
+                                                           geocentric_latitude)
+    declination = s.get_geocentric_sun_declination(apparent_sun_longitude, true_ecliptic_obliquity,
+                                                   geocentric_latitude)
+    local_hour_angle = s.get_local_hour_angle(apparent_sidereal_time, lon, right_ascension)
+    parallax_right_ascension = s.get_parallax_sun_right_ascension(projected_radial_distance,
+                                                                  equatorial_horizontal_parallax, local_hour_angle,
+                                                                  declination)
+    topocentric_hour_angle = s.get_topocentric_local_hour_angle(local_hour_angle, parallax_right_ascension)
+    topocentric_declination = s.get_topocentric_sun_declination(declination, projected_axial_distance,
+                                                                equatorial_horizontal_parallax,
+                                                                parallax_right_ascension, local_hour_angle)
+
+    azi_ang = s.get_topocentric_azimuth_angle(topocentric_hour_angle, lat, topocentric_declination)
+    topocentric_elevation = s.get_topocentric_elevation_angle(lat, topocentric_declination, topocentric_hour_angle)
+    elv_ang = topocentric_elevation + s.get_refraction_correction(pysolar.constants.standard_pressure,
+                                                                  pysolar.constants.standard_temperature,
+                                                                  topocentric_elevation)
+    return np.asarray(azi_ang, dtype=float), np.asarray(elv_ang, dtype=float)
+
+
 def blade_pos_of_rotated_ellipse(radius_x: float,
                                  radius_y: float,
                                  rotation_theta: Union[float, np.ndarray],
@@ -110,6 +182,35 @@ def get_turbine_shadow_polygons(blade_length: float,
     :param tower_shadow: if false, do not include the tower's shadow
     :returns: (shadow polygon, shadow angle from north) if shadow exists, otherwise (None, None)
     """
+    shadow_parts, shadow_ang = get_turbine_shadow_vertices(blade_length, blade_angle, azi_ang, elv_ang, wind_dir,
+                                                           tower_shadow, tower_height)
+    if shadow_parts is None:
+        return None, None
+    turbine_shadow = unary_union([Polygon(part) for part in shadow_parts])
+    return turbine_shadow, shadow_ang
+
+
+def get_turbine_shadow_vertices(blade_length: float,
+                                blade_angle: Optional[float],
+                                azi_ang: float,
+                                elv_ang: float,
+                                wind_dir,
+                                tower_shadow: bool = True,
+                                tower_height: Optional[float] = None
+                                ) -> Tuple[Optional[List[np.ndarray]], Optional[float]]:
+    """
+    Calculates the parts of a wind turbine's shadow as convex polygons: the tower shadow and the shadow of each blade,
+    or of the swept area if blade_angle is None. The union of the parts is the shadow of get_turbine_shadow_polygons.
+
+    :param blade_length: meters, radius in spherical coords
+    :param blade_angle: degrees from z-axis, or None to use ellipse as swept area
+    :param azi_ang: azimuth degrees, clockwise from north as 0
+    :param elv_ang: elevation degrees, from x-y plane as 0
+    :param wind_dir: degrees from north, clockwise, determines which direction rotor is facing
+    :param tower_shadow: if false, do not include the tower's shadow
+    :returns: (list of [n_vertices, 2] arrays of polygon vertices, shadow angle from north) if shadow exists,
+        otherwise (None, None)
+    """
     # "Shadow analysis of wind turbines for dual use of land for combined wind and solar photovoltaic power generation":
     # the average tower_height=2.5R; average tower_width=R/16; average blade_width=R/16
     blade_width = blade_length / 16
@@ -156,13 +257,12 @@ def get_turbine_shadow_polygons(blade_length: float,
     top_rght_x, top_rght_y = tower_dy * sin_theta + base_rght_x, tower_dy * cos_theta + base_rght_y
     top_left_x, top_left_y = tower_dy * sin_theta + base_left_x, tower_dy * cos_theta + base_left_y
 
+    shadow_parts = []
     if tower_shadow:
-        turbine_shadow = Polygon(((base_left_x, base_left_y),
-                                  (base_rght_x, base_rght_y),
-                                  (top_rght_x, top_rght_y),
-                                  (top_left_x, top_left_y)))
-    else:
-        turbine_shadow = Polygon()
+        shadow_parts.append(np.array(((base_left_x, base_left_y),
+                                      (base_rght_x, base_rght_y),
+                                      (top_rght_x, top_rght_y),
+                                      (top_left_x, top_left_y))))
 
     # calculate the blade shadows of swept area using parametric eq of general ellipse
     radius_x = shadow_width_blade
@@ -176,7 +276,7 @@ def get_turbine_shadow_polygons(blade_length: float,
     if blade_angle is None:
         degs = np.linspace(0, 2 * np.pi, 50)
         x, y = blade_pos_of_rotated_ellipse(radius_y, radius_x, rotation_theta, degs, center_x, center_y)
-        turbine_shadow = unary_union([turbine_shadow, Polygon(zip(x, y))])
+        shadow_parts.append(np.column_stack((x, y)))
     else:
         turbine_blade_angles = (blade_angle, blade_angle + 120, blade_angle - 120)
 
@@ -196,11 +296,11 @@ def get_turbine_shadow_polygons(blade_length: float,
             blade_base_left_x, blade_base_left_y = tower_dx * np.cos(blade_1_dr) + x, \
                                                    tower_dx * np.sin(blade_1_dr) + y
 
-            turbine_shadow = unary_union([turbine_shadow, Polygon(((blade_tip_left_x, blade_tip_left_y),
-                                                                      (blade_tip_rght_x, blade_tip_rght_y),
-                                                                      (blade_base_rght_x, blade_base_rght_y),
-                                                                      (blade_base_left_x, blade_base_left_y)))])
-    return turbine_shadow, shadow_ang
+            shadow_parts.append(np.array(((blade_tip_left_x, blade_tip_left_y),
+                                          (blade_tip_rght_x, blade_tip_rght_y),
+                                          (blade_base_rght_x, blade_base_rght_y),
+                                          (blade_base_left_x, blade_base_left_y))))
+    return shadow_parts, shadow_ang
 
 
 def get_turbine_shadows_timeseries(blade_length: float,
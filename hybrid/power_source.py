@@ -85,26 +85,10 @@ class PowerSource:
         """
         var_name = var_name.replace('adjust:', '')
         attr_obj = None
-        if var_name in self.__dir__():
+        if var_name in self.__dict__ or hasattr(type(self), var_name):
             attr_obj = self
         if not attr_obj:
-            for a in self._system_model.__dir__():
-                group_obj = getattr(self._system_model, a)
-                try:
-                    if var_name in group_obj.__dir__():
-                        attr_obj = group_obj
-                        break
-                except:
-                    pass
-        if not attr_obj:
-            for a in self._financial_model.__dir__():
-                try:
-                    group_obj = getattr(self._financial_model, a)
-                    if var_name in group_obj.__dir__():
-                        attr_obj = group_obj
-                        break
-                except:
-                    pass
+            attr_obj = self._get_value_index().get(var_name)
         if not attr_obj:
             raise ValueError("Variable {} not found in technology or financial model {}".format(
                 var_name, self.__class__.__name__))
@@ -120,6 +104,34 @@ class PowerSource:
             except Exception as e:
                 raise IOError(f"{self.__class__}'s attribute {var_name} could not be set to {var_value}: {e}")
 
+    def _get_value_index(self, models: tuple = None) -> dict:
+        """
+        Returns the index of variable name to the PySAM group that owns it, searching the system model groups first
+        and then the financial model groups. The index is built once per model instance and rebuilt if either the
+        system or financial model is swapped.
+
+        :param models: (optional) models to index in search order, defaults to the system and financial models
+        """
+        if models is None:
+            models = (self._system_model, self._financial_model)
+        index_models = getattr(self, '_value_index_models', None)
+        if index_models is None or len(index_models) != len(models) \
+                or any(a is not b for a, b in zip(models, index_models)):
+            index = {}
+            for model in models:
+                if model is None:
+                    continue
+                for a in model.__dir__():
+                    try:
+                        group_obj = getattr(model, a)
+                        for name in group_obj.__dir__():
+                            index.setdefault(name, group_obj)
+                    except:
+                        pass
+            self._value_index = index
+            self._value_index_models = models
+        return self._value_index
+
     def assign(self, input_dict: dict):
         """
         Sets input variables in the PowerSource class or any of its subclasses (system or financial models)
@@ -198,6 +210,13 @@ class PowerSource:
 
             return capacity_value
 
+    def update_resource(self):
+        """
+        Passes the site's current resource data to the system model, e.g. after the site's resource year is changed.
+        Sources without resource inputs do nothing.
+        """
+        pass
+
     def setup_performance_model(self):
         """
         Sets up performance model to before simulating power production. Required by specific technologies 
@@ -5,6 +5,7 @@ import PySAM.Pvwattsv8 as Pvwatts
 import PySAM.Singleowner as Singleowner
 
 from hybrid.power_source import *
+from hybrid.resource import to_pysam_resource_data
 from hybrid.layout.pv_layout import PVLayout, PVGridParameters
 from hybrid.dispatch.power_sources.pv_dispatch import PvDispatch
 
@@ -37,7 +38,7 @@ class PVPlant(PowerSource):
 
         super().__init__("SolarPlant", site, system_model, financial_model)
 
-        self._system_model.SolarResource.solar_resource_data = self.site.solar_resource.data
+        self.update_resource()
 
         self.dc_degradation = [0]
 
@@ -55,6 +56,12 @@ class PVPlant(PowerSource):
 
         self.system_capacity_kw: float = pv_config['system_capacity_kw']
 
+    def update_resource(self):
+        """
+        Passes the site's current resource data to the system model
+        """
+        self._system_model.SolarResource.solar_resource_data = to_pysam_resource_data(self.site.solar_resource.data)
+
     @property
     def system_capacity_kw(self) -> float:
         # TODO: This is currently DC power; however, all other systems are rated by AC power
@@ -41,7 +41,12 @@ class SscWrap(metaclass=abc.ABCMeta):
         return
 
     @abc.abstractmethod
-    def execute(self):
+    def execute(self, outputs=None, index_ranges=None):
+        """Runs the model(s) and returns a dictionary of results
+
+        :param outputs: (optional) names of the variables to fetch, if None all variables are exported
+        :param index_ranges: (optional) dictionary of {name: (start, stop)} index ranges to fetch of array variables
+        """
         return
 
     @abc.abstractmethod
@@ -73,8 +78,8 @@ class PysscWrap(SscWrap):
     def get(self, name):
         return self.params[name]
 
-    def execute(self):
-        results = ssc_sim_from_dict(self.ssc, self.params)
+    def execute(self, outputs=None, index_ranges=None):
+        results = ssc_sim_from_dict(self.ssc, self.params, outputs, index_ranges)
         return results
 
     def export_params(self):
@@ -185,12 +190,39 @@ class PysamWrap(SscWrap):
         except Exception as err:
             raise(err)
 
-    def execute(self):
+    def execute(self, outputs=None, index_ranges=None):
+        """Runs the model(s) and returns a dictionary of results, see SscWrap.execute
+
+        PySAM has no ranged access to arrays, so each selected output is fetched whole and only then sliced to its
+        index range. Selecting outputs avoids converting unused ones, but the full series of selected arrays are
+        still copied from SSC.
+        """
         self.tech_model.execute(1)
-        results = self.tech_model.Outputs.export()
+        models = [self.tech_model]
         if self.financial_name is not None:
             self.financial_model.execute(1)
-            results.update(self.financial_model.Outputs.export())
+            models.append(self.financial_model)
+
+        results = {}
+        if outputs is None:
+            for model in models:
+                results.update(model.Outputs.export())
+        else:
+            for name in outputs:
+                for model in models:
+                    try:
+                        results[name] = getattr(model.Outputs, name)
+                    except AttributeError:
+                        try:
+                            results[name] = model.value(name.replace('.', '_'))
+                        except Exception:
+                            continue
+                    break
+
+        if index_ranges is not None:
+            for name, (start, stop) in index_ranges.items():
+                if name in results and isinstance(results[name], (list, tuple)):
+                    results[name] = results[name][start:stop]
         return results
 
     def export_params(self):
@@ -201,7 +233,7 @@ class PysamWrap(SscWrap):
 
 # TODO: make these few following functions into member functions
 # Functions to simulate compute modules through dictionaries
-def ssc_sim_from_dict(ssc, data_pydict):
+def ssc_sim_from_dict(ssc, data_pydict, outputs=None, index_ranges=None):
     """ Run a technology compute module using parameters in a dict.
 
     Parameters
@@ -215,6 +247,12 @@ def ssc_sim_from_dict(ssc, data_pydict):
                 model is used.
         Other keys are names of args for the selected tech_model or
         financial_model.
+    outputs: list or None
+        names of the variables to return. If None, all variables of the
+        compute modules are returned.
+    index_ranges: dict or None
+        {name: (start, stop)} index ranges of array variables to return.
+        Only the requested part of the array is copied out of ssc.
 
     Returns
     -------
@@ -233,13 +271,13 @@ def ssc_sim_from_dict(ssc, data_pydict):
         data_ssc = dict_to_ssc_table_dat(ssc, data_pydict, financial_model_name,
                                          data_ssc_tech_model)
 
-    return ssc_sim(ssc, data_ssc, tech_model_name, financial_model_name)
+    return ssc_sim(ssc, data_ssc, tech_model_name, financial_model_name, outputs, index_ranges)
 
 
-def ssc_sim(ssc, data_ssc, tech_model_name, financial_model_name):
+def ssc_sim(ssc, data_ssc, tech_model_name, financial_model_name, outputs=None, index_ranges=None):
 
     # Run the technology model compute module
-    tech_model_return = ssc_cmod(ssc, data_ssc, tech_model_name)
+    tech_model_return = ssc_cmod(ssc, data_ssc, tech_model_name, outputs, index_ranges)
     tech_model_success = tech_model_return[0]
     tech_model_dict = tech_model_return[1]
 
@@ -256,7 +294,7 @@ def ssc_sim(ssc, data_ssc, tech_model_name, financial_model_name):
         return tech_model_dict
 
     # Run the financial model
-    financial_model_return = ssc_cmod(ssc, data_ssc, financial_model_name)
+    financial_model_return = ssc_cmod(ssc, data_ssc, financial_model_name, outputs, index_ranges)
     financial_model_success = financial_model_return[0]
     financial_model_dict = financial_model_return[1]
 
@@ -274,7 +312,7 @@ def ssc_sim(ssc, data_ssc, tech_model_name, financial_model_name):
 
     return out_dict
 
-def ssc_cmod(ssc, dat, name):
+def ssc_cmod(ssc, dat, name, outputs=None, index_ranges=None):
     # ssc = PySSC()
 
     cmod = ssc.module_create(name.encode("utf-8"))
@@ -290,11 +328,11 @@ def ssc_cmod(ssc, dat, name):
             print(' : ' + msg.decode("utf - 8"))
             msg = ssc.module_log(cmod, idx)
             idx = idx + 1
-        cmod_err_dict = ssc_table_to_dict(ssc, cmod, dat)
+        cmod_err_dict = ssc_table_to_dict(ssc, cmod, dat, outputs, index_ranges)
         return [False, cmod_err_dict]
 
-    # Get python dictionary representing compute module with all inputs/outputs defined
-    return [True, ssc_table_to_dict(ssc, cmod, dat)]
+    # Get python dictionary representing compute module with all (or requested) inputs/outputs defined
+    return [True, ssc_table_to_dict(ssc, cmod, dat, outputs, index_ranges)]
 
 
 def dict_to_ssc_table(ssc, py_dict, cmod_name):
@@ -390,11 +428,42 @@ def ssc_data_type(v):
     return ssc_data_type
 
 
+def get_ssc_var(ssc_output_data_type, ssc, dat, ssc_output_data_name, index_range=None):
+    name = ssc_output_data_name.encode("ascii")
+    if (ssc_output_data_type == 1):
+        return ssc.data_get_string(dat, name).decode("ascii")
+    elif (ssc_output_data_type == 2):
+        return ssc.data_get_number(dat, name)
+    elif (ssc_output_data_type == 3):
+        if index_range is None:
+            return ssc.data_get_array(dat, name)
+        return ssc.data_get_array(dat, name, *index_range)
+    elif (ssc_output_data_type == 4):
+        return ssc.data_get_matrix(dat, name)
+    elif (ssc_output_data_type == 5):
+        return ssc.data_get_table(dat, name)
+
+
 # Returns python dictionary representing SSC compute module w/ all required inputs/outputs defined
-def ssc_table_to_dict(ssc, cmod, dat):
+#  If outputs is given, only those variables are copied out of the ssc data table, and array variables in
+#  index_ranges are only copied over their {name: (start, stop)} index range.
+def ssc_table_to_dict(ssc, cmod, dat, outputs=None, index_ranges=None):
     # ssc = PySSC()
-    i = 0
+    if index_ranges is None:
+        index_ranges = {}
     ssc_out = {}
+    if outputs is not None:
+        for ssc_output_data_name in outputs:
+            # data_query returns the data type of an assigned variable, 0 otherwise
+            ssc_output_data_type = ssc.data_query(dat, ssc_output_data_name.encode("ascii"))
+            if (ssc_output_data_type > 0):
+                ssc_out[ssc_output_data_name] = get_ssc_var(ssc_output_data_type, ssc, dat, ssc_output_data_name,
+                                                            index_ranges.get(ssc_output_data_name))
+        ssc.data_free(dat)
+        ssc.module_free(cmod)
+        return ssc_out
+
+    i = 0
     while (True):
         p_ssc_entry = ssc.module_var_info(cmod, i)
         ssc_output_data_type = ssc.info_data_type(p_ssc_entry)
@@ -403,18 +472,8 @@ def ssc_table_to_dict(ssc, cmod, dat):
         ssc_output_data_name = str(ssc.info_name(p_ssc_entry).decode("ascii"))
         ssc_data_query = ssc.data_query(dat, ssc_output_data_name.encode("ascii"))
         if (ssc_data_query > 0):
-            if (ssc_output_data_type == 1):
-                ssc_out[ssc_output_data_name] = ssc.data_get_string(dat,
-                                                                    ssc_output_data_name.encode("ascii")).decode(
-                    "ascii")
-            elif (ssc_output_data_type == 2):
-                ssc_out[ssc_output_data_name] = ssc.data_get_number(dat, ssc_output_data_name.encode("ascii"))
-            elif (ssc_output_data_type == 3):
-                ssc_out[ssc_output_data_name] = ssc.data_get_array(dat, ssc_output_data_name.encode("ascii"))
-            elif (ssc_output_data_type == 4):
-                ssc_out[ssc_output_data_name] = ssc.data_get_matrix(dat, ssc_output_data_name.encode("ascii"))
-            elif (ssc_output_data_type == 5):
-                ssc_out[ssc_output_data_name] = ssc.data_get_table(dat, ssc_output_data_name.encode("ascii"))
+            ssc_out[ssc_output_data_name] = get_ssc_var(ssc_output_data_type, ssc, dat, ssc_output_data_name,
+                                                        index_ranges.get(ssc_output_data_name))
         i = i + 1
 
     ssc.data_free(dat)
@@ -530,11 +589,12 @@ class PySSC:
         self.pdll.ssc_data_get_number(c_void_p(p_data), c_char_p(name), byref(val))
         return val.value
 
-    def data_get_array(self, p_data, name):
+    def data_get_array(self, p_data, name, start=None, stop=None):
         count = c_int()
         self.pdll.ssc_data_get_array.restype = POINTER(c_number)
         parr = self.pdll.ssc_data_get_array(c_void_p(p_data), c_char_p(name), byref(count))
-        arr = parr[0:count.value]  # extract all at once
+        start, stop, _ = slice(start, stop).indices(count.value)
+        arr = parr[start:max(start, stop)]  # extract all (or the requested range) at once
         return arr
 
     def data_get_matrix(self, p_data, name):
@@ -1,3 +1,8 @@
 from .solar_resource import SolarResource
 from .wind_resource import WindResource
 from .elec_prices import ElectricityPrices
+from .resource import to_pysam_resource_data
+from .resource_store import ResourceStore, ResourceTable, resource_store, user_cache_dir
+from .schedule_store import ScheduleStore, schedule_store, schedule_window
+from .resource_catalog import ResourceCatalog
+from .prefetch import ResourcePrefetcher, RateLimiter
@@ -1,11 +1,11 @@
 import csv
 from pathlib import Path
 from collections import defaultdict
-import numpy as np
 
 from hybrid.keys import get_developer_nrel_gov_key
 from hybrid.log import hybrid_logger as logger
 from hybrid.resource.resource import *
+from hybrid.resource.schedule_store import schedule_store
 
 
 class ElectricityPrices(Resource):
@@ -43,10 +43,7 @@ class ElectricityPrices(Resource):
     def format_data(self):
         if not os.path.isfile(self.filename):
             raise IOError(f"ElectricityPrices error: {self.filename} does not exist.")
-        try:
-            self._data = np.loadtxt(self.filename)
-        except ValueError:
-            self._data = np.loadtxt(self.filename, skiprows=1)
+        self._data = schedule_store.load(self.filename)
 
     def data(self):
         if not os.path.isfile(self.filename):
@@ -0,0 +1,121 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence, Union
+
+from hybrid.log import hybrid_logger as logger
+from hybrid.resource.resource_catalog import ResourceCatalog
+from hybrid.resource.solar_resource import SolarResource
+from hybrid.resource.wind_resource import WindResource
+
+
+class RateLimiter:
+    """
+    Thread-safe limit of the rate of API requests, shared by all downloads of a prefetcher.
+    """
+    def __init__(self, max_requests_per_second: float):
+        """
+        :param max_requests_per_second: Maximum number of requests started per second, no limit if <= 0
+        """
+        self.min_interval = 1. / max_requests_per_second if max_requests_per_second > 0 else 0.
+        self._lock = threading.Lock()
+        self._next_time = 0.
+
+    def wait(self):
+        """Blocks until the next request is allowed"""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_time)
+            self._next_time = start + self.min_interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class ResourcePrefetcher:
+    """
+    Downloads solar and wind resource files of many sites concurrently, before the sites are set up.
+
+    Files are named and placed the same way as by :class:`hybrid.resource.SolarResource` and
+    :class:`hybrid.resource.WindResource`, so a ``SiteInfo`` created afterwards finds them on disk. Files already on
+    disk are not downloaded again, files are written atomically, and all requests share one rate limit.
+    """
+    def __init__(self,
+                 path_resource: str = "",
+                 max_workers: int = 8,
+                 max_requests_per_second: float = 1.0,
+                 api_host: Optional[str] = None,
+                 resource_catalog: Optional[ResourceCatalog] = None,
+                 catalog_tolerance_km: float = 0.):
+        """
+        :param path_resource: Directory where to save downloaded files, defaults to the 'resource_files' folder
+        :param max_workers: Number of concurrent downloads
+        :param max_requests_per_second: Maximum API request rate of all downloads, no limit if <= 0
+        :param api_host: (optional) API host, e.g., a local server for testing, defaults to https://developer.nrel.gov
+        :param resource_catalog: (optional) Catalog of local files, files of sites within catalog_tolerance_km of an
+            existing file are not downloaded and downloaded files are added to the catalog
+        :param catalog_tolerance_km: Maximum distance [km] of a catalog file to a site for the file to be used
+        """
+        self.path_resource = path_resource
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(max_requests_per_second)
+        self.api_host = api_host
+        self.resource_catalog = resource_catalog
+        self.catalog_tolerance_km = catalog_tolerance_km
+
+    def _resource_kwargs(self) -> dict:
+        kwargs = {'path_resource': self.path_resource, 'rate_limiter': self.rate_limiter,
+                  'resource_catalog': self.resource_catalog, 'catalog_tolerance_km': self.catalog_tolerance_km}
+        if self.api_host is not None:
+            kwargs['api_host'] = self.api_host
+        return kwargs
+
+    def fetch_solar(self, lat: float, lon: float, year: int) -> str:
+        """Downloads the solar resource file of a site, if not on disk, and returns its path"""
+        return SolarResource(lat, lon, year, **self._resource_kwargs()).filename
+
+    def fetch_wind(self, lat: float, lon: float, year: int, hub_height: float) -> Union[str, list]:
+        """
+        Downloads the wind resource file(s) of a site and hub height, if not on disk, and returns the path of the
+        file, or the paths of the files of the heights bracketing the hub height
+        """
+        wind = WindResource(lat, lon, year, wind_turbine_hub_ht=hub_height, **self._resource_kwargs())
+        if os.path.isfile(wind.filename):
+            return wind.filename
+        return list(wind.file_resource_heights.values())
+
+    def prefetch(self,
+                 sites: Sequence[Union[dict, Sequence[float]]],
+                 years: Sequence[int] = (2012,),
+                 hub_heights: Sequence[float] = (),
+                 solar: bool = True) -> dict:
+        """
+        Downloads resource files of all combinations of sites and years (and hub heights for wind) concurrently.
+
+        :param sites: Sites as (lat, lon) pairs or dictionaries with 'lat' and 'lon' keys (e.g., SiteInfo data)
+        :param years: Resource years
+        :param hub_heights: Wind turbine hub heights [m], wind resource is not downloaded if empty
+        :param solar: If True, solar resource files are downloaded
+
+        :returns: {('solar', lat, lon, year) or ('wind', lat, lon, year, hub_height): file path (list of file paths
+            for wind hub heights between resource heights) or the exception raised by a failed download}
+        """
+        tasks = {}
+        for site in sites:
+            lat, lon = (site['lat'], site['lon']) if isinstance(site, dict) else site
+            for year in years:
+                if solar:
+                    tasks[('solar', lat, lon, year)] = (self.fetch_solar, (lat, lon, year))
+                for hub_height in hub_heights:
+                    tasks[('wind', lat, lon, year, hub_height)] = (self.fetch_wind, (lat, lon, year, hub_height))
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {key: executor.submit(func, *args) for key, (func, args) in tasks.items()}
+            for key, future in futures.items():
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    logger.warning("Resource prefetch of {} failed: {}".format(key, e))
+                    results[key] = e
+        return results
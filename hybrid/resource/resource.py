@@ -2,7 +2,19 @@ from abc import ABCMeta, abstractmethod
 import os
 import json
 import requests
+import threading
 import time
+import numpy as np
+
+
+def to_pysam_resource_data(data: dict) -> dict:
+    """
+    Converts array values of a resource data dictionary (e.g., of a site attached to shared memory) to lists,
+    as required by PySAM. Dictionaries without arrays are returned unchanged.
+    """
+    if not any(isinstance(v, np.ndarray) for v in data.values()):
+        return data
+    return {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in data.items()}
 
 
 class Resource(metaclass=ABCMeta):
@@ -38,6 +50,13 @@ class Resource(metaclass=ABCMeta):
         self.reason = 'hybrid-analysis'
         self.email = 'nicholas.diorio@nrel.gov'
         self.mailing_list = 'true'
+        self.api_host = 'https://developer.nrel.gov'
+        # optional shared limit of the API request rate, e.g. hybrid.resource.prefetch.RateLimiter
+        self.rate_limiter = None
+        # optional index of local files, e.g. hybrid.resource.ResourceCatalog, searched for files of nearby sites
+        # within catalog_tolerance_km before downloading
+        self.resource_catalog = None
+        self.catalog_tolerance_km = 0.
 
         # paths
         self.path_current = os.path.dirname(os.path.abspath(__file__))
@@ -54,14 +73,17 @@ class Resource(metaclass=ABCMeta):
             os.makedirs(os.path.dirname(self.filename))
 
     @staticmethod
-    def call_api(url, filename):
+    def call_api(url, filename, rate_limiter=None):
         """
         Parameters
         ---------
         url: string
             The API endpoint to return data from
         filename: string
-            The filename where data should be written
+            The filename where data should be written. Data is written to a temporary file first, so the file
+            is never partially written.
+        rate_limiter: object with a wait() method, optional
+            Called before each request to limit the request rate
         """
 
         n_tries = 0
@@ -69,11 +91,14 @@ class Resource(metaclass=ABCMeta):
         while n_tries < 5:
 
             try:
+                if rate_limiter is not None:
+                    rate_limiter.wait()
                 r = requests.get(url)
                 if r:
-                    localfile = open(filename, mode='w+')
-                    localfile.write(r.text)
-                    localfile.close()
+                    tmp_filename = "{}.{}.{}.tmp".format(filename, os.getpid(), threading.get_ident())
+                    with open(tmp_filename, mode='w+') as localfile:
+                        localfile.write(r.text)
+                    os.replace(tmp_filename, filename)
                     if os.path.isfile(filename):
                         success = True
                         break
@@ -0,0 +1,198 @@
+import math
+import os
+import re
+import sqlite3
+from contextlib import closing
+from typing import Optional, Sequence
+
+
+EARTH_RADIUS_KM = 6371.0
+
+_solar_file_pattern = re.compile(r'^(?P<lat>-?[\d.]+)_(?P<lon>-?[\d.]+)_psmv3_(?P<interval>\d+)_(?P<year>\d{4})\.csv$')
+_wind_file_pattern = re.compile(r'^(?P<lat>-?[\d.]+)_(?P<lon>-?[\d.]+)_windtoolkit_(?P<year>\d{4})_(?P<interval>\d+)min'
+                                r'(?P<heights>(?:_\d+m)+)\.srw$')
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance [km] between two coordinates [deg]"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1., math.sqrt(a)))
+
+
+class ResourceCatalog:
+    """
+    SQLite index of local resource files by resource type, location, year, interval and (for wind) hub heights.
+
+    Files are found by nearest-site queries within a distance tolerance, so nearby sites can reuse downloaded files
+    and files are found without scanning resource directories. The database file may be shared by several processes.
+    """
+    _schema = """
+        CREATE TABLE IF NOT EXISTS resource_files (
+            filename TEXT PRIMARY KEY,
+            resource_type TEXT NOT NULL,
+            lat REAL NOT NULL,
+            lon REAL NOT NULL,
+            year INTEGER NOT NULL,
+            interval INTEGER NOT NULL,
+            height_min REAL,
+            height_max REAL
+        );
+        CREATE INDEX IF NOT EXISTS resource_files_location
+            ON resource_files (resource_type, year, lat, lon);
+    """
+
+    def __init__(self, db_path: str):
+        """
+        :param db_path: Path of the SQLite database file, created if it does not exist
+        """
+        self.db_path = db_path
+        db_dir = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(db_dir, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(self._schema)
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per operation, so the catalog can be used from several threads
+        return sqlite3.connect(self.db_path, timeout=30)
+
+    def add(self,
+            filename: str,
+            resource_type: str,
+            lat: float,
+            lon: float,
+            year: int,
+            interval: int = 60,
+            heights: Optional[Sequence[float]] = None):
+        """
+        Adds a resource file to the catalog, replacing any entry of the same file.
+
+        :param filename: Resource file path
+        :param resource_type: 'solar' or 'wind'
+        :param lat: Latitude of the resource data [deg]
+        :param lon: Longitude of the resource data [deg]
+        :param year: Resource year
+        :param interval: Time step [min]
+        :param heights: Wind resource heights in the file [m]
+        """
+        if resource_type not in ('solar', 'wind'):
+            raise ValueError("resource_type must be 'solar' or 'wind'")
+        height_min = min(heights) if heights else None
+        height_max = max(heights) if heights else None
+        with closing(self._connect()) as conn, conn:
+            conn.execute("INSERT OR REPLACE INTO resource_files VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                         (os.path.abspath(filename), resource_type, float(lat), float(lon), int(year), int(interval),
+                          height_min, height_max))
+
+    def add_file(self, filename: str) -> bool:
+        """
+        Adds a resource file named as by :class:`hybrid.resource.SolarResource` or
+        :class:`hybrid.resource.WindResource` to the catalog, using the location, year, interval and heights in
+        the file name.
+
+        :param filename: Resource file path
+
+        :returns: True if the file name was recognized and the file added
+        """
+        name = os.path.basename(filename)
+        match = _solar_file_pattern.match(name)
+        if match:
+            self.add(filename, 'solar', float(match['lat']), float(match['lon']), int(match['year']),
+                     int(match['interval']))
+            return True
+        match = _wind_file_pattern.match(name)
+        if match:
+            heights = [float(h) for h in re.findall(r'_(\d+)m', match['heights'])]
+            self.add(filename, 'wind', float(match['lat']), float(match['lon']), int(match['year']),
+                     int(match['interval']), heights)
+            return True
+        return False
+
+    def add_directory(self, path_resource: str) -> int:
+        """
+        Adds all recognized resource files in the 'solar' and 'wind' subdirectories of a resource directory.
+
+        :param path_resource: Resource directory, e.g. the 'resource_files' folder
+
+        :returns: Number of files added
+        """
+        n_added = 0
+        for sub_dir in ('solar', 'wind'):
+            directory = os.path.join(path_resource, sub_dir)
+            if not os.path.isdir(directory):
+                continue
+            for entry in os.scandir(directory):
+                if entry.is_file() and self.add_file(entry.path):
+                    n_added += 1
+        return n_added
+
+    def remove(self, filename: str):
+        """Removes a file from the catalog"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM resource_files WHERE filename = ?", (os.path.abspath(filename),))
+
+    def nearest(self,
+                resource_type: str,
+                lat: float,
+                lon: float,
+                year: int,
+                tolerance_km: float = 0.,
+                interval: Optional[int] = None,
+                hub_height: Optional[float] = None,
+                single_height: bool = False) -> Optional[str]:
+        """
+        Finds the resource file nearest to a location, within a distance tolerance. Entries of files which no
+        longer exist are removed.
+
+        :param resource_type: 'solar' or 'wind'
+        :param lat: Latitude [deg]
+        :param lon: Longitude [deg]
+        :param year: Resource year
+        :param tolerance_km: Maximum distance between the location and the resource data [km]
+        :param interval: (optional) Time step [min]
+        :param hub_height: (optional) Wind hub height [m] which must be within the heights of the file
+        :param single_height: If True, only wind files of a single height are searched
+
+        :returns: Path of the nearest file, or None if there is no file within the tolerance
+        """
+        # bounding box of the tolerance, searched using the location index
+        d_lat = math.degrees(tolerance_km / EARTH_RADIUS_KM) + 1e-9
+        cos_lat = math.cos(math.radians(min(abs(lat) + d_lat, 90.)))
+        d_lon = 180. if cos_lat < 1e-9 else min(180., d_lat / cos_lat)
+
+        query = ("SELECT filename, lat, lon FROM resource_files "
+                 "WHERE resource_type = ? AND year = ? AND lat BETWEEN ? AND ?")
+        params = [resource_type, int(year), lat - d_lat, lat + d_lat]
+        if d_lon < 180.:
+            if lon - d_lon < -180. or lon + d_lon > 180.:
+                query += " AND (lon >= ? OR lon <= ?)"
+                params += [(lon - d_lon + 540.) % 360. - 180., (lon + d_lon + 540.) % 360. - 180.]
+            else:
+                query += " AND lon BETWEEN ? AND ?"
+                params += [lon - d_lon, lon + d_lon]
+        if interval is not None:
+            query += " AND interval = ?"
+            params.append(int(interval))
+        if hub_height is not None:
+            query += " AND height_min <= ? AND height_max >= ?"
+            params += [float(hub_height), float(hub_height)]
+        if single_height:
+            query += " AND height_min = height_max"
+
+        with closing(self._connect()) as conn:
+            candidates = conn.execute(query, params).fetchall()
+
+        candidates = sorted((haversine_km(lat, lon, c_lat, c_lon), filename) for filename, c_lat, c_lon in candidates)
+        for distance, filename in candidates:
+            if distance > tolerance_km:
+                break
+            if os.path.isfile(filename):
+                return filename
+            self.remove(filename)
+        return None
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM resource_files").fetchone()[0]
@@ -0,0 +1,289 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence, Union
+
+import numpy as np
+
+
+def user_cache_dir(name: str) -> str:
+    """
+    Gets a directory for persistent caches in the user's cache directory, $XDG_CACHE_HOME/hopp or ~/.cache/hopp
+
+    :param name: Name of the cache
+
+    :returns: Directory path, which may not exist yet
+    """
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'hopp', name)
+
+
+class ResourceTable:
+    """
+    Parsed weather file: the header rows (as strings) and the numeric data rows as a 2D float array, with one
+    column per non-empty data column of the file.
+    """
+    def __init__(self, header_rows: list, data: np.ndarray, columns: list):
+        """
+        :param header_rows: Rows before the numeric data, each a list of strings
+        :param data: Numeric data [time step, column]
+        :param columns: Indices of the file columns stored in data
+        """
+        self.header_rows = header_rows
+        self.data = data
+        self.columns = columns
+
+    @property
+    def column_names(self) -> list:
+        """Names of the data columns from the last header row (NSRDB format)"""
+        names = self.header_rows[-1]
+        return [names[c] if c < len(names) else '' for c in self.columns]
+
+    def column(self, name: str) -> np.ndarray:
+        """Gets a data column by its name in the last header row (NSRDB format)"""
+        return self.data[:, self.column_names.index(name)]
+
+    def metadata(self) -> dict:
+        """Gets the metadata of NSRDB format files: {name: value} from the first two header rows"""
+        return {k: v for k, v in zip(self.header_rows[0], self.header_rows[1])}
+
+
+class ResourceStore:
+    """
+    Parse-once store of weather files. Each file is converted once into a compact binary form: a float64 ``.npy``
+    array, memory-mapped when loaded, and a ``.json`` file of header rows. Entries are keyed by the hash of the file
+    contents, so edited or re-downloaded files are parsed again. If the binary files cannot be written, files are
+    parsed in memory instead. The max_tables most recently used tables are also kept in memory for the process.
+    """
+    # number of rows parsed at a time
+    chunk_rows = 8760
+    # number of tables kept in memory
+    max_tables = 16
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        :param cache_dir: Directory of the binary files, if None files are only parsed once per process
+        """
+        self.cache_dir = cache_dir
+        self._content_keys = {}
+        self._tables = OrderedDict()
+
+    def content_key(self, filename: str, n_header_rows: int) -> str:
+        """Gets the store key of a file, a hash of the file contents and the number of header rows."""
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        file_id = (path, stat.st_mtime_ns, stat.st_size, n_header_rows)
+        if file_id not in self._content_keys:
+            sha = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha.update(chunk)
+            sha.update(str(n_header_rows).encode('ascii'))
+            self._content_keys[file_id] = sha.hexdigest()
+        return self._content_keys[file_id]
+
+    def load_table(self, filename: str, n_header_rows: int) -> ResourceTable:
+        """
+        Gets the parsed table of a weather file, parsing the file only if it is not in the store.
+
+        :param filename: Weather file path
+        :param n_header_rows: Number of rows before the numeric data
+
+        :returns: Parsed weather file
+        """
+        if not os.path.isfile(filename):
+            raise FileNotFoundError(filename + " does not exist.")
+        key = self.content_key(filename, n_header_rows)
+        if key in self._tables:
+            self._tables.move_to_end(key)
+            return self._tables[key]
+
+        table = self._load_binary(key)
+        if table is None:
+            table = self._parse_to_binary(filename, n_header_rows, key)
+        self._tables[key] = table
+        while len(self._tables) > self.max_tables:
+            self._tables.popitem(last=False)
+        return table
+
+    def parse_file(self, filename: str, n_header_rows: int, data_file: Optional[str] = None) -> ResourceTable:
+        """
+        Parses a weather file, dropping data columns that are empty in every row. The file is read in blocks of
+        chunk_rows rows, so the parsed text of the whole file is never held in memory.
+
+        :param filename: Weather file path
+        :param n_header_rows: Number of rows before the numeric data
+        :param data_file: (optional) ``.npy`` file the data are written to block by block instead of to memory
+
+        :returns: Parsed weather file
+        """
+        import pandas as pd
+
+        with open(filename, newline='') as f:
+            reader = csv.reader(f)
+            header_rows = [next(reader) for _ in range(n_header_rows)]
+
+        def read_chunks():
+            return pd.read_csv(filename, skiprows=n_header_rows, header=None, dtype=float, skip_blank_lines=True,
+                               chunksize=self.chunk_rows)
+
+        # first pass finds the size and the non-empty columns, second pass fills the array
+        n_rows = 0
+        not_empty = None
+        for chunk in read_chunks():
+            n_rows += len(chunk)
+            chunk_not_empty = chunk.notna().any().to_numpy()
+            not_empty = chunk_not_empty if not_empty is None else not_empty | chunk_not_empty
+        columns = [int(c) for c in np.flatnonzero(not_empty)] if not_empty is not None else []
+
+        shape = (n_rows, len(columns))
+        if data_file is not None:
+            data = np.lib.format.open_memmap(data_file, mode='w+', dtype=float, shape=shape)
+        else:
+            data = np.empty(shape)
+        row = 0
+        for chunk in read_chunks():
+            data[row:row + len(chunk)] = chunk.to_numpy(dtype=float)[:, columns]
+            row += len(chunk)
+        if data_file is not None:
+            data.flush()
+        return ResourceTable(header_rows, data, columns)
+
+    def _load_binary(self, key: str) -> Optional[ResourceTable]:
+        if self.cache_dir is None:
+            return None
+        data_file = os.path.join(self.cache_dir, key + '.npy')
+        header_file = os.path.join(self.cache_dir, key + '.json')
+        if not (os.path.isfile(data_file) and os.path.isfile(header_file)):
+            return None
+        try:
+            with open(header_file, 'r') as f:
+                header = json.load(f)
+            data = np.load(data_file, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        return ResourceTable(header['header_rows'], data, header['columns'])
+
+    def _parse_to_binary(self, filename: str, n_header_rows: int, key: str) -> ResourceTable:
+        if self.cache_dir is None:
+            return self.parse_file(filename, n_header_rows)
+        # write to temporary files first so concurrent processes never load a partially written entry
+        suffix = '.{}.{}.tmp'.format(os.getpid(), threading.get_ident())
+        data_file = os.path.join(self.cache_dir, key + '.npy')
+        header_file = os.path.join(self.cache_dir, key + '.json')
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            table = self.parse_file(filename, n_header_rows, data_file + suffix)
+            header_rows, columns = table.header_rows, table.columns
+            del table
+            with open(header_file + suffix, 'w') as f:
+                json.dump({'header_rows': header_rows, 'columns': columns}, f)
+            os.replace(data_file + suffix, data_file)
+            os.replace(header_file + suffix, header_file)
+            return ResourceTable(header_rows, np.load(data_file, mmap_mode='r'), columns)
+        except OSError:
+            # the store cannot be written, parse in memory
+            for tmp_file in (data_file + suffix, header_file + suffix):
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+            return self.parse_file(filename, n_header_rows)
+
+    def solar_data(self, filename: str) -> dict:
+        """
+        Gets an NSRDB format csv file as 'solar_resource_data' dictionary for use in PySAM, equivalent to
+        PySAM.ResourceTools.SAM_CSV_to_solar_data.
+
+        :param filename: Solar resource file path
+
+        :returns: Solar resource data dictionary
+        """
+        table = self.load_table(filename, 3)
+        info = table.metadata()
+        if "Time Zone" not in info:
+            raise ValueError("`Time Zone` field not found in solar resource file.")
+
+        weather = dict()
+        weather['tz'] = float(info['Time Zone'])
+        weather['elev'] = float(info['Elevation'])
+        weather['lat'] = float(info['Latitude'])
+        weather['lon'] = float(info['Longitude'])
+
+        wfd = {name: i for i, name in enumerate(table.column_names) if len(name) > 0}
+        # keys passed to SAM and the possible key versions found in resource files (NREL / NASA POWER)
+        acceptable_keys = {
+            'year': ['year', 'Year', 'yr'],
+            'month': ['month', 'Month', 'mo'],
+            'day': ['day', 'Day'],
+            'hour': ['hour', 'Hour', 'hr'],
+            'minute': ['minute', 'Minute', 'min'],
+            'dn': ['dn', 'DNI', 'dni', 'beam', 'direct normal', 'direct normal irradiance'],
+            'df': ['df', 'DHI', 'dhi', 'diffuse', 'diffuse horizontal', 'diffuse horizontal irradiance'],
+            'gh': ['gh', 'GHI', 'ghi', 'global', 'global horizontal', 'global horizontal irradiance'],
+            'wspd': ['wspd', 'Wind Speed', 'wind speed'],
+            'tdry': ['tdry', 'Temperature', 'dry bulb', 'dry bulb temp', 'temperature', 'ambient', 'ambient temp'],
+            'wdir': ['wdir', 'Wind Direction', 'wind direction'],
+            'pres': ['pres', 'Pressure', 'pressure'],
+            'tdew': ['tdew', 'Dew Point', 'Tdew', 'dew point', 'dew point temperature'],
+            'rhum': ['rhum', 'Relative Humidity', 'rh', 'RH', 'relative humidity', 'humidity'],
+            'alb': ['alb', 'Surface Albedo', 'albedo', 'surface albedo'],
+            'snow': ['snow', 'Snow Depth', 'snow depth', 'snow cover']
+        }
+        for key, list_of_keys in acceptable_keys.items():
+            for good_key in list_of_keys:
+                if good_key in wfd.keys():
+                    weather[key] = table.data[:, wfd.pop(good_key)].tolist()
+                    break
+
+        # averaged hourly data with no minute column provided by NASA POWER, remove 2/29 data for leap years
+        if info.get('Source') == 'NASA/POWER':
+            weather['minute'] = [30] * len(weather['hour'])
+            if len(weather['hour']) == 8784:
+                for key in weather.keys():
+                    if key not in ['tz', 'elev', 'lat', 'lon']:
+                        del weather[key][1416:1440]
+        return weather
+
+    def wind_data(self, filename: Union[str, Sequence[str]]) -> dict:
+        """
+        Gets an SRW file as 'wind_resource_data' dictionary for use in PySAM, equivalent to
+        PySAM.ResourceTools.SRW_to_wind_data. Several files, e.g. of the heights bracketing a hub height, are
+        combined column-wise, equivalent to reading the file written by WindResource.combine_wind_files.
+
+        :param filename: Wind resource file path, or list of file paths with the same time steps
+
+        :returns: Wind resource data dictionary
+        """
+        filenames = [filename] if isinstance(filename, (str, os.PathLike)) else list(filename)
+        tables = [self.load_table(f, 5) for f in filenames]
+        source = ','.join(tables[0].header_rows[1]).strip()
+
+        if source == 'NASA/POWER':
+            field_names = ('temperature', 'pres', 'speed', 'direction')
+        else:
+            field_names = ('temperature', 'pressure', 'speed', 'direction')
+        data_dict = {'heights': [], 'fields': []}
+        for table in tables:
+            fields = [i for i in table.header_rows[2] if i]
+            heights = [i for i in table.header_rows[4] if i]
+            data_dict['heights'] += [float(i) for i in heights]
+            for field_name in fields:
+                if field_name.lower() not in field_names:
+                    raise ValueError(field_name.lower() + " required for wind data")
+                data_dict['fields'].append(field_names.index(field_name.lower()) + 1)
+
+        if len(tables) == 1:
+            data = tables[0].data
+        else:
+            if len(set(len(table.data) for table in tables)) > 1:
+                raise ValueError("Wind resource files {} have different numbers of time steps".format(filenames))
+            data = np.hstack([table.data for table in tables])
+        data_dict['data'] = data.tolist()
+        return data_dict
+
+
+resource_store = ResourceStore(user_cache_dir('resource_store'))
@@ -0,0 +1,110 @@
+import hashlib
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+
+def schedule_window(values: Sequence, start: int, n: int) -> np.ndarray:
+    """
+    Gets n values of a schedule from a start index, wrapping around to the start of the schedule at its end.
+
+    :param values: Schedule values
+    :param start: Index of the first value
+    :param n: Number of values
+
+    :returns: View of the schedule array if the window does not wrap around, otherwise a copy
+    """
+    values = np.asarray(values, dtype=float)
+    if start + n <= len(values):
+        return values[start:start + n]
+    return values[np.arange(start, start + n) % len(values)]
+
+
+class ScheduleStore:
+    """
+    Parse-once store of single column time series schedules, such as electricity price multipliers (dispatch factors)
+    and desired load schedules. Each file is parsed once per process into a float array. Entries are keyed by the
+    hash of the file contents, so edited files are parsed again and identical files are parsed only once. Resampled
+    schedules are kept per time step count.
+
+    Arrays handed out by the store are shared and therefore read-only.
+    """
+    def __init__(self):
+        self._content_keys = {}
+        self._schedules = {}
+
+    def content_key(self, filename: str) -> str:
+        """Gets the store key of a file, a hash of the file contents."""
+        path = os.path.abspath(filename)
+        stat = os.stat(path)
+        file_id = (path, stat.st_mtime_ns, stat.st_size)
+        if file_id not in self._content_keys:
+            with open(path, 'rb') as f:
+                self._content_keys[file_id] = hashlib.sha256(f.read()).hexdigest()
+        return self._content_keys[file_id]
+
+    def load(self, filename: str, n_timesteps: Optional[int] = None) -> np.ndarray:
+        """
+        Gets the values of a schedule file, parsing the file only if it is not in the store.
+
+        :param filename: Schedule file path, one value per row with an optional header row
+        :param n_timesteps: (optional) Number of time steps to resample the schedule to, see :meth:`resample`
+
+        :returns: Read-only float array of the schedule
+        """
+        if not os.path.isfile(filename):
+            raise FileNotFoundError(str(filename) + " does not exist.")
+        key = self.content_key(filename)
+        if (key, None) not in self._schedules:
+            self._schedules[(key, None)] = self._read_only(self.parse_file(filename))
+        values = self._schedules[(key, None)]
+        if n_timesteps is None or n_timesteps == len(values):
+            return values
+        if (key, n_timesteps) not in self._schedules:
+            self._schedules[(key, n_timesteps)] = self._read_only(self.resample(values, n_timesteps))
+        return self._schedules[(key, n_timesteps)]
+
+    @staticmethod
+    def parse_file(filename: str) -> np.ndarray:
+        """
+        Parses a schedule file of one value per row, with an optional header row.
+
+        :param filename: Schedule file path
+
+        :returns: Float array of the schedule
+        """
+        try:
+            values = np.loadtxt(filename, dtype=float, ndmin=1)
+        except ValueError:
+            values = np.loadtxt(filename, dtype=float, ndmin=1, skiprows=1)
+        return values.ravel()
+
+    @staticmethod
+    def resample(values: Sequence, n_timesteps: int) -> np.ndarray:
+        """
+        Resamples a schedule to a number of time steps which is a multiple or a divisor of its length. Values are
+        repeated for finer time steps and averaged for coarser time steps.
+
+        :param values: Schedule values
+        :param n_timesteps: Number of time steps
+
+        :returns: Float array of n_timesteps values
+        """
+        values = np.asarray(values, dtype=float)
+        n_values = len(values)
+        if n_timesteps == n_values:
+            return values.copy()
+        if n_values > 0 and n_timesteps % n_values == 0:
+            return np.repeat(values, n_timesteps // n_values)
+        if n_timesteps > 0 and n_values % n_timesteps == 0:
+            return values.reshape(n_timesteps, -1).mean(axis=1)
+        raise ValueError("Schedule of {} values cannot be resampled to {} time steps".format(n_values, n_timesteps))
+
+    @staticmethod
+    def _read_only(values: np.ndarray) -> np.ndarray:
+        values.flags.writeable = False
+        return values
+
+
+schedule_store = ScheduleStore()
@@ -1,11 +1,9 @@
-import csv
-from collections import defaultdict
 import numpy as np
-from PySAM.ResourceTools import SAM_CSV_to_solar_data
 
 from hybrid.keys import get_developer_nrel_gov_key
 from hybrid.log import hybrid_logger as logger
 from hybrid.resource.resource import *
+from hybrid.resource.resource_store import resource_store
 
 
 class SolarResource(Resource):
@@ -42,23 +40,31 @@ class SolarResource(Resource):
                                         year) + ".csv")
         self.filename = filepath
 
+        if not os.path.isfile(self.filename) and self.resource_catalog is not None:
+            nearest_file = self.resource_catalog.nearest('solar', lat, lon, year, self.catalog_tolerance_km,
+                                                         interval=int(self.interval))
+            if nearest_file is not None:
+                self.filename = nearest_file
+
         self.check_download_dir()   # FIXME: This breaks if weather file is in the same directory as caller
 
         if not os.path.isfile(self.filename):
             self.download_resource()
+            if self.resource_catalog is not None and os.path.isfile(self.filename):
+                self.resource_catalog.add(self.filename, 'solar', lat, lon, year, int(self.interval))
 
         self.format_data()
 
         logger.info("SolarResource: {}".format(self.filename))
 
     def download_resource(self):
-        url = 'https://developer.nrel.gov/api/nsrdb/v2/solar/psm3-download.csv?wkt=POINT({lon}+{lat})&names={year}&leap_day={leap}&interval={interval}&utc={utc}&full_name={name}&email={email}&affiliation={affiliation}&mailing_list={mailing_list}&reason={reason}&api_key={api}&attributes={attr}'.format(
+        url = '{host}/api/nsrdb/v2/solar/psm3-download.csv?wkt=POINT({lon}+{lat})&names={year}&leap_day={leap}&interval={interval}&utc={utc}&full_name={name}&email={email}&affiliation={affiliation}&mailing_list={mailing_list}&reason={reason}&api_key={api}&attributes={attr}'.format(
             year=self.year, lat=self.latitude, lon=self.longitude, leap=self.leap_year, interval=self.interval,
             utc=self.utc, name=self.name, email=self.email,
             mailing_list=self.mailing_list, affiliation=self.affiliation, reason=self.reason, api=get_developer_nrel_gov_key(),
-            attr=self.solar_attributes)
+            attr=self.solar_attributes, host=self.api_host)
 
-        success = self.call_api(url, filename=self.filename)
+        success = self.call_api(url, filename=self.filename, rate_limiter=self.rate_limiter)
 
         return success
 
@@ -92,24 +98,17 @@ class SolarResource(Resource):
         :key tdew: array, dew point temp [C]
         :key press: array, atmospheric pressure [mbar]
         """
-        self._data = SAM_CSV_to_solar_data(data_dict)
+        # File is parsed once into the resource store and shared with other users of the same file
+        self._data = resource_store.solar_data(data_dict)
         # TODO: Update ResourceTools.py in pySAM to include pressure and dew point or relative humidity
-        with open(data_dict) as file_in:
-            wfd = defaultdict(list)
-            for i in range(2):
-                file_in.readline()
-            reader = csv.DictReader(file_in)
-            for row in reader:
-                for col, dat in row.items():
-                    if len(col) > 0:
-                        wfd[col].append(float(dat))
-
-        if 'Dew Point' in wfd:
-            self._data['tdew'] = wfd.pop('Dew Point')
-        elif 'RH' in wfd:
-            self._data['rh'] = wfd.pop('RH')
-        elif 'Pressure' in wfd:
-            self._data['pres'] = wfd.pop('Pressure')
+        table = resource_store.load_table(data_dict, 3)
+        names = table.column_names
+        if 'Dew Point' in names:
+            self._data['tdew'] = table.column('Dew Point').tolist()
+        elif 'RH' in names:
+            self._data['rh'] = table.column('RH').tolist()
+        elif 'Pressure' in names:
+            self._data['pres'] = table.column('Pressure').tolist()
 
 
     def roll_timezone(self, roll_hours, timezone):
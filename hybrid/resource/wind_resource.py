@@ -1,11 +1,12 @@
 import csv
+import threading
 from collections import defaultdict
 import numpy as np
-from PySAM.ResourceTools import SRW_to_wind_data
 
 from hybrid.keys import get_developer_nrel_gov_key
 from hybrid.log import hybrid_logger as logger
 from hybrid.resource.resource import *
+from hybrid.resource.resource_store import resource_store
 
 
 class WindResource(Resource):
@@ -28,8 +29,10 @@ class WindResource(Resource):
         :param year: int
         :param wind_turbine_hub_ht: int
         :param path_resource: directory where to save downloaded files
-        :param filepath: file path of resource file to load
-        :param kwargs:
+        :param filepath: file path of resource file to load. If the file does not exist, the heights bracketing the
+            hub height are downloaded and combined into it unless write_combined_file=False is given
+        :param kwargs: write_combined_file: if True, the heights bracketing the hub height are combined into a new
+            file. Defaults to True if filepath is given, otherwise they are combined in memory
         """
         super().__init__(lat, lon, year)
 
@@ -38,6 +41,9 @@ class WindResource(Resource):
 
         self.path_resource = os.path.join(self.path_resource, 'wind')
 
+        # if False, data of the heights bracketing the hub height are combined in memory instead of in a new file
+        self.write_combined_file = filepath != ""
+
         self.__dict__.update(kwargs)
 
         self.file_resource_heights = None
@@ -49,10 +55,33 @@ class WindResource(Resource):
         else:
             self.filename = filepath
 
+        if not os.path.isfile(self.filename) and self.resource_catalog is not None:
+            nearest_file = self.resource_catalog.nearest('wind', lat, lon, year, self.catalog_tolerance_km,
+                                                         interval=int(self.interval),
+                                                         hub_height=self.hub_height_meters)
+            if nearest_file is not None:
+                self.filename = nearest_file
+            else:
+                for height, f in self.file_resource_heights.items():
+                    if os.path.isfile(f):
+                        continue
+                    nearest_file = self.resource_catalog.nearest('wind', lat, lon, year, self.catalog_tolerance_km,
+                                                                 interval=int(self.interval), hub_height=height,
+                                                                 single_height=True)
+                    if nearest_file is not None:
+                        self.file_resource_heights[height] = nearest_file
+
         self.check_download_dir()
 
         if not os.path.isfile(self.filename):
             self.download_resource()
+            if self.resource_catalog is not None:
+                for height, f in self.file_resource_heights.items():
+                    if os.path.isfile(f):
+                        self.resource_catalog.add(f, 'wind', lat, lon, year, int(self.interval), [height])
+                if os.path.isfile(self.filename):
+                    self.resource_catalog.add(self.filename, 'wind', lat, lon, year, int(self.interval),
+                                              list(self.file_resource_heights.keys()))
 
         self.format_data()
 
@@ -99,16 +128,20 @@ class WindResource(Resource):
         if not success:
 
             for height, f in self.file_resource_heights.items():
-                url = 'https://developer.nrel.gov/api/wind-toolkit/v2/wind/wtk-srw-download?year={year}&lat={lat}&lon={lon}&hubheight={hubheight}&api_key={api_key}&email={email}'.format(
-                    year=self.year, lat=self.latitude, lon=self.longitude, hubheight=height, api_key=get_developer_nrel_gov_key(), email=self.email)
+                if os.path.isfile(f):
+                    success = True
+                    continue
+                url = '{host}/api/wind-toolkit/v2/wind/wtk-srw-download?year={year}&lat={lat}&lon={lon}&hubheight={hubheight}&api_key={api_key}&email={email}'.format(
+                    year=self.year, lat=self.latitude, lon=self.longitude, hubheight=height, api_key=get_developer_nrel_gov_key(), email=self.email,
+                    host=self.api_host)
 
-                success = self.call_api(url, filename=f)
+                success = self.call_api(url, filename=f, rate_limiter=self.rate_limiter)
 
             if not success:
                 raise ValueError('Unable to download wind data')
 
-        # combine into one file to pass to SAM
-        if len(list(self.file_resource_heights.keys())) > 1:
+        # combine into one file to pass to SAM, otherwise the files are combined in memory by format_data
+        if len(list(self.file_resource_heights.keys())) > 1 and self.write_combined_file:
             success = self.combine_wind_files()
 
             if not success:
@@ -142,25 +175,33 @@ class WindResource(Resource):
                                 data[line] += row
                         line += 1
 
-        with open(self.filename, 'w', newline='') as fo:
+        tmp_filename = "{}.{}.{}.tmp".format(self.filename, os.getpid(), threading.get_ident())
+        with open(tmp_filename, 'w', newline='') as fo:
             writer = csv.writer(fo)
             writer.writerows(data)
+        os.replace(tmp_filename, self.filename)
 
         return os.path.isfile(self.filename)
 
     def format_data(self):
         """
-        Format as 'wind_resource_data' dictionary for use in PySAM.
+        Format as 'wind_resource_data' dictionary for use in PySAM. Without a combined file, the files of the heights
+        bracketing the hub height are combined in memory.
         """
-        if not os.path.isfile(self.filename):
+        if os.path.isfile(self.filename):
+            self.data = self.filename
+        elif self.file_resource_heights is not None and \
+                all(os.path.isfile(f) for f in self.file_resource_heights.values()):
+            self.data = list(self.file_resource_heights.values())
+        else:
             raise FileNotFoundError(f"{self.filename} does not exist. Try `download_resource` first.")
 
-        self.data = self.filename
-
     @Resource.data.setter
     def data(self, data_file):
         """
         Sets the wind resource data to a dictionary in SAM Wind format (see Pysam.ResourceTools.SRW_to_wind_data)
+
+        :param data_file: SRW file path, or list of SRW file paths whose heights are combined
         """
 
-        self._data = SRW_to_wind_data(data_file)
+        self._data = resource_store.wind_data(data_file)
@@ -3,3 +3,4 @@ from .flatirons_site import flatirons_site
 from .irregular_site import make_irregular_site
 from .locations import locations
 from .site_info import SiteInfo
+from .shared_site_info import SharedSiteInfo
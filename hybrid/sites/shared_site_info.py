@@ -0,0 +1,184 @@
+import pickle
+from multiprocessing import shared_memory
+
+import numpy as np
+from shapely import wkb
+
+from hybrid.resource import SolarResource, WindResource, ElectricityPrices
+from hybrid.sites.site_info import SiteInfo
+
+
+class SharedSiteInfo:
+    """
+    Handle to a SiteInfo whose resource arrays and site geometry are published in one block of OS shared memory.
+
+    The handle is small and picklable, so it can be passed to worker processes, which attach to the shared arrays
+    read-only instead of reloading resource files. The publishing process owns the shared memory and should call
+    :py:func:`unlink` once all workers are done, e.g. by using the handle as a context manager::
+
+        with SharedSiteInfo.publish(site) as shared_site:
+            with multiprocessing.Pool(16) as p:
+                p.map(run_case, [(shared_site, case) for case in cases])
+
+        def run_case(args):
+            shared_site, case = args
+            site = shared_site.attach()
+            ...
+
+    Resource data dictionaries of attached sites hold read-only NumPy arrays, which are converted to lists only when
+    passed to PySAM (see :py:func:`hybrid.resource.to_pysam_resource_data`).
+    """
+    _resource_types = {'solar_resource': SolarResource,
+                       'wind_resource': WindResource,
+                       'elec_prices': ElectricityPrices}
+    _geometry_attributes = ('polygon', 'vertices')
+
+    def __init__(self, shm_name: str, arrays: dict, site_attributes: bytes, resources: dict):
+        """
+        Use :py:func:`publish` to create a shared site.
+
+        :param shm_name: Name of the shared memory block
+        :param arrays: {name: (dtype, shape, offset)} of the arrays stored in the shared memory block
+        :param site_attributes: Pickled SiteInfo attributes which are not stored in shared memory
+        :param resources: {attribute: (resource attributes, array data keys, scalar data)} of the site resources
+        """
+        self.shm_name = shm_name
+        self.arrays = arrays
+        self.site_attributes = site_attributes
+        self.resources = resources
+        self._shm = None
+
+    @classmethod
+    def publish(cls, site: SiteInfo) -> 'SharedSiteInfo':
+        """
+        Loads the resources of a site and copies their arrays and the site geometry into a new shared memory block.
+
+        :param site: Site to publish
+
+        :returns: Handle of the shared site
+        """
+        site.preload()
+        arrays = {}
+        resources = {}
+        for attr in cls._resource_types.keys():
+            resource = getattr(site, '_' + attr)
+            if resource is None:
+                continue
+            resource_attributes = {k: v for k, v in vars(resource).items() if k != '_data'}
+            data = resource._data
+            if isinstance(data, dict):
+                array_keys = [k for k, v in data.items() if isinstance(v, (list, tuple, np.ndarray))]
+                scalars = {k: v for k, v in data.items() if k not in array_keys}
+                if attr == 'wind_resource':
+                    # heights and fields describe the columns of the data matrix
+                    array_keys = ['data']
+                    scalars = {k: v for k, v in data.items() if k != 'data'}
+                    arrays[attr + '.data'] = np.asarray(data['data'], dtype=float)
+                else:
+                    arrays[attr] = np.array([data[k] for k in array_keys], dtype=float)
+            else:
+                array_keys = None
+                scalars = {}
+                arrays[attr] = np.asarray(data, dtype=float)
+            resources[attr] = (resource_attributes, array_keys, scalars)
+
+        if getattr(site, 'polygon', None) is not None:
+            arrays['polygon'] = np.frombuffer(wkb.dumps(site.polygon), dtype=np.uint8)
+        if getattr(site, 'vertices', None) is not None:
+            arrays['vertices'] = np.asarray(site.vertices, dtype=float)
+
+        site_attributes = {k: v for k, v in vars(site).items()
+                           if k.lstrip('_') not in cls._resource_types and k not in cls._geometry_attributes}
+
+        layout = {}
+        offset = 0
+        for name, array in arrays.items():
+            offset = (offset + 7) // 8 * 8      # 8-byte alignment
+            layout[name] = (array.dtype.str, array.shape, offset)
+            offset += array.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for name, array in arrays.items():
+            dtype, shape, start = layout[name]
+            np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=start)[...] = array
+
+        try:
+            pickled_attributes = pickle.dumps(site_attributes)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # KML documents that cannot be pickled are read again from the KML file when attaching
+            site_attributes.pop('kml_data', None)
+            pickled_attributes = pickle.dumps(site_attributes)
+
+        shared_site = cls(shm.name, layout, pickled_attributes, resources)
+        shared_site._shm = shm
+        return shared_site
+
+    def attach(self) -> SiteInfo:
+        """
+        Creates a SiteInfo whose resource arrays are read-only views of the shared memory block.
+
+        :returns: Site using the shared resource data
+        """
+        if self._shm is None:
+            try:
+                self._shm = shared_memory.SharedMemory(name=self.shm_name, track=False)
+            except TypeError:
+                # Python < 3.13, workers share the resource tracker of the publishing process
+                self._shm = shared_memory.SharedMemory(name=self.shm_name)
+
+        site = SiteInfo.__new__(SiteInfo)
+        vars(site).update(pickle.loads(self.site_attributes))
+        for attr in self._resource_types.keys():
+            setattr(site, attr, None)
+
+        for attr, (resource_attributes, array_keys, scalars) in self.resources.items():
+            resource = self._resource_types[attr].__new__(self._resource_types[attr])
+            vars(resource).update(resource_attributes)
+            if attr == 'wind_resource':
+                data = dict(scalars)
+                data['data'] = self._get_array(attr + '.data')
+            elif array_keys is None:
+                data = self._get_array(attr)
+            else:
+                values = self._get_array(attr)
+                data = dict(scalars)
+                data.update({k: values[i] for i, k in enumerate(array_keys)})
+            resource._data = data
+            setattr(site, attr, resource)
+
+        if 'polygon' in self.arrays:
+            site.polygon = wkb.loads(bytes(self._get_array('polygon')))
+        if 'vertices' in self.arrays:
+            site.vertices = self._get_array('vertices')
+        if 'kml_file' in site.data and not hasattr(site, 'kml_data'):
+            site.kml_data = site.kml_read(site.data['kml_file'])[0]
+        return site
+
+    def _get_array(self, name: str) -> np.ndarray:
+        dtype, shape, offset = self.arrays[name]
+        array = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
+        array.flags.writeable = False
+        return array
+
+    def close(self):
+        """Closes this process' access to the shared memory block"""
+        if self._shm is not None:
+            self._shm.close()
+            self._shm = None
+
+    def unlink(self):
+        """Closes and frees the shared memory block, only to be called by the publishing process"""
+        shm = self._shm if self._shm is not None else shared_memory.SharedMemory(name=self.shm_name)
+        self._shm = None
+        shm.close()
+        shm.unlink()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_shm'] = None
+        return state
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.unlink()
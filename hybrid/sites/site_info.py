@@ -1,23 +1,23 @@
-import matplotlib.pyplot as plt
+import os
+import numpy as np
 from shapely.geometry import *
 from shapely.geometry.base import *
 from shapely.validation import make_valid
-from fastkml import kml
 from shapely.ops import transform
-import pyproj
-import utm
 
 from hybrid.resource import (
     SolarResource,
     WindResource,
-    ElectricityPrices
+    ElectricityPrices,
+    schedule_store
     )
-from hybrid.layout.plot_tools import plot_shape
 from hybrid.log import hybrid_logger as logger
 from hybrid.keys import set_nrel_key_dot_env
 
 
 def plot_site(verts, plt_style, labels):
+    import matplotlib.pyplot as plt
+
     for i in range(len(verts)):
         if i == 0:
             plt.plot([verts[0][0], verts[len(verts) - 1][0]], [verts[0][1], verts[len(verts) - 1][1]],
@@ -62,7 +62,7 @@ class SiteInfo:
         `Link Utility Rate DataBase <https://openei.org/wiki/Utility_Rate_Database>`_ label for REopt runs
     capacity_hours : list
         Boolean list where ``True`` if the hour counts for capacity payments, ``False`` otherwise
-    desired_schedule : list
+    desired_schedule : np.ndarray
         Absolute desired load profile [MWe]
     follow_desired_schedule : boolean
         ``True`` if a desired schedule was provided, ``False`` otherwise
@@ -102,7 +102,8 @@ class SiteInfo:
         :param grid_resource_file: string, location (path) and filename of grid pricing data 
         :param hub_height: int (default = 97), turbine hub height for resource download [m]
         :param capacity_hours: list of booleans, (8760 length) ``True`` if the hour counts for capacity payments, ``False`` otherwise
-        :param desired_schedule: list of floats, (8760 length) absolute desired load profile [MWe]
+        :param desired_schedule: list of floats, (8760 length) absolute desired load profile [MWe], or filepath of a
+            single column schedule file, which is resampled to the simulation time step
         """
         set_nrel_key_dot_env()
         self.data = data
@@ -117,53 +118,144 @@ class SiteInfo:
             raise ValueError("SiteInfo requires lat and lon")
         self.lat = data['lat']
         self.lon = data['lon']
-        self.n_timesteps = None
         if 'year' not in data:
             data['year'] = 2012
-        
         if 'no_solar' not in data:
             data['no_solar'] = False
-
-        if not data['no_solar']:
-            self.solar_resource = SolarResource(data['lat'], data['lon'], data['year'], filepath=solar_resource_file)
-            self.n_timesteps = len(self.solar_resource.data['gh']) // 8760 * 8760
-
         if 'no_wind' not in data:
             data['no_wind'] = False
 
-        if not data['no_wind']:
-            # TODO: allow hub height to be used as an optimization variable
-            self.wind_resource = WindResource(data['lat'], data['lon'], data['year'], wind_turbine_hub_ht=hub_height,
-                                            filepath=wind_resource_file)
-            n_timesteps = len(self.wind_resource.data['data']) // 8760 * 8760
-            if self.n_timesteps is None:
-                self.n_timesteps = n_timesteps
-            elif self.n_timesteps != n_timesteps:
-                raise ValueError(f"Wind resource timesteps of {n_timesteps} different than other resource timesteps of {self.n_timesteps}")
-
-        self.elec_prices = ElectricityPrices(data['lat'], data['lon'], data['year'], filepath=grid_resource_file)
-        self.n_periods_per_day = self.n_timesteps // 365  # TODO: Does not handle leap years well
-        self.interval = int((60*24)/self.n_periods_per_day)
-        self.urdb_label = data['urdb_label'] if 'urdb_label' in data.keys() else None
+        # resources are loaded on first access, or all at once by preload
+        self.solar_resource_file = solar_resource_file
+        self.wind_resource_file = wind_resource_file
+        self.grid_resource_file = grid_resource_file
+        # TODO: allow hub height to be used as an optimization variable
+        self.hub_height = hub_height
+        self._solar_resource = None
+        self._wind_resource = None
+        self._elec_prices = None
+        self._n_timesteps = None
 
-        if len(capacity_hours) == self.n_timesteps:
-            self.capacity_hours = capacity_hours
-        else:
-            self.capacity_hours = [False] * self.n_timesteps
+        self.urdb_label = data['urdb_label'] if 'urdb_label' in data.keys() else None
+        self._capacity_hours = capacity_hours
 
         # Desired load schedule for the system to dispatch against
-        self.desired_schedule = desired_schedule
-        self.follow_desired_schedule = len(desired_schedule) == self.n_timesteps
+        if isinstance(desired_schedule, (str, os.PathLike)):
+            desired_schedule = schedule_store.load(desired_schedule, self.n_timesteps)
+        self.desired_schedule = np.asarray(desired_schedule, dtype=float)
         if len(desired_schedule) > 0 and len(desired_schedule) != self.n_timesteps:
             raise ValueError('The provided desired schedule does not match length of the simulation horizon.')
 
-            # FIXME: this a hack
-        if 'no_wind' in data:
-            logger.info("Set up SiteInfo with solar resource files: {}".format(self.solar_resource.filename))
-        else:
-            logger.info(
-                "Set up SiteInfo with solar and wind resource files: {}, {}".format(self.solar_resource.filename,
-                                                                                    self.wind_resource.filename))
+        logger.info("Set up SiteInfo at lat {}, lon {}".format(self.lat, self.lon))
+
+    @property
+    def solar_resource(self) -> SolarResource:
+        """Solar resource, loaded on first access"""
+        if self._solar_resource is None:
+            if self.data['no_solar']:
+                raise AttributeError("SiteInfo has no solar resource, 'no_solar' is set")
+            self._solar_resource = SolarResource(self.data['lat'], self.data['lon'], self.data['year'],
+                                                 filepath=self.solar_resource_file)
+            logger.info("SiteInfo loaded solar resource file: {}".format(self._solar_resource.filename))
+        return self._solar_resource
+
+    @solar_resource.setter
+    def solar_resource(self, resource: SolarResource):
+        self._solar_resource = resource
+
+    @property
+    def wind_resource(self) -> WindResource:
+        """Wind resource, loaded on first access"""
+        if self._wind_resource is None:
+            if self.data['no_wind']:
+                raise AttributeError("SiteInfo has no wind resource, 'no_wind' is set")
+            self._wind_resource = WindResource(self.data['lat'], self.data['lon'], self.data['year'],
+                                               wind_turbine_hub_ht=self.hub_height, filepath=self.wind_resource_file)
+            logger.info("SiteInfo loaded wind resource file: {}".format(self._wind_resource.filename))
+        return self._wind_resource
+
+    @wind_resource.setter
+    def wind_resource(self, resource: WindResource):
+        self._wind_resource = resource
+
+    @property
+    def elec_prices(self) -> ElectricityPrices:
+        """Electricity prices, loaded on first access"""
+        if self._elec_prices is None:
+            self._elec_prices = ElectricityPrices(self.data['lat'], self.data['lon'], self.data['year'],
+                                                  filepath=self.grid_resource_file)
+        return self._elec_prices
+
+    @elec_prices.setter
+    def elec_prices(self, prices: ElectricityPrices):
+        self._elec_prices = prices
+
+    @property
+    def n_timesteps(self) -> int:
+        """Number of timesteps in resource data, loads the solar and wind resources on first access"""
+        if self._n_timesteps is None:
+            n_timesteps = None
+            if not self.data['no_solar']:
+                n_timesteps = len(self.solar_resource.data['gh']) // 8760 * 8760
+            if not self.data['no_wind']:
+                n_wind_timesteps = len(self.wind_resource.data['data']) // 8760 * 8760
+                if n_timesteps is None:
+                    n_timesteps = n_wind_timesteps
+                elif n_timesteps != n_wind_timesteps:
+                    raise ValueError(f"Wind resource timesteps of {n_wind_timesteps} different than other resource timesteps of {n_timesteps}")
+            self._n_timesteps = n_timesteps
+        return self._n_timesteps
+
+    @property
+    def n_periods_per_day(self) -> int:
+        return self.n_timesteps // 365  # TODO: Does not handle leap years well
+
+    @property
+    def interval(self) -> int:
+        return int((60*24)/self.n_periods_per_day)
+
+    @property
+    def capacity_hours(self) -> list:
+        if len(self._capacity_hours) != self.n_timesteps:
+            self._capacity_hours = [False] * self.n_timesteps
+        return self._capacity_hours
+
+    @capacity_hours.setter
+    def capacity_hours(self, capacity_hours: list):
+        self._capacity_hours = capacity_hours
+
+    @property
+    def follow_desired_schedule(self) -> bool:
+        return len(self.desired_schedule) == self.n_timesteps
+
+    def set_resource_year(self, year: int, solar_resource_file="", wind_resource_file=""):
+        """
+        Changes the weather year of the site. The solar and wind resources of the year are loaded on next access.
+
+        :param year: Resource year
+        :param solar_resource_file: (optional) Solar resource file of the year, downloaded from NSRDB if not provided
+        :param wind_resource_file: (optional) Wind resource file of the year, downloaded from wind-toolkit if not provided
+        """
+        self.data['year'] = year
+        self.solar_resource_file = solar_resource_file
+        self.wind_resource_file = wind_resource_file
+        self._solar_resource = None
+        self._wind_resource = None
+        self._n_timesteps = None
+
+    def preload(self) -> 'SiteInfo':
+        """
+        Loads all resources now instead of on first access, e.g. before a site is sent to worker processes.
+
+        :returns: This site
+        """
+        if not self.data['no_solar']:
+            self.solar_resource
+        if not self.data['no_wind']:
+            self.wind_resource
+        self.elec_prices
+        self.n_timesteps
+        return self
 
     # TODO: determine if the below functions are obsolete
 
@@ -198,6 +290,9 @@ class SiteInfo:
         min_plot_bound = site_center - reach
         max_plot_bound = site_center + reach
 
+        import matplotlib.pyplot as plt
+        from hybrid.layout.plot_tools import plot_shape
+
         if not figure and not axes:
             figure = plt.figure(1)
             axes = figure.add_subplot(111)
@@ -237,6 +332,10 @@ class SiteInfo:
 
     @staticmethod
     def kml_read(filepath):
+        from fastkml import kml
+        import pyproj
+        import utm
+
         k = kml.KML()
         with open(filepath) as kml_file:
             k.from_string(kml_file.read().encode("utf-8"))
@@ -269,6 +368,8 @@ class SiteInfo:
 
     @staticmethod
     def append_kml_data(kml_data, polygon, name):
+        from fastkml import kml
+
         folder = kml_data._features[0]._features[0]
         new_pm = kml.Placemark(name=name)
         new_pm.geometry = polygon
@@ -51,6 +51,8 @@ class TowerPlant(CspPlant):
                inputs.
             #. ``scale_input_params``: (optional, default = True) bool, If True, HOPP will run
                :py:func:`hybrid.tower_source.scale_params` before system simulation.
+            #. ``field_cache_dir``: (optional, default = None) str, Directory of the persistent cache of heliostat
+               field layouts and flux maps, caching is disabled if None.
         """
         financial_model = Singleowner.default('MSPTSingleOwner')
 
@@ -64,6 +66,10 @@ class TowerPlant(CspPlant):
 
         super().__init__("TowerPlant", 'tcsmolten_salt', site, financial_model, tower_config)
 
+        self.field_cache_dir = None
+        if 'field_cache_dir' in tower_config:
+            self.field_cache_dir = tower_config['field_cache_dir']
+
         self.optimize_field_before_sim = True
         if 'optimize_field_before_sim' in tower_config:
             self.optimize_field_before_sim = tower_config['optimize_field_before_sim']
@@ -172,16 +178,24 @@ class TowerPlant(CspPlant):
         # TODO: probably don't need hourly sf adjustment factors
         self.ssc.set({'is_dispatch_targets': False, 'rec_clearsky_model': 1, 'time_steps_per_hour': 1,
                       'sf_adjust:hourly': [0.0 for j in range(8760)]})
-        tech_outputs = self.ssc.execute()
+
+        cache_key = self.get_field_cache_key()
+        field_and_flux_maps = self.load_cache_entry(self.field_cache_dir, cache_key)
+        if field_and_flux_maps is None:
+            tech_outputs = self.ssc.execute()
+            eta_map = tech_outputs["eta_map_out"]
+            flux_maps = [r[2:] for r in tech_outputs['flux_maps_for_import']]  # don't include first two columns
+            A_sf_in = tech_outputs["A_sf"]
+            field_and_flux_maps = {'eta_map': eta_map, 'flux_maps': flux_maps, 'A_sf_in': A_sf_in}
+            for k in ['helio_positions', 'N_hel', 'D_rec', 'rec_height', 'h_tower', 'land_area_base']:
+                field_and_flux_maps[k] = tech_outputs[k]
+            if tech_outputs.get('cmod_success', 1):
+                self.store_cache_entry(self.field_cache_dir, cache_key, field_and_flux_maps)
+        else:
+            print('Loaded field layout and flux and eta maps from cache.')
         print('Finished creating field layout and simulating flux and eta maps. # Heliostats = %d, Tower height = %.1fm, Receiver height = %.2fm, Receiver diameter = %.2fm'%
-             (tech_outputs['N_hel'], tech_outputs['h_tower'], tech_outputs['rec_height'], tech_outputs['D_rec']))
+             (field_and_flux_maps['N_hel'], field_and_flux_maps['h_tower'], field_and_flux_maps['rec_height'], field_and_flux_maps['D_rec']))
         self.ssc.set(original_values)
-        eta_map = tech_outputs["eta_map_out"]
-        flux_maps = [r[2:] for r in tech_outputs['flux_maps_for_import']]  # don't include first two columns
-        A_sf_in = tech_outputs["A_sf"]
-        field_and_flux_maps = {'eta_map': eta_map, 'flux_maps': flux_maps, 'A_sf_in': A_sf_in}
-        for k in ['helio_positions', 'N_hel', 'D_rec', 'rec_height', 'h_tower', 'land_area_base']:
-            field_and_flux_maps[k] = tech_outputs[k]
 
         # Check if specified receiver dimensions make sense relative to heliostat dimensions
         if min(field_and_flux_maps['rec_height'], field_and_flux_maps['D_rec']) < max(self.ssc.get('helio_width'), self.ssc.get('helio_height')):
@@ -197,6 +211,19 @@ class TowerPlant(CspPlant):
 
         return field_and_flux_maps
 
+    # SSC inputs that do not affect field layout and flux map generation, i.e., simulation time, dispatch targets,
+    # plant state, and the layout and flux map inputs used by field_model_type = 3
+    _field_cache_excluded_inputs = CspPlant._ssc_cache_excluded_inputs + ['eta_map', 'flux_maps', 'A_sf_in',
+                                                                          'helio_positions', 'eta_map_aod_format']
+
+    def get_field_cache_key(self) -> str:
+        """
+        Gets the key of the current design in the field layout and flux map cache.
+
+        :returns: SHA-256 hex digest of the design inputs
+        """
+        return self.get_ssc_inputs_key(self._field_cache_excluded_inputs)
+
     def optimize_field_and_tower(self):
         """Optimizes heliostat field, tower height, and receiver geometry (diameter and height). This method uses
         SolarPILOT's internal optimization methods.
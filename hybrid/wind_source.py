@@ -4,6 +4,7 @@ import PySAM.Singleowner as Singleowner
 from hybrid.add_custom_modules.custom_wind_floris import Floris
 
 from hybrid.power_source import *
+from hybrid.resource import to_pysam_resource_data
 from hybrid.layout.wind_layout import WindLayout, WindBoundaryGridParameters
 from hybrid.dispatch.power_sources.wind_dispatch import WindDispatch
 
@@ -47,7 +48,7 @@ class WindPlant(PowerSource):
             financial_model = farm_config['fin_model']
 
         super().__init__("WindPlant", site, system_model, financial_model)
-        self._system_model.value("wind_resource_data", self.site.wind_resource.data)
+        self.update_resource()
 
         if 'layout_mode' not in farm_config.keys():
             layout_mode = 'grid'
@@ -78,6 +79,12 @@ class WindPlant(PowerSource):
         if 'rotor_diameter' in farm_config.keys():
             self.rotor_diameter = farm_config['rotor_diameter']
 
+    def update_resource(self):
+        """
+        Passes the site's current resource data to the system model
+        """
+        self._system_model.value("wind_resource_data", to_pysam_resource_data(self.site.wind_resource.data))
+
     @property
     def wake_model(self) -> str:
         try:
@@ -57,6 +57,28 @@ def test_custom_financial():
     assert npv == approx(7412807, 1e-3)
 
 
+def test_value_index(site):
+    fin_model = CustomFinancialModel(default_fin_config)
+    assert fin_model.value('inflation_rate') == 2.5
+    fin_model.value('om_fixed', [3])
+    assert fin_model.SystemCosts.om_fixed == [3]
+    assert fin_model._get_value_index()['om_fixed'] is fin_model.SystemCosts
+
+    # Swapping a subclass rebuilds the index
+    fin_model.subclasses[1] = type(fin_model.SystemCosts).from_dict(default_fin_config)
+    assert fin_model.value('om_fixed') == [1]
+
+    grid = Grid(site, {'interconnect_kw': 150e3})
+    assert grid.value('grid_interconnection_limit_kwac') == 150e3
+    original_index = grid._get_value_index()
+    assert grid._get_value_index() is original_index
+
+    # Swapping the financial model rebuilds the index
+    grid._financial_model = fin_model
+    assert grid.value('inflation_rate') == 2.5
+    assert grid._get_value_index() is not original_index
+
+
 def test_detailed_pv(site):
     # Run detailed PV model (pvsamv1) using a custom financial model
     annual_energy_expected = 108239401
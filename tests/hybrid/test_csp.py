@@ -81,6 +81,105 @@ def test_pySSC_tower_increment_simulation(site):
     assert increments_annual_energy == pytest.approx(wo_increments_annual_energy, 1e-5)
 
 
+def test_pySSC_tower_selective_outputs(site):
+    """Testing pySSC tower model returns only the requested outputs and index ranges"""
+    tower_config = {'cycle_capacity_kw': 100 * 1000,
+                    'solar_multiple': 2.0,
+                    'tes_hours': 6.0}
+
+    csp = TowerPlant(site, tower_config)
+    csp.generate_field()
+
+    start_datetime, end_datetime = CspDispatch.get_start_end_datetime(293*24, 24)
+    csp.ssc.set({'time_start': CspDispatch.seconds_since_newyear(start_datetime)})
+    csp.ssc.set({'time_stop': CspDispatch.seconds_since_newyear(end_datetime)})
+    csp.update_ssc_inputs_from_plant_state()
+    all_outputs = csp.ssc.execute()
+
+    csp.update_ssc_inputs_from_plant_state()
+    outputs, index_ranges = csp.get_ssc_output_selection((end_datetime - start_datetime).total_seconds(),
+                                                         store_outputs=False)
+    selected_outputs = csp.ssc.execute(outputs, index_ranges)
+
+    assert set(selected_outputs.keys()) - {'tech_model', 'financial_model', 'cmod_success'} == set(outputs)
+    n_steps = int(24 * csp.ssc.get('time_steps_per_hour'))
+    for name in outputs:
+        if name in index_ranges:
+            assert len(selected_outputs[name]) == n_steps
+            assert selected_outputs[name] == pytest.approx(all_outputs[name][0:n_steps])
+        else:
+            assert selected_outputs[name] == pytest.approx(all_outputs[name])
+
+
+def test_tower_field_cache(site, tmp_path):
+    """Testing tower field layout and flux maps are loaded from cache for a repeated design"""
+    tower_config = {'cycle_capacity_kw': 100 * 1000,
+                    'solar_multiple': 2.0,
+                    'tes_hours': 6.0,
+                    'field_cache_dir': str(tmp_path)}
+
+    csp = TowerPlant(site, tower_config)
+    cache_key = csp.get_field_cache_key()
+    field_and_flux_maps = csp.create_field_layout_and_simulate_flux_eta_maps()
+    assert len(list(tmp_path.glob('*.json'))) == 1
+
+    csp_cached = TowerPlant(site, tower_config)
+    assert csp_cached.get_field_cache_key() == cache_key
+    cached_field_and_flux_maps = csp_cached.create_field_layout_and_simulate_flux_eta_maps()
+    assert len(list(tmp_path.glob('*.json'))) == 1
+    for k in ['N_hel', 'D_rec', 'rec_height', 'h_tower', 'A_sf_in']:
+        assert cached_field_and_flux_maps[k] == pytest.approx(field_and_flux_maps[k])
+    assert cached_field_and_flux_maps['flux_maps'] == field_and_flux_maps['flux_maps']
+    assert csp_cached.ssc.get('field_model_type') == 3
+
+    # Design change creates a new cache entry
+    csp_cached.ssc.set({'helio_width': csp_cached.ssc.get('helio_width') * 0.9})
+    assert csp_cached.get_field_cache_key() != cache_key
+
+    # Caching is off by default, and a cache directory that cannot be written is a cache miss
+    assert TowerPlant(site, {k: v for k, v in tower_config.items() if k != 'field_cache_dir'}).field_cache_dir is None
+    not_a_dir = tmp_path / 'not_a_dir'
+    not_a_dir.write_text('')
+    TowerPlant.store_cache_entry(str(not_a_dir), cache_key, field_and_flux_maps)
+    assert TowerPlant.load_cache_entry(str(not_a_dir), cache_key) is None
+
+
+def test_csp_thermal_forecast_cache(site, tmp_path):
+    """Testing full-year thermal forecast is reused for a repeated design"""
+    tower_config = {'cycle_capacity_kw': 100 * 1000,
+                    'solar_multiple': 2.0,
+                    'tes_hours': 6.0,
+                    'field_cache_dir': None,
+                    'forecast_cache_dir': str(tmp_path)}
+
+    csp = TowerPlant(site, tower_config)
+    csp.generate_field()
+    TowerPlant._forecast_cache.clear()
+    forecast = csp.run_year_for_max_thermal_gen()
+    assert len(list(tmp_path.glob('*.json'))) == 1
+    assert len(TowerPlant._forecast_cache) == 1
+
+    # Repeated design, loaded from disk
+    TowerPlant._forecast_cache.clear()
+    cached_forecast = csp.run_year_for_max_thermal_gen()
+    assert len(list(tmp_path.glob('*.json'))) == 1
+    assert cached_forecast['Q_thermal'] == pytest.approx(forecast['Q_thermal'])
+    assert csp.ssc.get('tshours') == pytest.approx(6.0)
+
+    # Tank heater capacity is part of the key
+    key = csp.get_ssc_inputs_key(csp._forecast_cache_excluded_inputs, exclude_plant_state=False)
+    csp.ssc.set({'hot_tank_max_heat': csp.ssc.get('hot_tank_max_heat') * 2})
+    assert csp.get_ssc_inputs_key(csp._forecast_cache_excluded_inputs, exclude_plant_state=False) != key
+
+    # In-memory forecasts are bounded
+    for i in range(TowerPlant.forecast_cache_size + 1):
+        TowerPlant._forecast_cache[i] = {}
+        TowerPlant._forecast_cache.move_to_end(i)
+    csp.run_year_for_max_thermal_gen()
+    assert len(TowerPlant._forecast_cache) == TowerPlant.forecast_cache_size
+    TowerPlant._forecast_cache.clear()
+
+
 def test_pySSC_trough_model(site):
     """Testing pySSC trough model using heuristic dispatch method"""
     trough_config = {'cycle_capacity_kw': 100 * 1000,
@@ -1,4 +1,5 @@
 import pytest
+import numpy as np
 from pathlib import Path
 import pyomo.environ as pyomo
 from pyomo.environ import units as u
@@ -433,6 +434,114 @@ def test_simple_battery_dispatch(site):
         assert battery.Outputs.P[i] == pytest.approx(dispatch_power, 1e-3 * abs(dispatch_power))
 
 
+def test_persistent_solver_session(site):
+    expected_objective = 28957.15
+    dispatch_n_look_ahead = 48
+
+    battery = Battery(site, technologies['battery'])
+
+    model = pyomo.ConcreteModel(name='battery_only')
+    model.forecast_horizon = pyomo.Set(initialize=range(dispatch_n_look_ahead))
+
+    battery._dispatch = SimpleBatteryDispatch(model,
+                                              model.forecast_horizon,
+                                              battery._system_model,
+                                              battery._financial_model,
+                                              include_lifecycle_count=False)
+
+    prices = {t: 30.0 if (t // 8) % 2 == 0 else 100.0 for t in model.forecast_horizon}
+    model.price = pyomo.Param(model.forecast_horizon,
+                              within=pyomo.Reals,
+                              initialize=prices,
+                              mutable=True,
+                              units=u.USD / u.MWh)
+
+    def create_test_objective_rule(m):
+        return sum((m.battery[t].time_duration * (
+                (m.price[t] - m.battery[t].cost_per_discharge) * m.battery[t].discharge_power
+                - (m.price[t] + m.battery[t].cost_per_charge) * m.battery[t].charge_power))
+                   for t in m.battery.index_set())
+
+    model.test_objective = pyomo.Objective(
+        rule=create_test_objective_rule,
+        sense=pyomo.maximize)
+
+    battery.dispatch.initialize_parameters()
+    battery.dispatch.update_time_series_parameters(0)
+    battery.dispatch.update_dispatch_initial_soc(battery.dispatch.minimum_soc)
+
+    opt = HybridDispatchBuilderSolver.create_persistent_session('appsi_highs')
+    if not opt.available(exception_flag=False):
+        pytest.skip("HiGHS is not available")
+    results = HybridDispatchBuilderSolver.highs_persistent_solve_call(opt, model)
+
+    assert results.solver.termination_condition == TerminationCondition.optimal
+    assert pyomo.value(model.test_objective) == pytest.approx(expected_objective, 1e-5)
+    assert results.problem.number_of_constraints == model.nconstraints()
+
+    # Next window: only mutable parameters change, the session is re-used
+    for t in model.forecast_horizon:
+        model.price[t] = 100.0 if (t // 8) % 2 == 0 else 30.0
+    battery.dispatch.update_dispatch_initial_soc(battery.dispatch.maximum_soc)
+    results = HybridDispatchBuilderSolver.highs_persistent_solve_call(opt, model)
+    assert results.solver.termination_condition == TerminationCondition.optimal
+    persistent_objective = pyomo.value(model.test_objective)
+
+    fresh_opt = HybridDispatchBuilderSolver.create_persistent_session('appsi_highs')
+    HybridDispatchBuilderSolver.highs_persistent_solve_call(fresh_opt, model)
+    assert persistent_objective == pytest.approx(pyomo.value(model.test_objective), 1e-5)
+
+    # A replaced objective is passed to the session
+    model.del_component(model.test_objective)
+    model.test_objective = pyomo.Objective(
+        rule=lambda m: sum(m.battery[t].charge_power for t in m.battery.index_set()),
+        sense=pyomo.minimize)
+    HybridDispatchBuilderSolver.highs_persistent_solve_call(opt, model)
+    assert pyomo.value(model.test_objective) == pytest.approx(0, abs=1e-5)
+
+    # Added components are not checked for by the session
+    model.test_constraint = pyomo.Constraint(expr=model.battery[0].charge_power >= 1.0)
+    with pytest.raises(ValueError):
+        HybridDispatchBuilderSolver.highs_persistent_solve_call(opt, model)
+
+
+def test_battery_simulate_batch(site):
+    control = [-20000.] * 6 + [0.] * 3 + [25000.] * 6 + [-10000.] * 9
+
+    stepped = Battery(site, technologies['battery'])
+    batched = Battery(site, technologies['battery'])
+    for battery in (stepped, batched):
+        battery.value("control_mode", 1.0)
+        battery.value("input_power", 0.)
+        battery.setup_system_model()
+
+    for t, power in enumerate(control):
+        stepped.value('dt_hr', 1.0)
+        stepped.value('input_power', power)
+        stepped.simulate_power(time_step=t)
+
+    results = batched.simulate_batch(control, dt_hr=[1.0] * len(control), sim_start_time=0)
+
+    assert results.shape == (len(control), len(batched.Outputs.stateful_attributes))
+    for attr in batched.Outputs.stateful_attributes:
+        assert getattr(batched.Outputs, attr)[0:len(control)] == pytest.approx(getattr(stepped.Outputs, attr)[0:len(control)])
+    assert batched.Outputs.gen[0:len(control)] == pytest.approx(batched.Outputs.P[0:len(control)])
+
+    # only the requested outputs are read
+    soc_only = Battery(site, technologies['battery'])
+    soc_only.value("control_mode", 1.0)
+    soc_only.value("input_power", 0.)
+    soc_only.setup_system_model()
+    soc = soc_only.simulate_batch(control, dt_hr=[1.0] * len(control), attributes=['SOC'])
+    assert soc.shape == (len(control), 1)
+    assert soc[:, 0] == pytest.approx(stepped.Outputs.SOC[0:len(control)])
+
+    assert isinstance(batched.Outputs.P, np.ndarray) and len(batched.Outputs.P) == site.n_timesteps
+    lists = batched.Outputs.to_lists()
+    assert isinstance(lists['P'], list)
+    assert lists['P'] == batched.Outputs.P.tolist()
+
+
 def test_simple_battery_dispatch_lifecycle_count(site):
     expected_objective = 17024.52
     expected_lifecycles = 2.2514
@@ -645,6 +754,56 @@ def test_hybrid_dispatch_one_cycle_heuristic(site):
     assert sum(hybrid_plant.battery.Outputs.P) < 0.0
     
 
+def test_vectorized_battery_dispatch_heuristic():
+    heuristic = VectorizedBatteryDispatchHeuristic(capacity=200.,
+                                                   maximum_power=50.,
+                                                   minimum_soc=10.,
+                                                   maximum_soc=90.,
+                                                   charge_efficiency=94.,
+                                                   discharge_efficiency=94.)
+    n_days = 3
+    gen = np.tile(np.concatenate((np.zeros(6), np.full(12, 80.), np.zeros(6))), n_days)
+    grid_limit = 60.
+
+    max_charge, max_discharge = heuristic.power_fraction_limits(gen, grid_limit)
+    assert max_charge.max() == 1.0 and max_charge.min() == 0.0
+    assert max_discharge.max() == 1.0 and max_discharge.min() == 0.0
+
+    user_fixed_dispatch = [0.0] * 6 + [-1.0] * 6 + [1.0] * 6 + [0.0] * 6
+    fixed_dispatch = heuristic.fixed_dispatch(user_fixed_dispatch, gen, grid_limit)
+    assert len(fixed_dispatch) == len(gen)
+    assert np.all(fixed_dispatch[12:18] == 0.0)     # no discharge headroom while generating above grid limit
+
+    fixed_dispatch, soc = heuristic.enforce_soc_bounds(fixed_dispatch, 10.)
+    assert soc.min() >= 10. - 1e-7 and soc.max() <= 90. + 1e-7
+    assert np.all(fixed_dispatch <= 1e-9)
+    assert soc == pytest.approx(heuristic.soc(fixed_dispatch, 10.))
+
+    # initial state-of-charge is in [%], also at or below 1%
+    low_heuristic = VectorizedBatteryDispatchHeuristic(200., 50., 0., 90., 94., 94.)
+    _, low_soc = low_heuristic.enforce_soc_bounds(np.zeros(4), 1.)
+    assert low_soc == pytest.approx([1.] * 4)
+
+    # bounds are enforced as when clipping the state-of-charge after each time step of a full year
+    year_dispatch = np.sign(np.sin(np.arange(8760) * 0.37) + np.cos(np.arange(8760) * 0.011))
+    _, year_soc = heuristic.enforce_soc_bounds(year_dispatch, 50.)
+    stepped_soc = [50.]
+    for change in heuristic.soc_change(year_dispatch):
+        stepped_soc.append(min(max(stepped_soc[-1] + change, 10.), 90.))
+    assert year_soc == pytest.approx(stepped_soc[1:])
+
+    prices = np.tile(np.concatenate((np.full(12, 20.), np.full(12, 100.))), n_days)
+    gen = np.tile(np.concatenate((np.full(12, 50.), np.zeros(12))), n_days)
+    fixed_dispatch, soc = heuristic.one_cycle_dispatch(gen, 50., prices, 10.)
+    discharge_time, charge_time = heuristic.get_duration_battery_full_cycle()
+    daily_dispatch = fixed_dispatch.reshape(n_days, 24)
+    assert np.all(daily_dispatch[:, :12] <= 0.0)
+    assert np.all(daily_dispatch[:, 12:] >= 0.0)
+    assert -daily_dispatch.clip(max=0).sum(axis=1) == pytest.approx([charge_time] * n_days)
+    assert daily_dispatch.clip(min=0).sum(axis=1) == pytest.approx([discharge_time] * n_days)
+    assert soc.min() >= 10. - 1e-7 and soc.max() <= 90. + 1e-7
+
+
 def test_hybrid_solar_battery_dispatch(site):
     expected_objective = 20819.456
 
@@ -709,6 +868,75 @@ def test_hybrid_dispatch_financials(site):
     assert sum(hybrid_plant.battery.Outputs.P) < 0.0
 
 
+def test_parallel_cluster_exemplar_dispatch(site):
+    wind_battery = {key: technologies[key] for key in ('wind', 'battery', 'grid')}
+    dispatch_options = {'solver': 'highs_persistent',
+                        'use_clustering': True,
+                        'n_clusters': 6}
+
+    serial_plant = HybridSimulation(wind_battery, site, dispatch_options=dispatch_options)
+    serial_plant.ppa_price = (0.06,)
+    serial_plant.simulate(1)
+
+    dispatch_options['n_cluster_workers'] = 3
+    parallel_plant = HybridSimulation(wind_battery, site, dispatch_options=dispatch_options)
+    parallel_plant.ppa_price = (0.06,)
+    parallel_plant.simulate(1)
+
+    serial_state = serial_plant.dispatch_builder.problem_state
+    parallel_state = parallel_plant.dispatch_builder.problem_state
+    assert len(parallel_state.objective) == len(serial_state.objective)
+    assert sorted(parallel_state.start_time) == sorted(serial_state.start_time)
+    assert len(parallel_plant.battery.Outputs.P) == len(serial_plant.battery.Outputs.P)
+    # Exemplar initial states are estimated from fewer known states, so results differ slightly from serial
+    assert sum(parallel_state.objective) == pytest.approx(sum(serial_state.objective), 0.01)
+
+    # Results are reproducible for a given number of workers
+    repeated_plant = HybridSimulation(wind_battery, site, dispatch_options=dispatch_options)
+    repeated_plant.ppa_price = (0.06,)
+    repeated_plant.simulate(1)
+    assert repeated_plant.dispatch_builder.problem_state.objective == pytest.approx(parallel_state.objective)
+    assert repeated_plant.battery.Outputs.P == pytest.approx(parallel_plant.battery.Outputs.P)
+    assert (sum(abs(p) for p in parallel_plant.battery.Outputs.P)
+            == pytest.approx(sum(abs(p) for p in serial_plant.battery.Outputs.P), 0.01))
+
+
+def test_dispatch_problem_state(tmp_path):
+    from types import SimpleNamespace
+
+    def solver_results(condition, upper_bound):
+        return SimpleNamespace(solver=SimpleNamespace(termination_condition=condition, time=0.5),
+                               problem=SimpleNamespace(upper_bound=upper_bound, lower_bound=0.9 * upper_bound,
+                                                       number_of_constraints=10, number_of_variables=20,
+                                                       number_of_nonzeros=None))
+
+    problem_state = DispatchProblemState(n_windows=2)
+    for window in range(5):
+        condition = TerminationCondition.optimal if window != 3 else TerminationCondition.maxTimeLimit
+        problem_state.store_problem_metrics(solver_results(condition, 100. + window), 0, 1, 100. + window,
+                                            window_start_time=window * 24, build_time=0.1)
+
+    other = DispatchProblemState()
+    other.store_problem_metrics(solver_results(TerminationCondition.optimal, 50.), 120, 1, 50.)
+    problem_state.extend(other)
+
+    assert problem_state.n_solves == 6
+    assert problem_state.n_non_optimal_solves == 1
+    assert problem_state.window_start_time == (0, 24, 48, 72, 96, 120)
+    assert problem_state.objective == (100., 101., 102., 103., 104., 50.)
+    assert problem_state.gap == pytest.approx((0.1, ) * 6)
+    assert problem_state.termination_condition[3] == str(TerminationCondition.maxTimeLimit)
+
+    df = problem_state.to_dataframe()
+    assert len(df) == 6
+    assert df['build_time'].iloc[0] == 0.1
+    assert np.isnan(df['build_time'].iloc[-1])
+
+    filename = tmp_path / "dispatch_metrics.csv"
+    problem_state.export(filename)
+    assert filename.exists()
+
+
 def test_desired_schedule_dispatch():
 
     # Creating a contrived schedule
@@ -149,3 +149,22 @@ def test_swept_area():
     expected_bounds = (-63.34583, -19.71403, 0.1617619, 0.6037036)
     for b in range(4):
         assert shadow.bounds[b] == approx(expected_bounds[b])
+
+
+def test_get_sun_pos():
+    lat = 39.7555
+    lon = -105.2211
+    azi_ang, elv_ang, dates = get_sun_pos(lat, lon, step_in_minutes=60, n=8760)
+    assert len(azi_ang) == len(elv_ang) == len(dates) == 8760
+
+    # vectorized solar position matches pysolar evaluated at each time step
+    sample = range(0, 8760, 97)
+    for i in sample:
+        assert azi_ang[i] == approx(get_azimuth(lat, lon, dates[i]), abs=1e-5)
+        assert elv_ang[i] == approx(get_altitude(lat, lon, dates[i]), abs=1e-5)
+
+    azi_steps, elv_steps, dates_steps = get_sun_pos(lat, lon, step_in_minutes=15, steps=range(4000, 4100))
+    assert dates_steps[0] == dates[1000]
+    assert azi_steps[0] == approx(azi_ang[1000]) and elv_steps[0] == approx(elv_ang[1000])
+    azi_times, elv_times = get_sun_pos_at_times(lat, lon, [d.timestamp() for d in dates_steps])
+    assert azi_times == approx(azi_steps) and elv_times == approx(elv_steps)
@@ -1,6 +1,10 @@
 import platform
+import pytest
 from pytest import approx
 from hybrid.layout.flicker_data.plot_flicker import *
+from hybrid.layout.flicker_raster import FlickerMismatchRaster, rasterize_convex_polygons
+from hybrid.layout.flicker_library import FlickerLibrary
+from hybrid.layout.flicker_loss_cache import FlickerLossCache
 from hybrid.keys import set_nrel_key_dot_env
 
 
@@ -141,6 +145,125 @@ def test_single_turbine_wind_dir():
     assert(np.count_nonzero(hours_shaded) == 2819)
 
 
+def test_rasterize_convex_polygons():
+    square = np.array([[0.6, 0.6], [2.4, 0.6], [2.4, 2.4], [0.6, 2.4]])
+    row, col, covered = rasterize_convex_polygons([square], 0, 1, 5, 0, 1, 5)
+    assert (row, col) == (1, 1)
+    assert covered.shape == (2, 2)
+    assert np.all(covered == 1)
+
+    square = np.array([[0.6, 0.6], [2.2, 0.6], [2.2, 2.2], [0.6, 2.2]])
+    row, col, covered = rasterize_convex_polygons([square], 0, 1, 5, 0, 1, 5, samples_per_cell=2)
+    assert covered.sum() == approx(2.25)
+    assert covered[1, 1] == approx(0.25)
+
+    assert rasterize_convex_polygons([square + 10], 0, 1, 5, 0, 1, 5) is None
+
+
+def test_single_turbine_raster():
+    FlickerMismatch.diam_mult_nwe = 3
+    FlickerMismatch.diam_mult_s = 1
+    FlickerMismatch.turbine_tower_shadow = True
+    FlickerMismatch.steps_per_hour = 1
+    flicker = FlickerMismatch(lat, lon, angles_per_step=1)
+    flicker_raster = FlickerMismatchRaster(lat, lon, angles_per_step=1)
+    steps = range(3185, 3187)
+
+    shadow, loss = flicker.create_heat_maps(steps, ("poa", "power"))
+    shadow_raster, loss_raster = flicker_raster.create_heat_maps(steps, ("poa", "power"))
+    assert np.allclose(shadow, shadow_raster)
+    assert np.allclose(loss, loss_raster)
+
+    (hours_shaded,) = flicker.create_heat_maps(steps, ("time",))
+    (hours_shaded_raster,) = flicker_raster.create_heat_maps(steps, ("time",))
+    assert np.max(np.abs(hours_shaded - hours_shaded_raster)) < 0.1
+    assert np.average(hours_shaded_raster) == approx(np.average(hours_shaded), 1e-2)
+
+
+def test_flicker_library(tmp_path):
+    library = FlickerLibrary(tmp_path)
+    key_args = {'weight': "time", 'blade_length': 35, 'steps_per_hour': 1, 'angles_per_step': 1}
+    assert library.lookup(lat, **key_args) is None
+
+    key = library.entry_key(**key_args)
+    xs, ys = np.arange(3), np.arange(2)
+    library.store(key, 30, lon, np.zeros((2, 3)), xs, ys, (1, 0))
+    library.store(key, 40, lon, np.ones((2, 3)), xs, ys, (1, 0))
+    assert list(library.latitudes(key)) == [30, 40]
+
+    diam, turb_index, heat_map, map_xs, map_ys = library.lookup(37.5, **key_args)
+    assert diam == 70
+    assert turb_index == (1, 0)
+    assert np.allclose(heat_map, 0.75)
+    assert np.all(map_xs == xs) and np.all(map_ys == ys)
+    assert np.allclose(library.lookup(40, **key_args)[2], 1)
+    assert np.allclose(library.lookup(50, **key_args)[2], 1)
+    assert np.allclose(library.lookup(20, **key_args)[2], 0)
+    assert library.lookup(35, **dict(key_args, blade_length=40)) is None
+
+    with pytest.raises(ValueError):
+        library.store(key, 50, lon, np.ones((3, 2)), xs, ys, (1, 0))
+
+    # generate entries, simulating only the locations not in the library yet
+    FlickerMismatch.turbine_tower_shadow = True
+    generate_args = dict(key_args, diam_mult_nwe=3, diam_mult_s=1)
+    paths = library.generate(((lat, lon), (lat + 1, lon)), steps=range(3185, 3187), **generate_args)
+    assert len(paths) == 2
+    assert not library.generate(((lat, lon),), steps=range(3185, 3187), **generate_args)
+
+    FlickerMismatch.diam_mult_nwe = 3
+    FlickerMismatch.diam_mult_s = 1
+    FlickerMismatch.steps_per_hour = 1
+    flicker = FlickerMismatchRaster(lat, lon, angles_per_step=1)
+    (hours_shaded,) = flicker.create_heat_maps(range(3185, 3187), ("time",))
+    _, turb_index, heat_map, _, _ = library.lookup(lat, **generate_args)
+    assert np.allclose(heat_map, hours_shaded)
+    assert turb_index == FlickerMismatch.get_turb_pos_indices(flicker.heat_map_template)
+
+
+def test_flicker_loss_cache(tmp_path):
+    from pvmismatch import pvsystem
+    from hybrid.layout.pv_module import cell_num_map_flat
+
+    # loss of a string with its 6th and 10th modules shaded
+    poa_suns = 0.8
+    pvsys = pvsystem.PVsystem(numberStrs=1, numberMods=10)
+    pvsys.setSuns({0: {i: [(poa_suns,) * 96, range(0, 96)] for i in range(10)}})
+    pmp_unshaded = pvsys.Pmp
+    sun_dict = {i: [(poa_suns,) * 96, range(0, 96)] for i in range(10)}
+    for i in (5, 9):
+        sun_dict[i] = [(poa_suns * 0.1,) * 96, cell_num_map_flat]
+    pvsys.setSuns({0: sun_dict})
+    loss = (pmp_unshaded - pvsys.Pmp) / pmp_unshaded
+
+    db_path = str(tmp_path / "losses.sqlite")
+    cache = FlickerLossCache(db_path)
+    assert cache.string_flicker_loss(poa_suns, 10, 0) == 0
+    assert cache.string_flicker_loss(poa_suns, 10, 2) == approx(loss, 1e-9)
+    assert cache.key(poa_suns + 1e-5, 10, 2) == cache.key(poa_suns, 10, 2)
+    cache.flush()
+
+    # losses are read from the database without simulating
+    cache_loaded = FlickerLossCache(db_path)
+    assert cache_loaded.string_flicker_loss(poa_suns, 10, 2) == approx(loss, 1e-9)
+    assert not cache_loaded._pv_systems
+
+    # an unusable database falls back to keeping the losses in memory
+    not_a_dir = tmp_path / "not_a_dir"
+    not_a_dir.write_text("")
+    cache_memory = FlickerLossCache(str(not_a_dir / "losses.sqlite"))
+    assert cache_memory.string_flicker_loss(poa_suns, 10, 2) == approx(loss, 1e-9)
+    cache_memory.flush()
+    assert cache_memory.db_path is None
+    assert cache_memory.string_flicker_loss(poa_suns, 10, 2) == approx(loss, 1e-9)
+
+    corrupt_path = tmp_path / "corrupt.sqlite"
+    corrupt_path.write_bytes(b"not a database" * 100)
+    cache_corrupt = FlickerLossCache(str(corrupt_path))
+    assert cache_corrupt.string_flicker_loss(poa_suns, 10, 2) == approx(loss, 1e-9)
+    assert cache_corrupt.db_path is None
+
+
 def test_grid():
     dx = 1
     dy = 2
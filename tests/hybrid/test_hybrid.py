@@ -910,3 +910,41 @@ def test_capacity_credit(site):
     assert tc.wind[1] == approx(504569, rel=5e-2)
     assert tc.battery[1] == approx(0, rel=5e-2)
     assert tc.hybrid[1] == approx(1646170, rel=5e-2)
+
+
+def test_simulate_resource_years(site):
+    resource_dir = Path(__file__).absolute().parent.parent.parent / "resource_files"
+    other_year = {'year': 2013,
+                  'solar_resource_file': resource_dir / "solar" / "36.103_-102.27_psmv3_60_2013.csv",
+                  'wind_resource_file': resource_dir / "wind" / "36.103_-102.27_windtoolkit_2013_60min_100m_120m.srw"}
+    this_year = {'year': 2012, 'solar_resource_file': solar_resource_file, 'wind_resource_file': wind_resource_file}
+
+    for techs in (('wind', 'grid'), ('pv', 'grid')):
+        hybrid_plant = HybridSimulation({key: technologies[key] for key in techs}, site)
+        hybrid_plant.ppa_price = (0.01, )
+        results = hybrid_plant.simulate_resource_years([this_year, other_year, this_year], project_life=25)
+        tech = techs[0]
+        aeps = results['annual_energies'][tech]
+        assert results['years'] == [2012, 2013, 2012]
+        assert aeps[0] == approx(aeps[2])
+        assert aeps[0] != approx(aeps[1])
+        assert results['annual_energies']['hybrid'] == approx(aeps, 1e-3)
+        assert results['p_values']['annual_energies'][tech]['P50'] == approx(aeps[0])
+        assert results['p_values']['annual_energies'][tech]['P90'] == approx(np.percentile(aeps, 10))
+        assert results['p_values']['annual_energies'][tech]['P90'] <= results['p_values']['annual_energies'][tech]['P50']
+        assert set(results['p_values'].keys()) == {'annual_energies', 'capacity_factors', 'net_present_values',
+                                                   'first_year_revenues'}
+        assert site.data['year'] == 2012
+
+        # same as a plant set up for the other resource year
+        other_site = SiteInfo(flatirons_site, solar_resource_file=other_year['solar_resource_file'],
+                              wind_resource_file=other_year['wind_resource_file'])
+        other_plant = HybridSimulation({key: technologies[key] for key in techs}, other_site)
+        other_plant.ppa_price = (0.01, )
+        other_plant.simulate(25)
+        assert aeps[1] == approx(getattr(other_plant.annual_energies, tech))
+        assert results['net_present_values'][tech][1] == approx(getattr(other_plant.net_present_values, tech))
+
+    parallel_results = hybrid_plant.simulate_resource_years([this_year, other_year, this_year], project_life=25,
+                                                            n_workers=2)
+    assert parallel_results['annual_energies'] == results['annual_energies']
@@ -1,6 +1,7 @@
 import pytest
 from pytest import approx
 import os
+import numpy as np
 from pathlib import Path
 
 from hybrid.resource import SolarResource, WindResource
@@ -88,3 +89,237 @@ def test_from_file():
     solarfile = Path(__file__).parent.parent.parent / "resource_files" / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv"
     solar_resource = SolarResource(lat=lat, lon=lon, year=year, filepath=solarfile)
     assert(len(solar_resource.data['gh']) > 0)
+
+
+def test_resource_store(tmp_path):
+    from PySAM.ResourceTools import SAM_CSV_to_solar_data, SRW_to_wind_data
+    from hybrid.resource import ResourceStore
+
+    windfile = Path(__file__).parent.parent.parent / "resource_files" / "wind" / "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw"
+    solarfile = Path(__file__).parent.parent.parent / "resource_files" / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv"
+
+    store = ResourceStore(str(tmp_path))
+    assert store.wind_data(str(windfile)) == SRW_to_wind_data(str(windfile))
+    solar_data = store.solar_data(str(solarfile))
+    expected = SAM_CSV_to_solar_data(str(solarfile))
+    assert solar_data.keys() == expected.keys()
+    for key in expected.keys():
+        assert solar_data[key] == approx(expected[key])
+    assert len(list(tmp_path.glob('*.npy'))) == 2
+
+    # binary files are memory-mapped by a new store instead of parsing the weather file
+    new_store = ResourceStore(str(tmp_path))
+    table = new_store.load_table(str(solarfile), 3)
+    assert table.data.shape[0] == 8760
+    assert table.column('GHI').tolist() == expected['gh']
+
+    # files are parsed in blocks
+    chunked_store = ResourceStore(str(tmp_path / "chunked"))
+    chunked_store.chunk_rows = 1000
+    chunked_table = chunked_store.load_table(str(solarfile), 3)
+    assert chunked_table.columns == table.columns
+    assert np.array_equal(chunked_table.data, ResourceStore().load_table(str(solarfile), 3).data)
+
+    # files are parsed in memory if the store cannot be written, and the tables kept in memory are bounded
+    not_a_dir = tmp_path / "not_a_dir"
+    not_a_dir.write_text("")
+    unwritable_store = ResourceStore(str(not_a_dir))
+    unwritable_store.max_tables = 1
+    assert unwritable_store.load_table(str(solarfile), 3).column('GHI').tolist() == expected['gh']
+    unwritable_store.load_table(str(windfile), 5)
+    assert len(unwritable_store._tables) == 1
+
+
+def test_schedule_store(tmp_path):
+    from hybrid.resource import ElectricityPrices, ScheduleStore, schedule_window
+
+    pricefile = Path(__file__).parent.parent.parent / "resource_files" / "grid" / "pricing-data-2015-IronMtn-002_factors.csv"
+    store = ScheduleStore()
+    prices = store.load(str(pricefile))
+    assert np.array_equal(prices, np.loadtxt(str(pricefile)))
+    assert not prices.flags.writeable
+    assert store.load(str(pricefile)) is prices
+
+    # files with the same contents are parsed once, header rows are skipped
+    copied_file = tmp_path / "prices.csv"
+    copied_file.write_text(pricefile.read_text())
+    assert store.load(str(copied_file)) is prices
+    header_file = tmp_path / "prices_header.csv"
+    header_file.write_text("dispatch_factors\n" + pricefile.read_text())
+    assert np.array_equal(store.load(str(header_file)), prices)
+
+    # resampled schedules are kept per time step count
+    half_hourly = store.load(str(pricefile), 17520)
+    assert np.array_equal(half_hourly[::2], prices) and np.array_equal(half_hourly[1::2], prices)
+    assert store.load(str(pricefile), 17520) is half_hourly
+    assert store.load(str(pricefile), 365) == approx(prices.reshape(365, 24).mean(axis=1))
+    with pytest.raises(ValueError):
+        store.load(str(pricefile), 1000)
+
+    # windows are views of the schedule unless wrapping around the end of the year
+    window = schedule_window(prices, 24, 48)
+    assert np.shares_memory(window, prices) and np.array_equal(window, prices[24:72])
+    assert np.array_equal(schedule_window(prices, 8736, 48), np.concatenate((prices[8736:], prices[:24])))
+
+    elec_prices = ElectricityPrices(lat, lon, year, filepath=str(pricefile))
+    assert np.array_equal(elec_prices.data, prices)
+
+
+def test_resource_prefetcher(tmp_path):
+    import threading
+    import time
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from hybrid.keys import set_developer_nrel_gov_key
+    from hybrid.resource import ResourcePrefetcher
+
+    resource_dir = Path(__file__).parent.parent.parent / "resource_files"
+    solar_text = (resource_dir / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv").read_text()
+    wind_text = (resource_dir / "wind" / "35.2018863_-101.945027_windtoolkit_2012_60min_100m.srw").read_text()
+    requests_received = []
+
+    class StandInHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_received.append((time.monotonic(), self.path))
+            body = solar_text if 'nsrdb' in self.path else wind_text
+            self.send_response(200)
+            self.end_headers()
+            self.wfile.write(body.encode())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    import hybrid.keys
+    original_key = hybrid.keys.developer_nrel_gov_key
+    set_developer_nrel_gov_key('0' * 40)
+    try:
+        prefetcher = ResourcePrefetcher(path_resource=str(tmp_path), max_workers=4, max_requests_per_second=20,
+                                        api_host='http://127.0.0.1:{}'.format(server.server_address[1]))
+        sites = [(35.0 + i, -101.0) for i in range(3)]
+        results = prefetcher.prefetch(sites, years=[2012], hub_heights=[100])
+        assert len(results) == 6
+        for key, filename in results.items():
+            assert os.path.isfile(filename)
+        assert len(requests_received) == 6
+        start_times = sorted(t for t, _ in requests_received)
+        assert start_times[-1] - start_times[0] >= 5 / 20 * 0.9
+        assert len(list(tmp_path.rglob('*.tmp'))) == 0
+
+        # files on disk are not downloaded again
+        prefetcher.prefetch(sites, years=[2012], hub_heights=[100])
+        assert len(requests_received) == 6
+    finally:
+        server.shutdown()
+        set_developer_nrel_gov_key(original_key)
+
+
+def test_resource_catalog(tmp_path):
+    from hybrid.resource import ResourceCatalog
+
+    resource_dir = Path(__file__).parent.parent.parent / "resource_files"
+    catalog = ResourceCatalog(str(tmp_path / "catalog.sqlite"))
+    assert catalog.add_directory(str(resource_dir)) > 0
+    n_files = len(catalog)
+    catalog.add_directory(str(resource_dir))
+    assert len(catalog) == n_files
+
+    solar_file = str((resource_dir / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv").resolve())
+    assert catalog.nearest('solar', 35.2018863, -101.945027, 2012) == solar_file
+    # about 1.1 km north
+    assert catalog.nearest('solar', 35.2118863, -101.945027, 2012, tolerance_km=0.5) is None
+    assert catalog.nearest('solar', 35.2118863, -101.945027, 2012, tolerance_km=2) == solar_file
+    assert catalog.nearest('solar', 35.2118863, -101.945027, 2013, tolerance_km=2) is None
+
+    wind_file = catalog.nearest('wind', 35.21, -101.945, 2012, tolerance_km=2, hub_height=90)
+    assert wind_file.endswith("35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw")
+    assert catalog.nearest('wind', 35.21, -101.945, 2012, tolerance_km=2, hub_height=120) is None
+
+    # nearby sites use the catalog file instead of downloading
+    solar = SolarResource(35.2118863, -101.945027, 2012, resource_catalog=catalog, catalog_tolerance_km=2)
+    assert solar.filename == solar_file
+    wind = WindResource(35.21, -101.945, 2012, 90, resource_catalog=catalog, catalog_tolerance_km=2)
+    assert wind.filename == wind_file
+    assert len(wind.data['data']) == 8760
+
+    # entries of removed files are dropped
+    copied_file = tmp_path / "solar" / "10.0_20.0_psmv3_60_2012.csv"
+    copied_file.parent.mkdir()
+    copied_file.write_text("")
+    assert catalog.add_file(str(copied_file))
+    assert catalog.nearest('solar', 10., 20., 2012) == str(copied_file)
+    copied_file.unlink()
+    assert catalog.nearest('solar', 10., 20., 2012) is None
+    assert len(catalog) == n_files
+
+
+def test_wind_heights_combined_in_memory(tmp_path):
+    import csv
+    from hybrid.resource import resource_store
+
+    combined_file = Path(__file__).parent.parent.parent / "resource_files" / "wind" / \
+        "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw"
+    with open(combined_file) as f:
+        rows = list(csv.reader(f))
+
+    # split the combined file into the files of each height, as downloaded
+    wind_dir = tmp_path / "wind"
+    wind_dir.mkdir()
+    for height, columns in ((80, slice(0, 4)), (100, slice(4, 8))):
+        with open(wind_dir / "35.2018863_-101.945027_windtoolkit_2012_60min_{}m.srw".format(height), 'w',
+                  newline='') as f:
+            csv.writer(f).writerows(rows[:2] + [row[columns] for row in rows[2:]])
+
+    wind = WindResource(35.2018863, -101.945027, 2012, 90, path_resource=str(tmp_path))
+    assert not os.path.isfile(wind.filename)
+    expected = resource_store.wind_data(str(combined_file))
+    assert wind.data['heights'] == expected['heights']
+    assert wind.data['fields'] == expected['fields']
+    assert wind.data['data'] == expected['data']
+
+    # hub height sweeps reuse the parsed height files without writing combined files
+    wind.update_height(80)
+    wind.format_data()
+    assert wind.data['heights'] == [80.] * 4
+    assert len(os.listdir(wind_dir)) == 2
+
+    wind = WindResource(35.2018863, -101.945027, 2012, 90, path_resource=str(tmp_path), write_combined_file=True)
+    assert os.path.isfile(wind.filename)
+    assert wind.data['data'] == expected['data']
+
+
+def test_country_boundaries():
+    import numpy as np
+    import pandas as pd
+    from shapely.geometry import shape, Point
+    from tools.resource import CountryBoundaries, get_country, filter_sites
+
+    geo_data = {"type": "FeatureCollection", "features": [
+        {"type": "Feature", "properties": {"ADMIN": "Squareland"},
+         "geometry": {"type": "Polygon", "coordinates": [
+             [[0, 0], [10, 0], [10, 10], [0, 10], [0, 0]],
+             [[4, 4], [6, 4], [6, 6], [4, 6], [4, 4]]]}},
+        {"type": "Feature", "properties": {"ADMIN": "United States of America"},
+         "geometry": {"type": "MultiPolygon", "coordinates": [
+             [[[-110, 30], [-90, 30], [-90, 45], [-110, 45], [-110, 30]]],
+             [[[4.5, 4.5], [5.5, 4.5], [5, 5.5], [4.5, 4.5]]]]}}]}
+    boundaries = CountryBoundaries(geo_data)
+
+    rng = np.random.default_rng(1)
+    lats = np.concatenate((rng.uniform(-5, 15, 500), rng.uniform(25, 50, 500)))
+    lons = np.concatenate((rng.uniform(-5, 15, 500), rng.uniform(-115, -85, 500)))
+    countries = boundaries.countries(lats, lons)
+
+    shapes = [(f["properties"]["ADMIN"], shape(f["geometry"])) for f in geo_data["features"]]
+    for lat, lon, country in zip(lats, lons, countries):
+        expected = next((name for name, geom in shapes if geom.contains(Point(lon, lat))), "unknown")
+        assert country == expected
+    assert set(countries) == {"Squareland", "United States of America", "unknown"}
+    assert get_country(5, 5.01, boundaries) == "United States of America"
+    assert get_country(5, 4.1, geo_data) == "unknown"
+
+    site_details = pd.DataFrame({'Lat': lats, 'Lon': lons})
+    in_usa = filter_sites(site_details, location='usa only', boundaries=boundaries)
+    assert len(in_usa) == np.count_nonzero(countries == "United States of America")
+    on_land = filter_sites(pd.DataFrame({'Lat': [40., 0.], 'Lon': [-100., -140.]}), location='on land only')
+    assert list(on_land['Lat']) == [40.]
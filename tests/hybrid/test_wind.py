@@ -120,3 +120,120 @@ def test_changing_system_capacity():
 
 
 
+
+
+def _attached_site_summary(shared_site):
+    site = shared_site.attach()
+    return site.n_timesteps, sum(site.solar_resource.data['gh']), site.wind_resource.data['data'].shape, site.polygon.area
+
+
+def test_shared_site_info():
+    import multiprocessing
+    from pathlib import Path
+    from hybrid.sites import SharedSiteInfo
+
+    resource_dir = Path(__file__).absolute().parent.parent.parent / "resource_files"
+    site = SiteInfo(flatirons_site,
+                    solar_resource_file=resource_dir / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv",
+                    wind_resource_file=resource_dir / "wind" / "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw")
+    expected = (site.n_timesteps, sum(site.solar_resource.data['gh']), (len(site.wind_resource.data['data']), 8),
+                site.polygon.area)
+
+    with SharedSiteInfo.publish(site) as shared_site:
+        with multiprocessing.Pool(2) as p:
+            for summary in p.map(_attached_site_summary, [shared_site] * 2):
+                assert summary[2] == expected[2]
+                assert (summary[0], summary[1], summary[3]) == pytest.approx((expected[0], expected[1], expected[3]))
+
+        attached_site = shared_site.attach()
+        assert not attached_site.solar_resource.data['gh'].flags.writeable
+        wind_config = {'num_turbines': 5, 'turbine_rating_kw': 2000}
+        shared_model = WindPlant(attached_site, wind_config)
+        shared_model.simulate_power(1)
+        model = WindPlant(site, wind_config)
+        model.simulate_power(1)
+        assert shared_model.annual_energy_kwh == pytest.approx(model.annual_energy_kwh)
+
+    # non-array site attributes such as the KML document are kept
+    site.kml_data = {'document': 'site boundary'}
+    with SharedSiteInfo.publish(site) as shared_site:
+        assert shared_site.attach().kml_data == site.kml_data
+
+
+def test_site_info_lazy_loading():
+    from pathlib import Path
+
+    resource_dir = Path(__file__).absolute().parent.parent.parent / "resource_files"
+    site = SiteInfo(flatirons_site,
+                    solar_resource_file=resource_dir / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv",
+                    wind_resource_file=resource_dir / "wind" / "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw")
+    assert site._solar_resource is None and site._wind_resource is None and site._elec_prices is None
+
+    assert len(site.wind_resource.data['data']) == 8760
+    assert site._solar_resource is None and site._elec_prices is None
+    assert site.n_timesteps == 8760
+    assert site._solar_resource is not None
+    assert len(site.capacity_hours) == 8760
+    assert site.interval == 60
+
+    no_solar_site = SiteInfo(dict(flatirons_site, no_solar=True),
+                             wind_resource_file=resource_dir / "wind" / "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw")
+    assert no_solar_site.preload() is no_solar_site
+    assert no_solar_site._wind_resource is not None and no_solar_site._elec_prices is not None
+    assert not hasattr(no_solar_site, 'solar_resource')
+    assert no_solar_site.n_timesteps == 8760
+
+    # desired schedules can be read from files, resampled to the simulation time step
+    schedule_file = resource_dir / "grid" / "pricing-data-2015-IronMtn-002_factors.csv"
+    schedule_site = SiteInfo(dict(flatirons_site, no_wind=True),
+                             solar_resource_file=resource_dir / "solar" / "35.2018863_-101.945027_psmv3_60_2012.csv",
+                             desired_schedule=str(schedule_file))
+    assert schedule_site.follow_desired_schedule
+    with open(schedule_file) as f:
+        assert schedule_site.desired_schedule.tolist() == pytest.approx([float(line) for line in f])
+
+
+def test_floris_wind_rose():
+    floris = pytest.importorskip("floris")
+    import numpy as np
+    import yaml
+    from pathlib import Path
+    from packaging.version import Version
+    from hybrid.add_custom_modules.custom_wind_floris import Floris
+
+    if Version(floris.__version__) < Version("3.1"):
+        pytest.skip("Floris v3.1 or higher is required")
+
+    root_dir = Path(__file__).absolute().parent.parent.parent
+    with open(root_dir / "examples" / "Wind_Floris" / "floris_input.yaml", 'r') as f:
+        floris_config = yaml.load(f, yaml.SafeLoader)
+    site = SiteInfo(flatirons_site,
+                    wind_resource_file=root_dir / "resource_files" / "wind" /
+                    "35.2018863_-101.945027_windtoolkit_2012_60min_80m_100m.srw")
+    model = Floris({'floris_config': floris_config, 'turbine_rating_kw': 5000, 'power_cache_size': 1}, site,
+                   timestep=(0, 48))
+    layout_x, layout_y = [0., 630.], [0., 300.]
+    model.wind_farm_xCoordinates = layout_x
+    model.wind_farm_yCoordinates = layout_y
+    model.execute(1)
+
+    # unbinned evaluation of each hour
+    model._set_layout(np.array(layout_x), np.array(layout_y))
+    expected = np.zeros(72)
+    for t in range(72):
+        model.fi.reinitialize(wind_directions=[model.wind_dirs[t] % 360.], wind_speeds=[model.speeds[t]])
+        model.fi.calculate_wake()
+        expected[t] = np.sum(model.fi.get_turbine_powers()) / 1000
+    assert model.gen[:48] == pytest.approx(expected[:48], rel=1e-6)
+    assert not np.any(model.gen[48:])
+
+    # changing the simulated time steps bins them again
+    model.start_idx, model.end_idx = 24, 72
+    model.execute(1)
+    assert model.gen[24:72] == pytest.approx(expected[24:72], rel=1e-6)
+    assert not np.any(model.gen[:24])
+
+    # the powers of the last layout are kept
+    model.wind_farm_xCoordinates = [0., 1260.]
+    model.execute(1)
+    assert len(model._power_cache) == 1
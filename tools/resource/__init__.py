@@ -1,2 +1,3 @@
 from .resource_tools import get_country, filter_sites, get_offset, extrapolate_wind_speed
+from .site_filter import CountryBoundaries
 from .resource_loader.resource_loader_files import resource_loader_file
@@ -12,60 +12,44 @@ from datetime import datetime
 from pytz import timezone, utc
 from timezonefinder import TimezoneFinder
 from global_land_mask import globe
-from shapely.geometry import shape
-from shapely.prepared import prep
-from shapely.geometry import Point
-import requests
 import pandas as pd
 
+from tools.resource.site_filter import CountryBoundaries
+
 
 def get_country(lat, lon, geo_data):
     """
     Determine which country a point lies in
-    """
-    countries = {}
-    for feature in geo_data["features"]:
-        geom = feature["geometry"]
-        country = feature["properties"]["ADMIN"]
-        countries[country] = prep(shape(geom))
-
-    point = Point(lon, lat)
-    for country, geom in countries.items():
-        if geom.contains(point):
-            return country
 
-    return "unknown"
+    :param geo_data: GeoJSON country boundaries, or :class:`CountryBoundaries` which should be used for repeated calls
+    """
+    if not isinstance(geo_data, CountryBoundaries):
+        geo_data = CountryBoundaries(geo_data)
+    return geo_data.countries(lat, lon)[0]
 
 
-def filter_sites(site_details, location='usa only'):
+def filter_sites(site_details, location='usa only', boundaries=None):
     """
 
     :param site_details: pandas dataframe
     :param location: 'on land only' or 'usa only'
+    :param boundaries: :class:`CountryBoundaries` for 'usa only', loaded from the default local file if None
     :return:
     """
-
-    # Load GEOJson
-    geo_data = requests.get(
-        "https://raw.githubusercontent.com/datasets/geo-countries/master/data/countries.geojson").json()
+    lats = site_details['Lat'].to_numpy(dtype=float)
+    lons = site_details['Lon'].to_numpy(dtype=float)
 
     # Creates a new dataframe to contain only the selected sites
     #  Only sites on land (includes lakes)
     if location == 'on land only':
-        on_land = []
-        for site_index, site in site_details.iterrows():
-            is_on_land = globe.is_land(site['Lat'], site['Lon'])
-            on_land.append(is_on_land)
-        site_details['on_land'] = on_land
+        site_details['on_land'] = globe.is_land(lats, lons)
         site_details_selected = site_details[site_details['on_land'] == True]
 
     #  Only sites in the Continental US
     if location == 'usa only':
-        in_usa = []
-        for site_index, site in site_details.iterrows():
-            is_in_usa = (get_country(site['Lat'], site['Lon'], geo_data=geo_data) == 'United States of America')
-            in_usa.append(is_in_usa)
-        site_details['in_usa'] = in_usa 
+        if boundaries is None:
+            boundaries = CountryBoundaries.load()
+        site_details['in_usa'] = boundaries.contains('United States of America', lats, lons)
         site_details_selected = site_details[site_details['in_usa'] == True]
 
     return site_details_selected
@@ -0,0 +1,139 @@
+"""
+site_filter.py
+Vectorized classification of many sites by country, using country boundary polygons loaded once from a local
+GeoJSON file
+"""
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+import numpy as np
+import requests
+from matplotlib.path import Path as MplPath
+
+
+COUNTRIES_GEOJSON_URL = "https://raw.githubusercontent.com/datasets/geo-countries/master/data/countries.geojson"
+DEFAULT_COUNTRIES_FILE = Path(__file__).absolute().parent.parent.parent / "resource_files" / "countries.geojson"
+
+
+class CountryBoundaries:
+    """
+    Country boundary polygons with a spatial index, for classifying arrays of lat/lon points in one call.
+
+    The rings of all polygons are stored as vertex arrays with their bounding boxes. Points of a query are sorted by
+    longitude once, so each polygon only tests the points within its bounding box, using the compiled
+    point-in-polygon test of matplotlib.
+    """
+    def __init__(self, geo_data: dict, name_property: str = "ADMIN"):
+        """
+        :param geo_data: GeoJSON FeatureCollection of (Multi)Polygon country boundaries
+        :param name_property: Feature property holding the country name
+        """
+        self.names = []
+        # each part is one polygon: (country index, exterior path, hole paths, bounding box)
+        self._parts = []
+        for feature in geo_data["features"]:
+            geometry = feature["geometry"]
+            if geometry is None:
+                continue
+            country_index = len(self.names)
+            self.names.append(feature["properties"][name_property])
+            if geometry["type"] == "Polygon":
+                polygons = [geometry["coordinates"]]
+            elif geometry["type"] == "MultiPolygon":
+                polygons = geometry["coordinates"]
+            else:
+                raise ValueError("Unsupported geometry type {} of {}".format(geometry["type"], self.names[-1]))
+            for rings in polygons:
+                exterior = np.asarray(rings[0], dtype=float)[:, :2]
+                holes = [MplPath(np.asarray(r, dtype=float)[:, :2]) for r in rings[1:]]
+                bbox = (*exterior.min(axis=0), *exterior.max(axis=0))
+                self._parts.append((country_index, MplPath(exterior), holes, bbox))
+        self._parts_of_country = {}
+        for i, part in enumerate(self._parts):
+            self._parts_of_country.setdefault(self.names[part[0]], []).append(i)
+
+    @classmethod
+    def load(cls,
+             filename: Optional[Union[str, Path]] = None,
+             name_property: str = "ADMIN") -> 'CountryBoundaries':
+        """
+        Loads country boundaries from a local GeoJSON file. The default file is downloaded once from
+        https://github.com/datasets/geo-countries if it does not exist.
+
+        :param filename: GeoJSON file, defaults to resource_files/countries.geojson
+        :param name_property: Feature property holding the country name
+
+        :returns: Country boundaries
+        """
+        if filename is None:
+            filename = DEFAULT_COUNTRIES_FILE
+            if not os.path.isfile(filename):
+                r = requests.get(COUNTRIES_GEOJSON_URL)
+                r.raise_for_status()
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+                tmp_filename = "{}.{}.tmp".format(filename, os.getpid())
+                with open(tmp_filename, 'w') as f:
+                    f.write(r.text)
+                os.replace(tmp_filename, filename)
+        with open(filename) as f:
+            return cls(json.load(f), name_property)
+
+    def _classify(self, lats, lons, part_ids) -> np.ndarray:
+        """Index of the first part (in part_ids order) containing each point, -1 if none"""
+        lats = np.atleast_1d(np.asarray(lats, dtype=float))
+        lons = np.atleast_1d(np.asarray(lons, dtype=float))
+        order = np.argsort(lons, kind='stable')
+        sorted_lons = lons[order]
+        sorted_points = np.column_stack((sorted_lons, lats[order]))
+
+        part_of_point = np.full(len(lons), -1, dtype=int)
+        for part_id in part_ids:
+            _, exterior, holes, (min_lon, min_lat, max_lon, max_lat) = self._parts[part_id]
+            start = np.searchsorted(sorted_lons, min_lon, side='left')
+            stop = np.searchsorted(sorted_lons, max_lon, side='right')
+            if start >= stop:
+                continue
+            candidates = order[start:stop]
+            points = sorted_points[start:stop]
+            mask = (points[:, 1] >= min_lat) & (points[:, 1] <= max_lat) & (part_of_point[candidates] < 0)
+            if not mask.any():
+                continue
+            candidates = candidates[mask]
+            points = points[mask]
+            inside = exterior.contains_points(points)
+            for hole in holes:
+                inside[inside] = ~hole.contains_points(points[inside])
+            part_of_point[candidates[inside]] = part_id
+        return part_of_point
+
+    def countries(self, lats, lons, unknown: str = "unknown") -> np.ndarray:
+        """
+        Determines the country each point lies in.
+
+        :param lats: Latitudes [deg]
+        :param lons: Longitudes [deg]
+        :param unknown: Name returned for points outside all countries
+
+        :returns: Array of country names
+        """
+        part_of_point = self._classify(lats, lons, range(len(self._parts)))
+        names = np.array(self.names + [unknown], dtype=object)
+        country_of_part = np.array([part[0] for part in self._parts] + [len(self.names)], dtype=int)
+        return names[country_of_part[part_of_point]]
+
+    def contains(self, country: str, lats, lons) -> np.ndarray:
+        """
+        Determines whether each point lies in a country.
+
+        :param country: Country name
+        :param lats: Latitudes [deg]
+        :param lons: Longitudes [deg]
+
+        :returns: Boolean array, True for points in the country
+        """
+        if country not in self._parts_of_country:
+            raise ValueError("Unknown country {}".format(country))
+        part_ids = self._parts_of_country[country]
+        return self._classify(lats, lons, part_ids) >= 0
@@ -1,5 +1,12 @@
+import itertools
+import multiprocessing
+import sys
+from contextlib import contextmanager
+from typing import Callable, Optional, Sequence
+
 import numpy as np
-from typing import Sequence
+
+from hybrid.log import hybrid_logger as logger
 
 
 def flatten_dict(d):
@@ -14,4 +21,65 @@ def flatten_dict(d):
 
 def array_not_scalar(array):
     """Return True if array is array-like and not a scalar"""
-    return isinstance(array, Sequence) or (isinstance(array, np.ndarray) and hasattr(array, "__len__"))
\ No newline at end of file
+    return isinstance(array, Sequence) or (isinstance(array, np.ndarray) and hasattr(array, "__len__"))
+
+
+# Objects inherited by the forked worker processes of each fork_pool, by pool key
+_fork_pool_objects = {}
+_fork_pool_keys = itertools.count()
+
+
+def _init_fork_pool_worker(key: int):
+    obj, initializer = _fork_pool_objects[key]
+    if initializer is not None:
+        initializer(obj)
+
+
+def _call_fork_pool_worker(key: int, fn: Callable, args: tuple):
+    return fn(_fork_pool_objects[key][0], *args)
+
+
+@contextmanager
+def fork_pool(obj, n_workers: int, initializer: Optional[Callable] = None):
+    """
+    Creates a pool of forked worker processes which inherit obj, so it is not pickled for each call.
+
+    Forking a process with native libraries loaded (SSC, solvers) is only safe on Linux. On other platforms no pool
+    is created and None is yielded, so the caller runs serially.
+
+    :param obj: object inherited by the worker processes
+    :param n_workers: number of worker processes
+    :param initializer: (optional) function of obj called once in each worker, e.g. to drop solver sessions
+
+    :returns: None if forking is not supported, otherwise a function map(fn, args) that calls fn(obj, *a) in the
+        workers for each tuple a of args and returns the results in order. fn must be picklable, e.g. a module
+        level function
+    """
+    if not sys.platform.startswith('linux'):
+        logger.warning("Worker processes require 'fork' process start, which is only supported on Linux. "
+                       "Running serially on {}".format(sys.platform))
+        yield None
+        return
+    key = next(_fork_pool_keys)
+    _fork_pool_objects[key] = (obj, initializer)
+    try:
+        with multiprocessing.get_context('fork').Pool(n_workers, initializer=_init_fork_pool_worker,
+                                                      initargs=(key,)) as pool:
+            yield lambda fn, args: pool.starmap(_call_fork_pool_worker, [(key, fn, a) for a in args])
+    finally:
+        del _fork_pool_objects[key]
+
+
+def fork_pool_map(obj, fn: Callable, args: Sequence[tuple], n_workers: int,
+                  initializer: Optional[Callable] = None) -> list:
+    """
+    Calls fn(obj, *a) for each tuple a of args in a pool of forked worker processes, see fork_pool. Runs serially in
+    this process if forking is not supported or n_workers is 1.
+
+    :returns: results of the calls in the order of args
+    """
+    if n_workers > 1:
+        with fork_pool(obj, n_workers, initializer) as pool_map:
+            if pool_map is not None:
+                return pool_map(fn, args)
+    return [fn(obj, *a) for a in args]